@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Generate a synthetic patch library for benchmarking the Python tooling.
+
+Builds metadata/, patches/ and docs/manifest.json under a target directory
+with the same layout as the repository. Frontmatter values are drawn from
+config/base-roms.json and config/systems.json so every entry resolves
+against the real configuration.
+"""
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'scripts'))
+from utils.config_loader import load_base_roms, load_systems
+
+WORDS = [
+    'Crystal', 'Clover', 'Radical', 'Red', 'Unbound', 'Inclement', 'Emerald', 'Glazed',
+    'Gaia', 'Prism', 'Polished', 'Reforged', 'Legacy', 'Dark', 'Rising', 'Eternal',
+    'Shattered', 'Dream', 'Blazing', 'Liquid', 'Ash', 'Gray', 'Light', 'Platinum',
+    'Voyager', 'Insurgence', 'Sienna', 'Odyssey', 'Zeta', 'Omicron', 'Snakewood', 'Vega',
+]
+STATUSES = ['Completed', 'In Progress', 'Abandoned', 'Beta', 'Demo']
+HACK_TYPES = ['Vanilla+', 'Enhanced', 'New', 'Kaizo', 'Improvement']
+LEVELS = ['Same', 'Enhanced', 'New']
+DIFFICULTIES = ['Easy', 'Normal', 'Hard', 'Kaizo']
+TAGS = ['Fakemon', 'Open World', 'QoL', 'Physical/Special Split', 'Nuzlocke', 'Randomizer']
+EXTENSIONS = ['bps', 'ips', 'ups']
+
+# Smallest well-formed payload for each format; contents are never applied
+PATCH_BYTES = {
+    'ips': b'PATCH' + b'EOF',
+    'ups': b'UPS1' + b'\x80\x80' + b'\x00' * 12,
+    'bps': b'BPS1' + b'\x80\x80\x80' + b'\x00' * 12,
+}
+
+def _baserom_dir(rom_name: str) -> str:
+    return rom_name.lower().replace(' ', '-')
+
+def _frontmatter(fields: dict) -> str:
+    return "---\n" + "".join(
+        f"{key}: {json.dumps(value, ensure_ascii=False)}\n" for key, value in fields.items()
+    ) + "---\n"
+
+def generate_library(root: Path, count: int, seed: int = 0) -> list[tuple[Path, Path]]:
+    """Write a synthetic library of count metadata/patch pairs.
+
+    Args:
+        root: Output directory (created if missing)
+        count: Number of entries
+        seed: Random seed, so the same arguments give the same library
+
+    Returns:
+        List of (metadata path, patch path) pairs, relative to root
+    """
+    rng = random.Random(seed)
+    base_roms = load_base_roms()
+    systems = load_systems()
+    rom_names = sorted(base_roms)
+
+    root = Path(root)
+    pairs = []
+    manifest = []
+
+    for i in range(count):
+        rom_name = rng.choice(rom_names)
+        rom = base_roms[rom_name]
+        system = rom['system'] if rom['system'] in systems else rng.choice(sorted(systems))
+        rom_dir = _baserom_dir(rom_name)
+        ext = rng.choice(EXTENSIONS)
+        stem = f"hack-{i:05d}"
+        title = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}"
+        version = f"v{rng.randint(0, 9)}.{rng.randint(0, 20)}{rng.choice(['', 'a', 'b'])}"
+
+        md_path = Path('metadata') / rom_dir / f"{stem}.md"
+        patch_path = Path('patches') / rom_dir / f"{stem}.{ext}"
+        (root / md_path).parent.mkdir(parents=True, exist_ok=True)
+        (root / patch_path).parent.mkdir(parents=True, exist_ok=True)
+
+        meta = {
+            'title': title,
+            'file': f"../{patch_path.as_posix()}",
+            'baseRom': rom_name,
+            'system': system,
+            'status': rng.choice(STATUSES),
+            'author': f"Author{rng.randint(1, count // 4 + 1)}",
+            'released': f"{rng.randint(2005, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            'hackType': rng.choice(HACK_TYPES),
+            'tags': rng.sample(TAGS, rng.randint(1, 3)),
+            'graphics': rng.choice(LEVELS),
+            'story': rng.choice(LEVELS),
+            'maps': rng.choice(LEVELS),
+            'difficulty': rng.choice(DIFFICULTIES),
+            'version': version,
+            'rating': rng.randint(1, 5),
+            'physicalSpecialSplit': rng.random() < 0.5,
+            'openWorld': rng.random() < 0.2,
+        }
+
+        body = f"\n## Overview\n\n{title} is a synthetic entry generated for benchmarks.\n"
+        (root / md_path).write_text(_frontmatter(meta) + body, encoding='utf-8')
+        (root / patch_path).write_bytes(PATCH_BYTES[ext])
+
+        manifest.append({
+            'id': f"{rom_dir}-{stem}",
+            'title': title,
+            'file': meta['file'],
+            'type': ext,
+            'baseRom': rom_dir,
+            'meta': {key: value for key, value in meta.items() if key not in ('title', 'file')},
+        })
+        pairs.append((md_path, patch_path))
+
+    manifest_path = root / 'docs' / 'manifest.json'
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding='utf-8')
+
+    return pairs
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic patch library')
+    parser.add_argument('output', type=Path, help='Output directory')
+    parser.add_argument('-n', '--count', type=int, default=1000, help='Number of entries (default: 1000)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    args = parser.parse_args()
+
+    pairs = generate_library(args.output, args.count, args.seed)
+    print(f"✓ Generated {len(pairs)} entries in {args.output}")
+
+if __name__ == '__main__':
+    main()
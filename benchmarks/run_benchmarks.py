@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""Time the Python tooling against synthetic libraries of increasing size.
+
+Each size gets a fresh library from generate_library.py in a temporary
+directory. Every benchmark runs --repeat times with the standardizer and
+config caches and the library's .cache/ cleared first, so every run is
+cold, and the results are written as JSON so two commits can be compared
+with --compare.
+"""
+import argparse
+import inspect
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'scripts'))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import generate_badge_css
+from generate_library import generate_library
+from rename_patches import generate_rename_plan
+from utils.config_loader import load_base_roms, load_systems
+from utils.filename_standardizer import normalize_title, parse_version, standardize_from_metadata
+from validate_filenames import validate_manifest, validate_pr_files
+
+# Older commits lack some of the APIs; benchmarks that need a missing one
+# are skipped so the suite still runs there
+try:
+    from utils.config_loader import clear_config_cache
+except ImportError:
+    def clear_config_cache() -> None:
+        pass
+try:
+    from utils.filename_standardizer import standardize_many
+except ImportError:
+    standardize_many = None
+
+DEFAULT_SIZES = [100, 1000, 10000, 50000]
+
+def _reset_caches() -> None:
+    """Clear in-process memoization and the on-disk caches under .cache/ (run with root as cwd)."""
+    clear_config_cache()
+    for func in (normalize_title, parse_version):
+        if hasattr(func, 'cache_clear'):
+            func.cache_clear()
+    shutil.rmtree('.cache', ignore_errors=True)
+
+def _with_jobs(func: Callable, *args, jobs: int) -> object:
+    """Call func, passing jobs only if it takes a jobs argument (added by --jobs support)."""
+    if 'jobs' in inspect.signature(func).parameters:
+        return func(*args, jobs=jobs)
+    return func(*args)
+
+def _scaled_config(config: dict, count: int) -> dict:
+    """Repeat config entries under suffixed keys until there are count of them."""
+    items = sorted(config.items())
+    scaled = {}
+    for i in range(count):
+        key, data = items[i % len(items)]
+        copy = dict(data)
+        if i >= len(items):
+            key = f"{key} {i // len(items)}"
+            for name_field in ('name', 'fullName'):
+                if name_field in copy:
+                    copy[name_field] = f"{copy[name_field]} {i // len(items)}"
+        scaled[key] = copy
+    return scaled
+
+def _badge_css(systems: dict, base_roms: dict, output_path: Path) -> None:
+    css = f"{generate_badge_css.generate_system_badges(systems)}\n{generate_badge_css.generate_rom_badges(base_roms)}"
+    generate_badge_css.write_css_file(output_path, css)
+
+def _benchmarks(root: Path, pairs: list, jobs: int) -> dict[str, Callable[[], object]]:
+    """Build the benchmark callables for one library; run with root as cwd."""
+    systems = _scaled_config(load_systems(), len(pairs))
+    base_roms = _scaled_config(load_base_roms(), len(pairs))
+    css_path = root / 'docs' / 'assets' / 'css' / 'generated' / 'badges.css'
+
+    benchmarks = {
+        'standardize_from_metadata': lambda: [standardize_from_metadata(md, patch) for md, patch in pairs],
+        'standardize_many': lambda: standardize_many(pairs),
+        'validate_manifest': lambda: _with_jobs(validate_manifest, str(Path('docs') / 'manifest.json'), jobs=jobs),
+        'validate_pr_files': lambda: _with_jobs(validate_pr_files, jobs=jobs),
+        'generate_rename_plan': lambda: _with_jobs(generate_rename_plan, Path('metadata'), Path('patches'),
+                                                   jobs=jobs),
+        'generate_badge_css': lambda: _badge_css(systems, base_roms, css_path),
+    }
+    if standardize_many is None:
+        del benchmarks['standardize_many']
+    return benchmarks
+
+def _time(func: Callable[[], object], repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        _reset_caches()
+        start = time.perf_counter()
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull), redirect_stderr(devnull):
+            func()
+        runs.append(time.perf_counter() - start)
+    return {
+        'min': min(runs),
+        'mean': statistics.mean(runs),
+        'runs': runs,
+    }
+
+def run_size(count: int, repeat: int, jobs: int, only: Optional[set[str]] = None,
+             seed: int = 0) -> dict:
+    """Generate a library of count entries and time every benchmark on it.
+
+    Returns:
+        Mapping of benchmark name to timing stats (seconds)
+    """
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='pkmn-bench-') as tmp:
+        root = Path(tmp)
+        pairs = generate_library(root, count, seed)
+        os.chdir(root)
+        try:
+            results = {}
+            for name, func in _benchmarks(root, pairs, jobs).items():
+                if only and name not in only:
+                    continue
+                results[name] = _time(func, repeat)
+                print(f"  {name:28s} {results[name]['min'] * 1000:10.1f} ms")
+            return results
+        finally:
+            os.chdir(cwd)
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=PROJECT_ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(baseline: dict, current: dict) -> None:
+    """Print per-benchmark min-time ratios of current against baseline."""
+    print(f"\n📊 {current.get('commit', '?')[:8]} vs {baseline.get('commit', '?')[:8]} (min time)")
+    for size, benches in current['results'].items():
+        old_benches = baseline['results'].get(size, {})
+        for name, stats in benches.items():
+            if name not in old_benches:
+                continue
+            old = old_benches[name]['min']
+            ratio = stats['min'] / old if old else float('inf')
+            marker = '🔴' if ratio > 1.1 else ('🟢' if ratio < 0.9 else '⚪')
+            print(f"  {marker} {size:>6s} {name:28s} {old * 1000:10.1f} → {stats['min'] * 1000:10.1f} ms ({ratio:.2f}x)")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the Python tooling on synthetic libraries',
+        epilog="""
+Examples:
+  # Full run, results to JSON
+  python benchmarks/run_benchmarks.py -o bench.json
+
+  # Quick run on small libraries, compared against an earlier result
+  python benchmarks/run_benchmarks.py --sizes 100 1000 --compare bench.json
+        """,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Library sizes (default: 100 1000 10000 50000)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per benchmark (default: 3)')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Worker processes for validate/rename (default: 1)')
+    parser.add_argument('--only', nargs='+', metavar='NAME', help='Run only these benchmarks')
+    parser.add_argument('--seed', type=int, default=0, help='Library random seed (default: 0)')
+    parser.add_argument('-o', '--output', type=Path, help='Write results JSON to this file')
+    parser.add_argument('--compare', type=Path, metavar='JSON', help='Baseline results to compare against')
+    args = parser.parse_args()
+
+    report = {
+        'commit': _git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'jobs': args.jobs,
+        'repeat': args.repeat,
+        'seed': args.seed,
+        'results': {},
+    }
+
+    for size in args.sizes:
+        print(f"⏱️  {size} entries")
+        report['results'][str(size)] = run_size(size, args.repeat, args.jobs, set(args.only or ()), args.seed)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + '\n')
+        print(f"\n✓ Results written to {args.output}")
+
+    if args.compare:
+        compare(json.loads(args.compare.read_text()), report)
+
+if __name__ == '__main__':
+    main()
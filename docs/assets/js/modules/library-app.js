@@ -44,7 +44,7 @@ class ROMLibraryApp {
         await this.loadCDNResources();
         
         // Initialize search after dependencies are loaded
-        this.initializeSearch();
+        await this.initializeSearch();
         
         // Setup event listeners after search is ready
         this.setupEventListeners();
@@ -68,7 +68,14 @@ class ROMLibraryApp {
         this.initializeIconsWhenReady();
     }
     
-    initializeSearch() {
+    async initializeSearch() {
+        // Prefer the prebuilt index; it was requested alongside the manifest
+        const indexData = this.hacks.length > 0 ? await this.searchIndexPromise : null;
+        if (indexData) {
+            this.searchManager.setIndex(indexData, this.hacks);
+            return;
+        }
+        
         // Initialize Fuse.js if available
         if (typeof Fuse !== 'undefined' && this.hacks.length > 0) {
             this.searchManager.initFuse(this.hacks);
@@ -226,8 +233,10 @@ class ROMLibraryApp {
         }
 
         try {
-            // Start manifest loading immediately (don't block on SW)
-            const manifestPromise = manifestLoader.load();
+            // Start manifest loading immediately (don't block on SW).
+            // Only the compact index is needed for the grid and filters;
+            // full entries are loaded per base ROM when a hack is opened.
+            const manifestPromise = manifestLoader.loadIndex();
             
             // Start SW readiness check in parallel (non-blocking)
             if ('serviceWorker' in navigator && navigator.serviceWorker.controller) {
@@ -236,6 +245,8 @@ class ROMLibraryApp {
             
             // Wait only for manifest, not SW
             this.hacks = await manifestPromise;
+            // Fetch the search index while CDN resources load
+            this.searchIndexPromise = manifestLoader.loadSearchIndex();
             this.hacks.sort((a, b) => a.title.localeCompare(b.title));
             this.filteredHacks = [...this.hacks];
             
@@ -408,7 +419,8 @@ class ROMLibraryApp {
     }
     
     generateFilters() {
-        const filters = this.searchManager.generateFilterOptions(this.hacks);
+        const filters = this.searchManager.getIndexedFilterOptions() ||
+            this.searchManager.generateFilterOptions(this.hacks);
         Object.keys(filters).forEach(filterType => {
             this.uiManager.renderFilterOptions(filterType, filters[filterType]);
         });
@@ -488,10 +500,20 @@ class ROMLibraryApp {
         this.saveState();
     }
     
-    openDetailPanel(hackId) {
-        this.selectedHack = this.hacks.find(hack => hack.id === hackId);
-        if (!this.selectedHack) return;
+    async openDetailPanel(hackId) {
+        const hack = this.hacks.find(hack => hack.id === hackId);
+        if (!hack) return;
+        this.selectedHack = hack;
         
+        let detail = hack;
+        try {
+            detail = await manifestLoader.loadDetail(hack);
+        } catch (error) {
+            console.warn('Failed to load hack details:', error);
+        }
+        // Another hack may have been opened while this one loaded
+        if (this.selectedHack !== hack) return;
+        this.selectedHack = detail;
 
         this.uiManager.renderDetailPanel(this.selectedHack);
         this.uiManager.openDetailPanel();
@@ -408,6 +408,9 @@ class ROMPatcherApp {
         
         if (this.selectedPatch.meta?.crc32) {
             patchInfo.inputCrc32 = this.selectedPatch.meta.crc32;
+        } else if (this.selectedPatch.patchInfo?.sourceCrc32) {
+            // UPS/BPS source checksum read from the patch header at build time
+            patchInfo.inputCrc32 = this.selectedPatch.patchInfo.sourceCrc32;
         }
         
         // Initialize or switch RomPatcher with this patch
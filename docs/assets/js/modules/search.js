@@ -1,10 +1,14 @@
 // Search and filter functionality
 import { BasicSearch } from '../utils/basic-search.js';
+import { SearchIndex } from '../utils/search-index.js';
 
 export class SearchManager {
     constructor() {
         this.fuse = null;
         this.fuseReady = false;
+        // Prebuilt index (see utils/search-index.js), preferred over Fuse.js
+        this.index = null;
+        this.indexedHacks = null;
         this.activeFilters = {
             baseRom: new Set(),
             system: new Set(),
@@ -41,11 +45,38 @@ export class SearchManager {
         }
     }
 
+    setIndex(indexData, data) {
+        try {
+            this.index = new SearchIndex(indexData);
+            this.indexedHacks = new Map(data.map(hack => [hack.id, hack]));
+        } catch (error) {
+            console.warn('Invalid search index, using client-side search:', error);
+            this.index = null;
+            this.indexedHacks = null;
+        }
+    }
+
+    // Precomputed filter counts for the full library, or null without an index
+    getIndexedFilterOptions() {
+        return this.index && this.index.facets ? this.index.facetMaps() : null;
+    }
+
     search(query, data) {
         if (!query || !query.trim()) {
             return data || [];
         }
         
+        // Use the prebuilt index when it covers this data
+        if (this.index) {
+            try {
+                return this.index.search(query)
+                    .map(id => this.indexedHacks.get(id))
+                    .filter(Boolean);
+            } catch (error) {
+                console.warn('Index search failed, falling back to client-side search:', error);
+            }
+        }
+        
         // Use Fuse.js if available and ready
         if (this.fuse && this.fuseReady) {
             try {
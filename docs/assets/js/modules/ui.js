@@ -5,6 +5,25 @@ import { imagePopup } from './image-popup.js';
 import { renderBadge, initBadgeRenderer } from '../utils/badge-renderer.js';
 import { imageLoader } from '../utils/image-loader.js';
 
+// Card image for a hack: the mirrored thumbnail when there is one (see
+// scripts/mirror_images.py), else the full boxArt/banner URL
+function cardImage(hack) {
+    const images = hack.meta?.images;
+    const key = images?.boxArt ? 'boxArt' : (images?.banner ? 'banner' : null);
+    if (!key) return null;
+
+    const thumb = images.thumbnails?.[key];
+    if (thumb && (thumb.webp || thumb.avif)) {
+        return { src: thumb.webp || thumb.avif, width: thumb.width, height: thumb.height };
+    }
+    const size = images.sizes?.[key];
+    return { src: images[key], width: size?.[0], height: size?.[1] };
+}
+
+function sizeAttributes(image) {
+    return image.width && image.height ? `width="${image.width}" height="${image.height}"` : '';
+}
+
 export class UIManager {
     constructor() {
         this.currentPage = 0;
@@ -29,11 +48,12 @@ export class UIManager {
     }
 
     createGridCard(hack) {
-        const imageUrl = hack.meta?.images?.boxArt || hack.meta?.images?.banner;
+        const image = cardImage(hack);
+        const imageUrl = image?.src;
         const cachedImage = imageUrl ? imageCache.getCachedImage(imageUrl) : null;
         const imageHtml = imageUrl ? 
             `<div class="image-container">
-                <img ${cachedImage ? `src="${imageUrl}"` : `data-src="${imageUrl}"`} alt="${hack.title}" class="${cachedImage ? 'loaded' : 'lazy-load'}" loading="lazy" onerror="this.parentElement.classList.add('has-broken-image')">
+                <img ${cachedImage ? `src="${imageUrl}"` : `data-src="${imageUrl}"`} ${sizeAttributes(image)} alt="${hack.title}" class="${cachedImage ? 'loaded' : 'lazy-load'}" loading="lazy" onerror="this.parentElement.classList.add('has-broken-image')">
                 <div class="image-fallback"><i data-lucide="image-off" width="32" height="32"></i></div>
             </div>` :
             `<div class="image-fallback"><i data-lucide="image-off" width="32" height="32"></i></div>`;
@@ -52,12 +72,13 @@ export class UIManager {
     
     createHackCard(hack) {
         // Use boxArt for cards, fallback to banner, then placeholder
-        const imageUrl = hack.meta?.images?.boxArt || hack.meta?.images?.banner;
+        const image = cardImage(hack);
+        const imageUrl = image?.src;
         const cachedImage = imageUrl ? imageCache.getCachedImage(imageUrl) : null;
         const imageHtml = imageUrl ? 
             `<div class="image-container">
                 <div class="image-placeholder"><i data-lucide="image" width="24" height="24"></i></div>
-                <img ${cachedImage ? `src="${imageUrl}"` : `data-src="${imageUrl}"`} alt="${hack.title}" class="${cachedImage ? 'loaded' : 'lazy-load'}" loading="lazy" onerror="this.parentElement.classList.add('has-broken-image')">
+                <img ${cachedImage ? `src="${imageUrl}"` : `data-src="${imageUrl}"`} ${sizeAttributes(image)} alt="${hack.title}" class="${cachedImage ? 'loaded' : 'lazy-load'}" loading="lazy" onerror="this.parentElement.classList.add('has-broken-image')">
                 <div class="image-fallback"><i data-lucide="image-off" width="24" height="24"></i></div>
             </div>` : 
             `<div class="image-fallback"><i data-lucide="image-off" width="24" height="24"></i></div>`;
@@ -121,7 +142,7 @@ export class UIManager {
 
         // Setup optimized lazy loading
         const imageUrls = hacksToShow
-            .map(hack => hack.meta?.images?.boxArt || hack.meta?.images?.banner)
+            .map(hack => cardImage(hack)?.src)
             .filter(Boolean);
         
         if (imageUrls.length > 0) {
@@ -183,6 +204,10 @@ export class UIManager {
         const releasedEl = document.getElementById('detailReleased');
         
         if (titleEl) titleEl.textContent = hack.title;
+
+        // Pre-rendered page of this hack (scripts/build_detail_pages.py)
+        const permalinkEl = document.getElementById('detailPermalink');
+        if (permalinkEl) permalinkEl.href = `../hacks/${encodeURIComponent(hack.id)}.html`;
         if (authorEl) authorEl.innerHTML = `<span class="tooltip" data-tooltip="Author"><i data-lucide="user" width="16" height="16"></i> ${hack.meta?.author || 'Unknown'}</span>`;
         
         // Add badges to header
@@ -0,0 +1,31 @@
+// Content-hashed copies of generated files (docs/asset-map.json), written by
+// scripts/build_static_assets.py. Hashed files never change, so the browser
+// and service worker can cache them indefinitely.
+export class AssetMap {
+    constructor() {
+        this.files = null;
+        this.loading = null;
+    }
+
+    async load() {
+        if (this.files) return this.files;
+        if (!this.loading) {
+            // The map itself is small and must always be revalidated
+            this.loading = fetch('../asset-map.json', { cache: 'no-cache' })
+                .then(response => response.ok ? response.json() : {})
+                .then(data => data.files || {})
+                .catch(() => ({}));
+        }
+        this.files = await this.loading;
+        return this.files;
+    }
+
+    // Site path ('config/systems.json') -> page-relative URL of its hashed copy,
+    // or of the file itself when it has none
+    async resolve(path) {
+        const files = await this.load();
+        return `../${files[path] || path}`;
+    }
+}
+
+export const assetMap = new AssetMap();
@@ -1,4 +1,6 @@
 // Centralized config file loader with environment-aware paths
+import { assetMap } from './asset-map.js';
+
 export class ConfigLoader {
     constructor() {
         this.cache = new Map();
@@ -9,14 +11,19 @@ export class ConfigLoader {
         return isLocal ? `/config/${filename}` : `../config/${filename}`;
     }
 
+    // Prefer the content-hashed copy on the deployed site
+    static async resolveConfigPath(filename) {
+        const path = ConfigLoader.getConfigPath(filename);
+        return path.startsWith('/') ? path : assetMap.resolve(`config/${filename}`);
+    }
+
     async load(filename) {
         if (this.cache.has(filename)) {
             return this.cache.get(filename);
         }
 
-        const path = ConfigLoader.getConfigPath(filename);
-        
         try {
+            const path = await ConfigLoader.resolveConfigPath(filename);
             const response = await fetch(path);
             if (!response.ok) {
                 throw new Error(`Config file not found: ${path}`);
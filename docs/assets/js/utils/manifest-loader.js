@@ -5,6 +5,88 @@ export class ManifestLoader {
         this.loading = null;
         this.retryCount = 0;
         this.maxRetries = 3;
+        // Sharded manifest (docs/manifest/): pointer, compact index, detail shards
+        this.pointer = null;
+        this.shardBase = null;
+        this.indexLoading = null;
+        this.shards = new Map();
+    }
+
+    // Compact entries for the library grid and filters. Falls back to the
+    // full manifest when no shards have been published.
+    async loadIndex() {
+        if (!this.indexLoading) {
+            this.indexLoading = this.loadShardIndex().catch(error => {
+                console.warn('Manifest index unavailable, loading full manifest:', error.message);
+                this.pointer = null;
+                this.indexLoading = null;
+                return this.load();
+            });
+        }
+        return this.indexLoading;
+    }
+
+    async loadShardIndex() {
+        // latest.json is the only unhashed file; always revalidate it
+        for (const base of this.getShardPaths()) {
+            try {
+                const response = await fetch(`${base}latest.json`, { cache: 'no-cache' });
+                if (!response.ok) continue;
+                const pointer = await response.json();
+                const data = await this.fetchShard(base, pointer.index);
+                this.pointer = pointer;
+                this.shardBase = base;
+                return Array.isArray(data) ? data : [];
+            } catch (error) {
+                console.warn(`Manifest index load failed for ${base}:`, error.message);
+            }
+        }
+        throw new Error('No manifest index found');
+    }
+
+    // Full entry (meta, links, changelog...) for a hack from the index
+    async loadDetail(hack) {
+        const file = this.pointer && hack.shard ? this.pointer.shards[hack.shard] : null;
+        if (!file) {
+            const manifest = await this.load();
+            return manifest.find(entry => entry.id === hack.id) || hack;
+        }
+
+        if (!this.shards.has(file)) {
+            const loading = this.fetchShard(this.shardBase, file).catch(error => {
+                this.shards.delete(file);
+                throw error;
+            });
+            this.shards.set(file, loading);
+        }
+        const shard = await this.shards.get(file);
+        return shard[hack.id] || hack;
+    }
+
+    // Raw prebuilt search index data, or null when none was published.
+    // Call after loadIndex(); the file is named by the same pointer.
+    async loadSearchIndex() {
+        const file = this.pointer ? this.pointer.search : null;
+        if (!file) return null;
+        try {
+            return await this.fetchShard(this.shardBase, file);
+        } catch (error) {
+            console.warn('Search index unavailable, using client-side search:', error.message);
+            return null;
+        }
+    }
+
+    async fetchShard(base, file) {
+        // Hashed filenames never change content, so the HTTP cache can serve them
+        const response = await fetch(`${base}${file}`);
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status} for ${file}`);
+        }
+        return response.json();
+    }
+
+    getShardPaths() {
+        return this.getManifestPaths().map(path => path.replace(/manifest\.json$/, 'manifest/'));
     }
 
     async load(options = {}) {
@@ -92,6 +174,10 @@ export class ManifestLoader {
         this.cache = null;
         this.loading = null;
         this.retryCount = 0;
+        this.pointer = null;
+        this.shardBase = null;
+        this.indexLoading = null;
+        this.shards.clear();
     }
 }
 
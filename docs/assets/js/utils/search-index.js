@@ -0,0 +1,144 @@
+// Prebuilt inverted search index (docs/manifest/search.<hash>.json).
+// Built by scripts/utils/search_index.py; tokenize() must match its tokenizer.
+
+// Weight per field bit: title, author, tags, mechanics, baseRom, system
+const FIELD_WEIGHTS = [8, 4, 2, 2, 1, 1];
+const EXACT_WEIGHT = 1;
+const PREFIX_WEIGHT = 0.5;
+const FUZZY_WEIGHT = 0.25;
+// Share of trigrams a term must have in common with a query token
+const FUZZY_THRESHOLD = 0.4;
+
+export function tokenize(text) {
+    return String(text)
+        .normalize('NFKD')
+        .replace(/[\u0300-\u036f]/g, '')
+        .toLowerCase()
+        .split(/[^a-z0-9]+/)
+        .filter(Boolean);
+}
+
+function trigrams(term) {
+    const grams = new Set();
+    for (let i = 0; i + 3 <= term.length; i++) {
+        grams.add(term.slice(i, i + 3));
+    }
+    return grams;
+}
+
+export class SearchIndex {
+    constructor(data) {
+        this.ids = data.ids;
+        this.terms = data.terms;
+        this.postings = data.postings;
+        this.trigrams = data.trigrams;
+        this.facets = data.facets;
+    }
+
+    // Ids of matching entries, best match first. Every query token must
+    // match (as a whole term, a term prefix or, failing both, a similar term).
+    search(query) {
+        const tokens = [...new Set(tokenize(query))];
+        if (tokens.length === 0) return [];
+
+        let scores = null;
+        for (const token of tokens) {
+            const tokenScores = this.scoreToken(token);
+            if (scores === null) {
+                scores = tokenScores;
+            } else {
+                for (const [doc, score] of scores) {
+                    const other = tokenScores.get(doc);
+                    if (other === undefined) {
+                        scores.delete(doc);
+                    } else {
+                        scores.set(doc, score + other);
+                    }
+                }
+            }
+            if (scores.size === 0) return [];
+        }
+
+        return Array.from(scores.entries())
+            .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+            .map(([doc]) => this.ids[doc]);
+    }
+
+    // doc -> best score of any term matching the token
+    scoreToken(token) {
+        const scores = new Map();
+        const addTerm = (termIndex, weight) => {
+            const postings = this.postings[termIndex];
+            for (let i = 0; i < postings.length; i += 2) {
+                const score = weight * this.fieldWeight(postings[i + 1]);
+                const doc = postings[i];
+                if (!(scores.get(doc) >= score)) scores.set(doc, score);
+            }
+        };
+
+        let termIndex = this.lowerBound(token);
+        for (; termIndex < this.terms.length && this.terms[termIndex].startsWith(token); termIndex++) {
+            addTerm(termIndex, this.terms[termIndex] === token ? EXACT_WEIGHT : PREFIX_WEIGHT);
+        }
+
+        if (scores.size === 0) {
+            for (const [fuzzyIndex, similarity] of this.similarTerms(token)) {
+                addTerm(fuzzyIndex, FUZZY_WEIGHT * similarity);
+            }
+        }
+        return scores;
+    }
+
+    // Terms sharing enough trigrams with the token (typo tolerance)
+    similarTerms(token) {
+        const grams = trigrams(token);
+        if (grams.size === 0) return [];
+
+        const shared = new Map();
+        for (const gram of grams) {
+            for (const termIndex of this.trigrams[gram] || []) {
+                shared.set(termIndex, (shared.get(termIndex) || 0) + 1);
+            }
+        }
+
+        const similar = [];
+        for (const [termIndex, count] of shared) {
+            const termGrams = Math.max(this.terms[termIndex].length - 2, 1);
+            const similarity = count / Math.max(grams.size, termGrams);
+            if (similarity >= FUZZY_THRESHOLD) similar.push([termIndex, similarity]);
+        }
+        return similar;
+    }
+
+    fieldWeight(mask) {
+        let weight = 0;
+        for (let bit = 0; bit < FIELD_WEIGHTS.length; bit++) {
+            if (mask & (1 << bit)) weight += FIELD_WEIGHTS[bit];
+        }
+        return weight;
+    }
+
+    // First term >= token (terms are sorted by code point, like Python)
+    lowerBound(token) {
+        let low = 0;
+        let high = this.terms.length;
+        while (low < high) {
+            const mid = (low + high) >> 1;
+            if (this.terms[mid] < token) {
+                low = mid + 1;
+            } else {
+                high = mid;
+            }
+        }
+        return low;
+    }
+
+    // Sidebar filter counts in the shape of SearchManager.generateFilterOptions()
+    facetMaps() {
+        const filters = {};
+        for (const [filterType, pairs] of Object.entries(this.facets || {})) {
+            filters[filterType] = new Map(pairs);
+        }
+        return filters;
+    }
+}
@@ -46,8 +46,14 @@ self.addEventListener('activate', event => {
 self.addEventListener('fetch', event => {
     const url = new URL(event.request.url);
     
-    // Manifest.json - Network first with cache fallback
-    if (url.pathname.includes('manifest.json')) {
+    // Manifest shards and other content-hashed files - cache first forever
+    if (/\.[0-9a-f]{12}\.(json|css)$/.test(url.pathname)) {
+        event.respondWith(cacheFirstIn(event.request, MANIFEST_CACHE));
+        return;
+    }
+    
+    // Manifest.json and the shard pointer - Network first with cache fallback
+    if (url.pathname.includes('manifest.json') || url.pathname.endsWith('/manifest/latest.json')) {
         event.respondWith(
             fetch(event.request).catch(() => 
                 caches.match(event.request).then(cached => 
@@ -103,6 +109,26 @@ async function cacheFirst(request) {
     }
 }
 
+// Cache first in a named cache, for immutable content-hashed files
+async function cacheFirstIn(request, cacheName) {
+    const cache = await caches.open(cacheName);
+    const cached = await cache.match(request);
+    
+    if (cached) {
+        return cached;
+    }
+    
+    try {
+        const response = await fetch(request);
+        if (response.ok) {
+            cache.put(request, response.clone());
+        }
+        return response;
+    } catch (error) {
+        return new Response('Offline', { status: 503 });
+    }
+}
+
 // Cache first with TTL for manifest
 async function cacheFirstWithTTL(request, cacheName, ttl) {
     const cache = await caches.open(cacheName);
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""CLI tool to apply IPS/UPS/BPS patches and verify the result."""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from utils.patch_engine import PatchError, apply_patch
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Apply an IPS, UPS or BPS patch to a ROM",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Apply and verify embedded checksums (UPS/BPS)
+  python scripts/apply_patch.py emerald.gba patches/emerald/HACK.bps -o hack.gba
+  
+  # Skip checksum verification
+  python scripts/apply_patch.py emerald.gba patches/emerald/HACK.ups --no-verify
+        """
+    )
+    
+    parser.add_argument('rom', type=Path, help='Unmodified base ROM')
+    parser.add_argument('patch', type=Path, help='Patch file (.ips, .ups, .bps)')
+    parser.add_argument(
+        '-o', '--output',
+        type=Path,
+        help='Output ROM (default: patch name with the ROM extension)'
+    )
+    parser.add_argument(
+        '--no-verify',
+        action='store_true',
+        help='Skip source/target/patch CRC32 verification'
+    )
+    
+    args = parser.parse_args()
+    
+    for path in (args.rom, args.patch):
+        if not path.is_file():
+            print(f"❌ Error: File not found: {path}", file=sys.stderr)
+            sys.exit(1)
+    
+    output = args.output or Path(args.patch.stem + args.rom.suffix)
+    if not output.parent.is_dir():
+        print(f"❌ Error: Output directory not found: {output.parent}", file=sys.stderr)
+        sys.exit(1)
+    
+    try:
+        result = apply_patch(args.rom, args.patch, output, verify=not args.no_verify)
+    except (PatchError, OSError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    print(f"✓ Applied {result.format.upper()} patch: {output}")
+    print(f"  - Source: {result.source_size} bytes")
+    print(f"  - Target: {result.target_size} bytes, CRC32 {result.target_crc32:08X}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""Build every generated site output, skipping targets whose inputs are unchanged.
+
+Targets and their inputs are declared in utils/build_graph.py:
+
+  badges         config/ -> docs/assets/css/generated/badges.css
+  docs-config    config/ -> docs/config
+  manifest       metadata/ + patches/ -> docs/manifest.json, docs/manifest/
+  docs-metadata  metadata/ -> docs/metadata
+  detail-pages   metadata/ + patches/ -> docs/hacks/<id>.html
+
+With --watch it stays running: after each (debounced) change under
+metadata/, patches/ or config/ it schema-checks and re-standardizes the
+touched entries and rebuilds only the targets whose inputs changed,
+keeping the build state, manifest cache and config in memory between
+builds.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+from utils.build_graph import DEFAULT_STATE, TARGETS, BuildResult, affected_targets, load_state, run_build
+from utils.config_loader import get_config
+from utils.filename_standardizer import parse_metadata_file, standardize_from_metadata
+from utils.metadata_schema import compile_schema
+from utils.parallel import default_jobs
+from utils.repo_index import RepoIndex
+from utils.watcher import DEFAULT_DEBOUNCE, DEFAULT_POLL_INTERVAL, InotifyWatcher, debounced, open_watcher
+from utils import profiling
+
+WATCH_DIRS = ['metadata', 'patches', 'config']
+
+STATUS_ICONS = {
+    'built': '🔨',
+    'up-to-date': '✓',
+    'would-build': '•',
+    'failed': '❌',
+    'skipped': '⏭️ ',
+}
+
+def print_results(results: list[BuildResult]) -> None:
+    for result in results:
+        detail = f": {result.detail}" if result.detail else ''
+        out = sys.stderr if result.status == 'failed' else sys.stdout
+        print(f"{STATUS_ICONS[result.status]} {result.name}{detail}", file=out)
+
+def index_is_stale(index: RepoIndex, root: Path, changed: set[str]) -> bool:
+    """Whether a change added or removed metadata or patch files (or directories)."""
+    for rel in changed:
+        top, _, sub = rel.partition('/')
+        if top not in ('metadata', 'patches'):
+            continue
+        if sub.endswith('/'):
+            return True
+        if top == 'metadata':
+            if not sub.endswith('.md'):
+                continue
+            indexed = index.get_metadata(sub) is not None
+        else:
+            indexed = index.get_patch(sub) is not None
+        if indexed != (root / rel).is_file():
+            return True
+    return False
+
+def check_entries(index: RepoIndex, changed: set[str]) -> list[str]:
+    """Schema-check and standardize the metadata/patch pairs touched by a change.
+
+    Args:
+        index: Index of the current metadata/ and patches/ trees
+        changed: Root-relative changed paths
+
+    Returns:
+        One line per touched pair
+    """
+    md_files = set()
+    for rel in changed:
+        top, _, sub = rel.partition('/')
+        if top == 'metadata' and sub.endswith('.md'):
+            md_path = index.get_metadata(sub)
+        elif top == 'patches' and not sub.endswith('/'):
+            patch_path = index.get_patch(sub)
+            md_path = index.find_metadata(patch_path) if patch_path else None
+        else:
+            continue
+        if md_path is not None:
+            md_files.add(md_path)
+
+    lines = []
+    validate = compile_schema(get_config()) if md_files else None
+    for md_path in sorted(md_files):
+        label = f"{md_path.parent.name}/{md_path.name}"
+        try:
+            metadata = parse_metadata_file(md_path)
+            lines.extend(f"❌ {label}: {error}" for error in validate(metadata))
+            patch_path = index.find_patch(md_path, metadata)
+            if patch_path is None:
+                lines.append(f"⚠️  {label}: no patch file found")
+                continue
+            result = standardize_from_metadata(md_path, patch_path, metadata)
+        except Exception as e:
+            lines.append(f"❌ {label}: {e}")
+            continue
+        if result['needs_rename']:
+            lines.append(f"⚠️  {result['old_filename']} → {result['new_filename']}")
+        else:
+            lines.append(f"✓ {result['new_filename']}")
+        lines.extend(f"    ⚠️  {warning}" for warning in result['warnings'])
+    return lines
+
+def watch(args, state_path: Path, targets: Optional[list[str]]) -> None:
+    """Build, then rebuild affected targets after every change until interrupted."""
+    root = args.root
+    state = load_state(state_path)
+    results = run_build(root, names=targets, state_path=state_path, force=args.force,
+                        dry_run=args.dry_run, jobs=args.jobs, state=state)
+    print_results(results)
+
+    watcher = open_watcher(root, WATCH_DIRS, poll=args.poll, interval=args.poll_interval)
+    mode = 'inotify' if isinstance(watcher, InotifyWatcher) else f"polling every {args.poll_interval}s"
+    print(f"\n👀 Watching {', '.join(d + '/' for d in WATCH_DIRS)} ({mode}); Ctrl+C to stop")
+
+    index = RepoIndex(root / 'metadata', root / 'patches')
+    try:
+        for changed in debounced(watcher, args.debounce / 1000):
+            started = time.perf_counter()
+            print(f"\n🔄 {len(changed)} changed: {', '.join(sorted(changed)[:3])}"
+                  + (', ...' if len(changed) > 3 else ''))
+
+            if any(rel.startswith(('metadata/', 'patches/')) for rel in changed):
+                if index_is_stale(index, root, changed):
+                    index = RepoIndex(root / 'metadata', root / 'patches')
+                else:
+                    index.forget_file_fields()
+                for line in check_entries(index, changed):
+                    print(f"  {line}")
+                print(f"  checked in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+            names = [name for name in affected_targets(changed) if not targets or name in targets]
+            if not names:
+                continue
+            # Serial: a worker pool costs more than one incremental target
+            results = run_build(root, names=names, state_path=state_path,
+                                dry_run=args.dry_run, jobs=1, state=state)
+            print_results(results)
+            print(f"  rebuilt in {(time.perf_counter() - started) * 1000:.0f} ms")
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        watcher.close()
+
+def main():
+    project_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(
+        description='Incrementally build generated site outputs',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Build whatever is out of date
+  python scripts/build.py
+
+  # Only the manifest
+  python scripts/build.py manifest
+
+  # Show what would be rebuilt
+  python scripts/build.py --dry-run
+
+  # Rebuild on every metadata/patch/config edit
+  python scripts/build.py --watch
+        """
+    )
+    parser.add_argument('targets', nargs='*', metavar='TARGET',
+                        help='Targets to build (default: all)')
+    parser.add_argument('--root', type=Path, default=project_root,
+                        help='Project root')
+    parser.add_argument('--state', type=Path,
+                        help=f'Build state file (default: <root>/{DEFAULT_STATE.as_posix()})')
+    parser.add_argument('--force', action='store_true', help='Rebuild even if inputs are unchanged')
+    parser.add_argument('--dry-run', action='store_true', help='Only report out-of-date targets')
+    parser.add_argument('--list', action='store_true', help='List targets and exit')
+    parser.add_argument('--jobs', type=int, default=default_jobs(), metavar='N',
+                        help='Worker processes (default: CPU count, 1 = serial)')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running and rebuild when metadata/, patches/ or config/ change')
+    parser.add_argument('--poll', action='store_true', help='Watch by polling instead of inotify')
+    parser.add_argument('--poll-interval', type=float, default=DEFAULT_POLL_INTERVAL, metavar='SECONDS',
+                        help=f'Seconds between polls (default: {DEFAULT_POLL_INTERVAL})')
+    parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE * 1000, metavar='MS',
+                        help=f'Quiet time that ends a batch of changes (default: {DEFAULT_DEBOUNCE * 1000:.0f})')
+    profiling.add_profile_arguments(parser, 'build')
+
+    args = parser.parse_args()
+    profiling.enable_from_args(args, 'build')
+
+    if args.list:
+        for target in TARGETS:
+            deps = f" (after {', '.join(target.deps)})" if target.deps else ''
+            print(f"  {target.name:14s} {target.description}{deps}")
+        return
+
+    state_path = args.state or args.root / DEFAULT_STATE
+    started = time.perf_counter()
+    try:
+        if args.watch:
+            watch(args, state_path, args.targets or None)
+            return
+        results = run_build(
+            args.root,
+            names=args.targets or None,
+            state_path=state_path,
+            force=args.force,
+            dry_run=args.dry_run,
+            jobs=args.jobs,
+        )
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(2)
+    elapsed = time.perf_counter() - started
+
+    print_results(results)
+
+    built = sum(1 for result in results if result.status == 'built')
+    failed = sum(1 for result in results if result.status in ('failed', 'skipped'))
+    print(f"\n{built} of {len(results)} targets built in {elapsed * 1000:.0f} ms")
+    if failed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
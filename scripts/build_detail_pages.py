@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Pre-render one static detail page per hack into docs/hacks/.
+
+Each page is the library's detail panel as finished HTML, with the
+metadata body rendered from Markdown at build time (see
+utils/detail_pages.py). Pages whose inputs hash the same as on the last
+run are skipped, pages of removed patches are deleted, and
+docs/hacks/index.html lists them all.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from utils.detail_pages import DEFAULT_CACHE, DEFAULT_OUT, build_detail_pages
+from utils.parallel import default_jobs
+from utils import profiling
+
+def main():
+    project_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(
+        description='Pre-render static hack detail pages from metadata',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"""
+Examples:
+  # Render pages whose metadata, patch name or generator changed
+  python scripts/build_detail_pages.py
+
+  # Render every page
+  python scripts/build_detail_pages.py --force
+
+Pages are written to <root>/{DEFAULT_OUT.as_posix()}/<manifest id>.html
+        """
+    )
+    parser.add_argument('--root', type=Path, default=project_root,
+                        help='Project root containing patches/ and metadata/')
+    parser.add_argument('-o', '--output', type=Path,
+                        help=f'Output directory (default: <root>/{DEFAULT_OUT.as_posix()})')
+    parser.add_argument('--cache', type=Path,
+                        help=f'Page hash cache (default: <root>/{DEFAULT_CACHE.as_posix()})')
+    parser.add_argument('--force', action='store_true', help='Render every page')
+    parser.add_argument('--jobs', type=int, default=default_jobs(), metavar='N',
+                        help='Worker processes (default: CPU count, 1 = serial)')
+    profiling.add_profile_arguments(parser, 'build_detail_pages')
+
+    args = parser.parse_args()
+    profiling.enable_from_args(args, 'build_detail_pages')
+
+    warnings, stats = build_detail_pages(
+        args.root, args.output, args.cache or args.root / DEFAULT_CACHE, jobs=args.jobs, force=args.force
+    )
+    for warning in warnings:
+        print(f"⚠️  {warning}", file=sys.stderr)
+
+    print(f"✓ {stats['total']} pages: {stats['rendered']} rendered ({stats['written']} changed), "
+          f"{stats['skipped']} unchanged, {stats['removed']} removed")
+
+if __name__ == '__main__':
+    main()
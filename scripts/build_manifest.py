@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Build docs/manifest.json from patches/ and metadata/.
+
+Produces the same bytes as scripts/generate-manifest.js, but only rebuilds
+entries whose metadata changed since the last run (see
+utils/manifest_builder.py) and only rewrites the manifest when its
+contents differ. Also writes the content-hashed shards the library page
+loads (see utils/manifest_shards.py).
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from utils.manifest_builder import DEFAULT_CACHE, build_manifest, render_manifest, write_if_changed
+from utils.manifest_shards import write_shards
+from utils.static_assets import precompress_dir, publish_assets
+from utils.parallel import default_jobs
+from utils import profiling
+
+def main():
+    project_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(
+        description='Build docs/manifest.json with an incremental build cache',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Incremental build
+  python scripts/build_manifest.py
+
+  # Full rebuild, ignoring the cache
+  python scripts/build_manifest.py --no-cache
+
+  # CI check: fail if the committed manifest is stale
+  python scripts/build_manifest.py --check
+        """
+    )
+    parser.add_argument('--root', type=Path, default=project_root,
+                        help='Project root containing patches/ and metadata/')
+    parser.add_argument('-o', '--output', type=Path,
+                        help='Manifest path (default: <root>/docs/manifest.json)')
+    parser.add_argument('--cache', type=Path,
+                        help=f'Build cache path (default: <root>/{DEFAULT_CACHE.as_posix()})')
+    parser.add_argument('--no-cache', action='store_true', help='Rebuild every entry')
+    parser.add_argument('--shards-dir', type=Path,
+                        help='Library shard directory (default: <root>/docs/manifest)')
+    parser.add_argument('--no-shards', action='store_true', help='Only write manifest.json')
+    parser.add_argument('--no-static', action='store_true',
+                        help='Skip the minified, hashed and compressed copies (build_static_assets.py)')
+    parser.add_argument('--check', action='store_true',
+                        help='Do not write; exit 1 if the manifest is out of date')
+    parser.add_argument('--jobs', type=int, default=default_jobs(), metavar='N',
+                        help='Worker processes for changed entries (default: CPU count, 1 = serial)')
+    profiling.add_profile_arguments(parser, 'build_manifest')
+
+    args = parser.parse_args()
+    profiling.enable_from_args(args, 'build_manifest')
+
+    output = args.output or args.root / 'docs' / 'manifest.json'
+    cache = None if args.no_cache else (args.cache or args.root / DEFAULT_CACHE)
+
+    patches, warnings, stats = build_manifest(args.root, cache, jobs=args.jobs)
+    for warning in warnings:
+        print(warning, file=sys.stderr)
+
+    text = render_manifest(patches)
+    if args.check:
+        try:
+            current = output.read_bytes()
+        except OSError:
+            current = None
+        if current != text.encode('utf-8'):
+            print(f"❌ {output} is out of date", file=sys.stderr)
+            sys.exit(1)
+        print(f"✅ {output} is up to date")
+        return
+
+    with profiling.stage('write'):
+        written = write_if_changed(output, text)
+        if not args.no_shards:
+            shards_dir = args.shards_dir or args.root / 'docs' / 'manifest'
+            pointer, shard_changes = write_shards(patches, shards_dir)
+    if not args.no_static:
+        with profiling.stage('compress'):
+            published, static_changes = publish_assets(output.parent, [output])
+            if not args.no_shards:
+                static_changes += precompress_dir(shards_dir)
+
+    print(f"Generated manifest with {len(patches)} patches")
+    incomplete = sum(1 for patch in patches if patch.get('incomplete'))
+    if incomplete > 0:
+        print(f"{incomplete} patches have incomplete metadata", file=sys.stderr)
+    print(f"  {stats['rebuilt']} rebuilt, {stats['cached']} cached; "
+          f"{'wrote' if written else 'unchanged'} {output}")
+    if not args.no_shards:
+        print(f"  {len(pointer['shards'])} shards + {pointer['index']} + {pointer['search']}; {shard_changes} files changed")
+    if not args.no_static:
+        print(f"  {published[output.name]} + compressed copies; {static_changes} files changed")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Post-build stage: minified, content-hashed, precompressed copies of generated files.
+
+Publishes docs/manifest.json, docs/assets/css/generated/badges.css and the
+docs/config/*.json mirrors as <name>.<hash>.<ext> with .gz/.br siblings,
+records them in docs/asset-map.json, and compresses the manifest shards in
+docs/manifest/ (see utils/static_assets.py). Run it after every step that
+rewrites those files.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from utils.static_assets import ASSET_MAP_FILE, DEFAULT_ASSETS, brotli, find_assets, precompress_dir, publish_assets
+from utils import profiling
+
+def main():
+    project_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(
+        description='Write minified, content-hashed and precompressed copies of generated files'
+    )
+    parser.add_argument('--docs', type=Path, default=project_root / 'docs',
+                        help='Site root (default: docs/)')
+    parser.add_argument('--assets', nargs='+', default=list(DEFAULT_ASSETS), metavar='GLOB',
+                        help='Files to publish, relative to the site root')
+    profiling.add_profile_arguments(parser, 'build_static_assets')
+
+    args = parser.parse_args()
+    profiling.enable_from_args(args, 'build_static_assets')
+
+    paths = find_assets(args.docs, args.assets)
+    if not paths:
+        print(f"❌ No assets found in {args.docs}", file=sys.stderr)
+        sys.exit(1)
+
+    with profiling.stage('publish'):
+        published, changes = publish_assets(args.docs, paths)
+    with profiling.stage('compress'):
+        shards_dir = args.docs / 'manifest'
+        if shards_dir.is_dir():
+            changes += precompress_dir(shards_dir)
+
+    for source, hashed in published.items():
+        print(f"  {source} -> {hashed}")
+    print(f"✓ Published {len(published)} assets; {changes} files changed; map: {args.docs / ASSET_MAP_FILE}")
+    if brotli is None:
+        print("⚠️  brotli not installed; wrote gzip siblings only (pip install brotli)", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Refresh and query the SQLite catalog of metadata and patches.
+
+The catalog (utils/catalog.py) keeps parsed frontmatter, standardized
+filenames and patch digests in .cache/catalog.sqlite, re-reading only the
+files that changed. rename_patches.py and validate_filenames.py --pr read
+it instead of parsing every metadata file.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from utils.catalog import DEFAULT_CATALOG, Catalog
+from utils.parallel import default_jobs
+from utils import profiling
+
+def main():
+    project_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(
+        description='Refresh and query the metadata catalog',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Refresh and show what changed
+  python scripts/catalog.py
+
+  # GBA hacks in beta released after 2023
+  python scripts/catalog.py --system GBA --status "Perpetual Beta" --released-after 2023
+
+  # Any frontmatter field through json_extract
+  python scripts/catalog.py --where "json_extract(frontmatter, '$.difficulty') = 'Kaizo'"
+
+  # Ad-hoc SQL (tables: metadata, patches)
+  python scripts/catalog.py --sql "SELECT base_rom, COUNT(*) FROM metadata GROUP BY base_rom"
+        """
+    )
+    parser.add_argument('--catalog', type=Path, default=project_root / DEFAULT_CATALOG,
+                        help=f'Database file (default: {DEFAULT_CATALOG.as_posix()})')
+    parser.add_argument('--rebuild', action='store_true', help='Delete the catalog and build it from scratch')
+    parser.add_argument('--base-rom', help='Base ROM key, full name or abbreviation')
+    parser.add_argument('--system', help='System name or abbreviation')
+    parser.add_argument('--status', help='Exact status (e.g., "Completed")')
+    parser.add_argument('--released-after', metavar='DATE',
+                        help='YYYY, YYYY-MM or YYYY-MM-DD; a year or month means after its end')
+    parser.add_argument('--where', metavar='SQL', help='Extra SQL condition on the metadata table')
+    parser.add_argument('--sql', help='Run a SQL query and print its rows')
+    parser.add_argument('--json', action='store_true', help='Output JSON format')
+    parser.add_argument('--jobs', type=int, default=default_jobs(), metavar='N',
+                        help='Worker processes for refreshing (default: CPU count, 1 = serial)')
+    profiling.add_profile_arguments(parser, 'catalog')
+
+    args = parser.parse_args()
+    profiling.enable_from_args(args, 'catalog')
+
+    if args.rebuild:
+        args.catalog.unlink(missing_ok=True)
+
+    with Catalog(args.catalog, project_root / 'metadata', project_root / 'patches') as catalog:
+        stats = catalog.refresh(args.jobs)
+
+        try:
+            if args.sql:
+                cursor = catalog.execute(args.sql)
+                columns = [column[0] for column in cursor.description or ()]
+                rows = [dict(zip(columns, row)) for row in cursor]
+                if args.json:
+                    print(json.dumps(rows, indent=2, ensure_ascii=False))
+                else:
+                    for row in rows:
+                        print(' | '.join('' if value is None else str(value) for value in row.values()))
+                return
+
+            filters = (args.base_rom, args.system, args.status, args.released_after, args.where)
+            if not any(filters):
+                if args.json:
+                    print(json.dumps(stats))
+                else:
+                    print(f"📚 {stats['metadata']} metadata files, {stats['patches']} patches "
+                          f"({stats['parsed']} parsed, {stats['hashed']} hashed, {stats['removed']} removed)")
+                return
+
+            entries = catalog.find(args.base_rom, args.system, args.status, args.released_after, args.where)
+        except sqlite3.Error as e:
+            print(f"❌ Query failed: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    if args.json:
+        print(json.dumps([
+            {
+                'metadata': Path(os.path.relpath(entry.metadata_path)).as_posix(),
+                'patch': Path(os.path.relpath(entry.patch_path)).as_posix() if entry.patch_path else None,
+                'frontmatter': entry.frontmatter,
+            }
+            for entry in entries
+        ], indent=2, ensure_ascii=False))
+    else:
+        for entry in entries:
+            meta = entry.frontmatter if isinstance(entry.frontmatter, dict) else {}
+            details = ', '.join(str(meta[field]) for field in ('system', 'baseRom', 'status', 'released')
+                                if meta.get(field) is not None)
+            print(f"{meta.get('title', entry.path)}  ({details})  {entry.path}")
+        print(f"\n{len(entries)} matching entries")
+
+if __name__ == '__main__':
+    main()
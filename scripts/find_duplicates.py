@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Report byte-identical files under patches/ and the space deduplication would save.
+
+Builds the content-addressed patch store (utils/patch_store.py), reusing
+digests from .cache/patch-store.json for files whose mtime and size are
+unchanged.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from utils.patch_store import DEFAULT_CACHE, build_patch_store, format_bytes
+from utils.parallel import default_jobs
+from utils import profiling
+
+def main():
+    project_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(
+        description='Find byte-identical patch files',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # List duplicate groups and potential savings
+  python scripts/find_duplicates.py
+
+  # Fail when any duplicates exist (CI)
+  python scripts/find_duplicates.py --strict
+        """
+    )
+    parser.add_argument('--patches', type=Path, default=project_root / 'patches',
+                        help='Patches directory (default: patches/)')
+    parser.add_argument('--cache', type=Path, default=project_root / DEFAULT_CACHE,
+                        help=f'Digest cache (default: {DEFAULT_CACHE.as_posix()})')
+    parser.add_argument('--no-cache', action='store_true', help='Hash every file')
+    parser.add_argument('--strict', action='store_true', help='Exit 1 if duplicates are found')
+    parser.add_argument('--json', action='store_true', help='Output JSON format')
+    parser.add_argument('--jobs', type=int, default=default_jobs(), metavar='N',
+                        help='Worker processes for hashing (default: CPU count, 1 = serial)')
+    profiling.add_profile_arguments(parser, 'find_duplicates')
+
+    args = parser.parse_args()
+    profiling.enable_from_args(args, 'find_duplicates')
+
+    if not args.patches.is_dir():
+        print(f"❌ Error: Patches directory not found: {args.patches}", file=sys.stderr)
+        sys.exit(1)
+
+    store, stats = build_patch_store(args.patches, None if args.no_cache else args.cache, jobs=args.jobs)
+    groups = store.duplicate_groups()
+    savings = store.dedup_savings()
+
+    if args.json:
+        print(json.dumps({
+            'files': stats['total'],
+            'totalBytes': store.total_size(),
+            'savingsBytes': savings,
+            'duplicates': [
+                {'sha256': group.sha256, 'size': group.size, 'paths': group.paths}
+                for group in groups
+            ],
+        }, indent=2))
+    else:
+        for group in groups:
+            print(f"♻️  {len(group.paths)} copies, {format_bytes(group.size)} each ({group.sha256[:12]})")
+            for path in group.paths:
+                print(f"    {path}")
+        print(f"\n{stats['total']} files, {format_bytes(store.total_size())} "
+              f"({stats['hashed']} hashed, {stats['cached']} cached)")
+        if groups:
+            print(f"⚠️  {len(groups)} sets of identical files; deduplicating would save {format_bytes(savings)}")
+        else:
+            print("✅ No duplicate patches")
+
+    if args.strict and groups:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,19 @@
 #!/usr/bin/env python3
 """Generate badge CSS from config files."""
 
+import argparse
 import json
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+from utils import profiling
+from utils.static_assets import publish_assets
+
 def load_config(config_path) -> dict:
-    with open(config_path, 'r') as f:
-        return json.load(f)
+    with profiling.stage('config'):
+        with open(config_path, 'r') as f:
+            return json.load(f)
 
 def generate_system_badges(systems: dict) -> str:
     css = []
@@ -48,7 +55,12 @@ def generate_rom_badges(base_roms: dict) -> str:
     
     return "\n".join(css)
 
-def write_css_file(output_path, css_content: str) -> None:
+def write_css_file(output_path, css_content: str, docs_root=None) -> None:
+    """Write the badge CSS.
+
+    With docs_root, also publish its minified, content-hashed copy
+    (see utils/static_assets.py).
+    """
     output_file = Path(output_path)
     output_file.parent.mkdir(parents=True, exist_ok=True)
     
@@ -57,22 +69,31 @@ def write_css_file(output_path, css_content: str) -> None:
 
 """
     
-    with open(output_file, 'w') as f:
-        f.write(header + css_content)
+    with profiling.stage('write'):
+        with open(output_file, 'w') as f:
+            f.write(header + css_content)
+        if docs_root is not None:
+            publish_assets(docs_root, [output_file])
 
 def main():
+    parser = argparse.ArgumentParser(description='Generate badge CSS from config files')
+    profiling.add_profile_arguments(parser, 'generate_badge_css')
+    args = parser.parse_args()
+    profiling.enable_from_args(args, 'generate_badge_css')
+    
     project_root = Path(__file__).parent.parent
     
     systems = load_config(project_root / 'config' / 'systems.json')
     base_roms = load_config(project_root / 'config' / 'base-roms.json')
     
-    system_css = generate_system_badges(systems)
-    rom_css = generate_rom_badges(base_roms)
+    with profiling.stage('render'):
+        system_css = generate_system_badges(systems)
+        rom_css = generate_rom_badges(base_roms)
     
     css_content = f"{system_css}\n{rom_css}"
     
     output_path = project_root / 'docs' / 'assets' / 'css' / 'generated' / 'badges.css'
-    write_css_file(output_path, css_content)
+    write_css_file(output_path, css_content, docs_root=project_root / 'docs')
     
     print(f"✓ Generated {output_path}")
     print(f"  - {len(systems)} system badges")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""CLI tool to identify base ROM dumps and record their fingerprints."""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from utils.config_loader import CONFIG_DIR, FINGERPRINTS_FILE, find_matching_crc, get_config
+from utils.rom_identify import hash_rom, identify_rom, parse_header, HEADER_SIZE
+
+def record_fingerprint(rom_path: Path, crc_code: str) -> dict:
+    """Hash a ROM and store it as the fingerprint of a base ROM variant.
+    
+    Args:
+        rom_path: Path to a verified clean ROM dump
+        crc_code: Variant CRC code from config/base-roms.json (e.g., "1961")
+        
+    Returns:
+        The recorded fingerprint
+    """
+    config = get_config()
+    if crc_code not in config.variant_by_crc:
+        raise ValueError(f"Unknown variant CRC code: {crc_code}")
+    
+    size, crc32, md5, sha1 = hash_rom(rom_path)
+    with open(rom_path, 'rb') as f:
+        header = parse_header(f.read(HEADER_SIZE))
+    
+    fingerprint = {'size': size, 'crc32': crc32, 'md5': md5, 'sha1': sha1}
+    if header is not None:
+        fingerprint['gameCode'] = header.game_code
+    
+    fingerprints = dict(config.fingerprints)
+    fingerprints[crc_code] = fingerprint
+    with open(CONFIG_DIR / FINGERPRINTS_FILE, 'w') as f:
+        json.dump(dict(sorted(fingerprints.items())), f, indent=2)
+        f.write('\n')
+    return fingerprint
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Identify a base ROM dump",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Identify a ROM
+  python scripts/identify_rom.py emerald.gba
+  
+  # Record a clean dump as the fingerprint for variant 1961
+  python scripts/identify_rom.py emerald.gba --record 1961
+        """
+    )
+    
+    parser.add_argument('rom', type=Path, help='ROM file')
+    parser.add_argument('--hash', action='store_true', help='Always compute digests')
+    parser.add_argument('--record', metavar='CRC', help='Store fingerprint for this variant CRC code')
+    parser.add_argument('--json', action='store_true', help='Output JSON format')
+    
+    args = parser.parse_args()
+    
+    if not args.rom.is_file():
+        print(f"❌ Error: File not found: {args.rom}", file=sys.stderr)
+        sys.exit(1)
+    
+    if args.record:
+        try:
+            fingerprint = record_fingerprint(args.rom, args.record)
+        except ValueError as e:
+            print(f"❌ Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"✓ Recorded fingerprint for {args.record}: CRC32 {fingerprint['crc32']}")
+        sys.exit(0)
+    
+    identity = identify_rom(args.rom, force_hash=args.hash)
+    crc_code = find_matching_crc(identity.base_rom, identity.variant) if identity.base_rom else None
+    
+    if args.json:
+        result = {
+            'size': identity.size,
+            'system': identity.header.system if identity.header else None,
+            'gameCode': identity.header.game_code if identity.header else None,
+            'title': identity.header.title if identity.header else None,
+            'crc32': identity.crc32,
+            'md5': identity.md5,
+            'sha1': identity.sha1,
+            'baseRom': identity.base_rom,
+            'crc': crc_code
+        }
+        print(json.dumps(result, indent=2))
+    else:
+        if identity.header:
+            print(f"🎮 {identity.header.system}: {identity.header.title} ({identity.header.game_code})")
+        else:
+            print("🎮 Unrecognized console header")
+        print(f"  Size: {identity.size} bytes")
+        if identity.crc32:
+            print(f"  CRC32: {identity.crc32}")
+            print(f"  MD5:   {identity.md5}")
+            print(f"  SHA-1: {identity.sha1}")
+        if identity.base_rom:
+            print(f"✅ {identity.base_rom} ({crc_code})")
+        else:
+            print("⚠️  No matching base ROM fingerprint")
+    
+    sys.exit(0 if identity.base_rom else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Inspect patch headers and cross-check them against base ROM config.
+Used by GitHub Actions to validate submissions and enrich manifest.json.
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from utils.filename_standardizer import parse_metadata_file
+from utils.patch_inspector import cross_check, filename_crc, inspect_patch
+from utils.repo_index import RepoIndex
+
+INSPECTED_EXTENSIONS = ('.ips', '.ups', '.bps', '.xdelta')
+
+def inspect_library(index: RepoIndex) -> dict[str, dict]:
+    """Inspect every patch in the index, keyed by patches-relative path."""
+    results = {}
+    for patch_path in index.patch_files(INSPECTED_EXTENSIONS):
+        info = inspect_patch(patch_path)
+        md_path = index.find_metadata(patch_path)
+        if md_path is not None:
+            try:
+                baserom = parse_metadata_file(md_path).get('baseRom', '')
+                cross_check(info, baserom, filename_crc(patch_path))
+            except Exception as e:
+                info['errors'].append(f"Metadata error: {e}")
+        results[patch_path.relative_to(index.patches_dir).as_posix()] = info
+    return results
+
+def enrich_manifest(manifest_path: Path, index: RepoIndex) -> tuple[bool, int]:
+    """Add a 'patchInfo' object to each manifest entry.
+    
+    Returns:
+        Tuple of (manifest rewritten, number of entries with errors)
+    """
+    text = manifest_path.read_text(encoding='utf-8')
+    manifest = json.loads(text)
+    error_count = 0
+    
+    for entry in manifest:
+        patch_path = index.get_patch(entry['file'])
+        if patch_path is None:
+            continue
+        info = inspect_patch(patch_path)
+        baserom = entry.get('meta', {}).get('baseRom')
+        if baserom:
+            cross_check(info, baserom, filename_crc(patch_path))
+        if info['errors']:
+            error_count += 1
+        entry['patchInfo'] = info
+    
+    # Match generate-manifest.js formatting and skip no-op writes
+    new_text = json.dumps(manifest, indent=2, ensure_ascii=False)
+    if new_text == text:
+        return False, error_count
+    manifest_path.write_text(new_text, encoding='utf-8')
+    return True, error_count
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect patch headers')
+    parser.add_argument('--manifest', type=Path, help='Add patchInfo to entries in manifest.json')
+    parser.add_argument('--json', action='store_true', help='Output JSON format')
+    
+    args = parser.parse_args()
+    
+    root_dir = Path(__file__).parent.parent
+    
+    if args.manifest:
+        patches_dir = Path(os.path.normpath(args.manifest.parent / "../patches"))
+        index = RepoIndex(root_dir / 'metadata', patches_dir)
+        changed, error_count = enrich_manifest(args.manifest, index)
+        print(f"{'✓ Updated' if changed else '✓ Unchanged'} {args.manifest}")
+        if error_count:
+            print(f"⚠️  {error_count} patches have header or base ROM issues")
+        sys.exit(0)
+    
+    index = RepoIndex(root_dir / 'metadata', root_dir / 'patches')
+    results = inspect_library(index)
+    has_errors = any(info['errors'] for info in results.values())
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for rel_path, info in results.items():
+            status = "❌" if info['errors'] else "✅"
+            print(f"{status} {rel_path} ({info['format'] or 'unknown'}, {info['size']} bytes)")
+            for key in ('records', 'sourceSize', 'targetSize', 'sourceCrc32', 'targetCrc32',
+                        'secondaryCompressor', 'baseRomVariant'):
+                if info.get(key) is not None:
+                    print(f"  {key}: {info[key]}")
+            for error in info['errors']:
+                print(f"  - {error}")
+    
+    sys.exit(1 if has_errors else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Mirror manifest images locally, with thumbnails, and point the manifest at them.
+
+Fetches every boxArt/banner URL in docs/manifest.json that is not yet in
+the image store, writes WebP/AVIF thumbnails, then rewrites the manifest
+(and its library shards) to use the local copies. See utils/image_mirror.py.
+Run it after build_manifest.py / inspect_patches.py.
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from utils.image_mirror import (
+    DEFAULT_STORE, DEFAULT_THUMB_WIDTH, THUMB_FORMATS, UrllibFetcher,
+    image_urls, localize_images, mirror_images, prune_store, save_index, thumbnail_formats, thumbnail_task
+)
+from utils.manifest_builder import render_manifest, write_if_changed
+from utils.manifest_shards import write_shards
+from utils.parallel import default_jobs, map_ordered
+from utils.static_assets import publish_assets
+from utils import profiling
+
+def main():
+    project_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(
+        description='Mirror manifest images locally and generate thumbnails',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Fetch new images, make thumbnails, rewrite docs/manifest.json
+  python scripts/mirror_images.py
+
+  # List the image URLs without fetching
+  python scripts/mirror_images.py --dry-run
+        """
+    )
+    parser.add_argument('--manifest', type=Path, default=project_root / 'docs' / 'manifest.json',
+                        help='Manifest to read and rewrite (default: docs/manifest.json)')
+    parser.add_argument('--store', type=Path, default=project_root / DEFAULT_STORE,
+                        help=f'Image store directory (default: {DEFAULT_STORE.as_posix()})')
+    parser.add_argument('--concurrency', type=int, default=16, metavar='N',
+                        help='Maximum fetches in flight (default: 16)')
+    parser.add_argument('--per-host', type=int, default=4, metavar='N',
+                        help='Maximum fetches in flight per host (default: 4)')
+    parser.add_argument('--timeout', type=float, default=30.0, metavar='SECONDS',
+                        help='Per-request timeout (default: 30)')
+    parser.add_argument('--thumb-width', type=int, default=DEFAULT_THUMB_WIDTH, metavar='PX',
+                        help=f'Thumbnail width (default: {DEFAULT_THUMB_WIDTH})')
+    parser.add_argument('--formats', nargs='+', default=list(THUMB_FORMATS), choices=THUMB_FORMATS,
+                        help='Thumbnail formats (default: webp avif)')
+    parser.add_argument('--refresh', action='store_true', help='Fetch images already in the store again')
+    parser.add_argument('--keep-unused', action='store_true',
+                        help='Keep stored images no longer referenced by the manifest')
+    parser.add_argument('--no-rewrite', action='store_true', help='Only update the store, not the manifest')
+    parser.add_argument('--no-shards', action='store_true', help='Do not rewrite docs/manifest/ shards')
+    parser.add_argument('--dry-run', action='store_true', help='List image URLs and exit')
+    parser.add_argument('--jobs', type=int, default=default_jobs(), metavar='N',
+                        help='Worker processes for thumbnails (default: CPU count, 1 = serial)')
+    profiling.add_profile_arguments(parser, 'mirror_images')
+
+    args = parser.parse_args()
+    profiling.enable_from_args(args, 'mirror_images')
+
+    try:
+        patches = json.loads(args.manifest.read_text(encoding='utf-8'))
+    except (OSError, ValueError) as e:
+        print(f"❌ Cannot read {args.manifest}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    urls = image_urls(patches)
+    if args.dry_run:
+        for url in urls:
+            print(url)
+        print(f"\n{len(urls)} image URLs")
+        return
+
+    with profiling.stage('fetch'):
+        index, failures = mirror_images(
+            urls, args.store, UrllibFetcher(timeout=args.timeout),
+            concurrency=args.concurrency, per_host=args.per_host, refresh=args.refresh
+        )
+    for url, error in sorted(failures.items()):
+        print(f"⚠️  {url}: {error}", file=sys.stderr)
+
+    formats = thumbnail_formats(tuple(args.formats))
+    if not formats:
+        print("⚠️  Pillow (with WebP/AVIF support) not installed; skipping thumbnails", file=sys.stderr)
+    missing = [f for f in args.formats if f not in formats]
+
+    # Thumbnails for images whose thumbnail set is missing or outdated
+    todo = []
+    for url in urls:
+        record = index['images'].get(url)
+        if record is None or not formats:
+            continue
+        thumbnail = record.get('thumbnails')
+        if (thumbnail is None or sorted(thumbnail['files']) != sorted(formats)
+                or thumbnail['width'] != min(args.thumb_width, record['width'])
+                or not all((args.store / rel).exists() for rel in thumbnail['files'].values())):
+            todo.append((url, record))
+    with profiling.stage('thumbnails'):
+        tasks = [(str(args.store), record, args.thumb_width, formats) for _, record in todo]
+        thumbnail_failures = 0
+        for (url, record), thumbnail in zip(todo, map_ordered(thumbnail_task, tasks, jobs=args.jobs)):
+            if isinstance(thumbnail, str):
+                thumbnail_failures += 1
+                print(f"⚠️  Thumbnail failed for {url}: {thumbnail}", file=sys.stderr)
+            else:
+                record['thumbnails'] = thumbnail
+    removed = 0 if args.keep_unused else prune_store(args.store, index, set(urls))
+    save_index(args.store, index)
+
+    mirrored = sum(1 for url in urls if url in index['images'])
+    print(f"🖼️  {mirrored}/{len(urls)} images mirrored in {args.store}; "
+          f"{len(todo) - thumbnail_failures} thumbnail sets written, {removed} unused files removed"
+          + (f" (no {', '.join(missing)} support)" if missing and formats else ''))
+
+    if args.no_rewrite:
+        return
+
+    docs_root = args.manifest.parent
+    prefix = '../' + Path(os.path.relpath(args.store, docs_root)).as_posix() + '/'
+    localized = localize_images(patches, index, prefix)
+    with profiling.stage('write'):
+        written = write_if_changed(args.manifest, render_manifest(patches))
+        if written and not args.no_shards:
+            write_shards(patches, docs_root / 'manifest')
+            publish_assets(docs_root, [args.manifest])
+    print(f"✓ {localized} image URLs point at local copies; "
+          f"{'rewrote' if written else 'unchanged'} {args.manifest}")
+
+if __name__ == '__main__':
+    main()
@@ -6,12 +6,16 @@ const fs = require('fs');
  */
 function analyzePR() {
   try {
-    // Get changed files in the PR
+    // Get changed files in the PR with their status (A = added) in one call
     let changedFiles;
     try {
-      changedFiles = execSync('git diff --name-only HEAD~1 HEAD', { encoding: 'utf8' })
+      changedFiles = execSync('git diff --name-status --no-renames HEAD~1 HEAD', { encoding: 'utf8' })
         .split('\n')
-        .filter(file => file.trim());
+        .filter(line => line.trim())
+        .map(line => {
+          const [status, file] = line.split('\t');
+          return { status: status[0], file };
+        });
     } catch (error) {
       // Fallback for testing or when git history is not available
       changedFiles = [];
@@ -31,21 +35,19 @@ function analyzePR() {
       developmentFiles: []
     };
 
-    for (const file of changedFiles) {
+    for (const { status, file } of changedFiles) {
       if (file.startsWith('patches/') && file.match(/\.(ips|bps|ups|xdelta)$/)) {
         // Check if file is new (added) or modified
-        try {
-          execSync(`git cat-file -e HEAD~1:${file}`, { stdio: 'ignore' });
-          analysis.modifiedExisting.push(file);
-        } catch {
+        if (status === 'A') {
           analysis.addedPatches.push(file);
+        } else {
+          analysis.modifiedExisting.push(file);
         }
       } else if (file.startsWith('metadata/') && file.endsWith('.json')) {
-        try {
-          execSync(`git cat-file -e HEAD~1:${file}`, { stdio: 'ignore' });
-          analysis.modifiedExisting.push(file);
-        } catch {
+        if (status === 'A') {
           analysis.addedMetadata.push(file);
+        } else {
+          analysis.modifiedExisting.push(file);
         }
       } else if (file.startsWith('scripts/') || file.startsWith('.github/') || 
                  file.startsWith('docs/assets/') || file.startsWith('tests/')) {
@@ -2,140 +2,224 @@
 """CLI tool to rename patch files to standardized format."""
 import argparse
 import re
-import shutil
 import sys
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 sys.path.insert(0, str(Path(__file__).parent))
+from utils.catalog import Catalog, open_catalog
 from utils.filename_standardizer import standardize_from_metadata, parse_metadata_file
+from utils.rename_journal import DEFAULT_JOURNAL, RenameJournal, atomic_write, plan_steps
+from utils.repo_index import RepoIndex
+from utils.ndjson import NdjsonWriter
+from utils.parallel import default_jobs, imap_ordered
+from utils.patch_store import DEFAULT_CACHE, PatchStore, build_patch_store, format_bytes
+from utils import profiling
 
-def scan_metadata_files(metadata_dir: Path, baserom_filter: Optional[str] = None) -> list[Path]:
+def scan_metadata_files(index: RepoIndex, baserom_filter: Optional[str] = None) -> list[Path]:
     """Scan for metadata files.
     
     Args:
-        metadata_dir: Path to metadata directory
+        index: Repository index of metadata and patch files
         baserom_filter: Optional base ROM filter (e.g., "emerald")
         
     Returns:
         List of metadata file paths
     """
-    if baserom_filter:
-        pattern = f"{baserom_filter}/*.md"
-    else:
-        pattern = "**/*.md"
-    
-    return sorted(metadata_dir.glob(pattern))
+    return index.metadata_files(baserom_filter)
 
-def find_patch_file(metadata: dict, patches_dir: Path, md_path: Path) -> Optional[Path]:
+def find_patch_file(metadata: dict, index: RepoIndex, md_path: Path) -> Optional[Path]:
     """Find corresponding patch file for metadata.
     
+    Uses the 'file' field in metadata first, then falls back to a patch
+    with the same base name in the same base ROM subdirectory.
+    
     Args:
         metadata: Parsed metadata dictionary
-        patches_dir: Path to patches directory
+        index: Repository index of metadata and patch files
         md_path: Path to metadata file
         
     Returns:
         Path to patch file or None if not found
     """
-    # Try to find patch file using 'file' field in metadata
-    if 'file' in metadata:
-        file_path = metadata['file']
-        # Handle relative paths
-        if file_path.startswith('../patches/'):
-            file_path = file_path.replace('../patches/', '')
-        patch_path = patches_dir / file_path
-        if patch_path.exists():
-            return patch_path
-    
-    # Fallback: look for patch file with same base name in same subdirectory
-    baserom_subdir = md_path.parent.name
-    patch_subdir = patches_dir / baserom_subdir
+    return index.find_patch(md_path, metadata)
+
+_worker_index: Optional[RepoIndex] = None
+
+def _init_worker(index: RepoIndex) -> None:
+    """Install the shared repository index in a worker process."""
+    global _worker_index
+    _worker_index = index
+
+def _plan_entry(md_path: Path) -> tuple[Optional[dict], Optional[str]]:
+    """Build the rename plan entry for one metadata file.
+    
+    Returns:
+        Tuple of (plan entry or None, message for stderr or None)
+    """
+    try:
+        metadata = parse_metadata_file(md_path)
+        patch_path = find_patch_file(metadata, _worker_index, md_path)
+        
+        if not patch_path:
+            return None, f"⚠️  Warning: No patch file found for {md_path.name}"
+        
+        return standardize_from_metadata(md_path, patch_path, metadata), None
+        
+    except Exception as e:
+        return None, f"❌ Error processing {md_path.name}: {e}"
+
+def iter_rename_plan(metadata_dir: Path, patches_dir: Path, baserom_filter: Optional[str] = None,
+                     jobs: Optional[int] = 1) -> Iterator[dict]:
+    """Yield rename operations one by one, as soon as each is planned.
     
-    if patch_subdir.exists():
-        # Look for any patch file with similar name
-        md_stem = md_path.stem
-        for ext in ['.bps', '.ips', '.ups', '.xdelta', '.gba', '.nds', '.gb', '.gbc']:
-            patch_path = patch_subdir / f"{md_stem}{ext}"
-            if patch_path.exists():
-                return patch_path
+    Warnings and errors for metadata files without a plan entry go to stderr.
     
-    return None
+    Args:
+        metadata_dir: Path to metadata directory
+        patches_dir: Path to patches directory
+        baserom_filter: Optional base ROM filter
+        jobs: Worker processes (None for one per CPU, 1 for serial)
+    """
+    index = RepoIndex(metadata_dir, patches_dir)
+    md_files = scan_metadata_files(index, baserom_filter)
+    
+    for result, message in imap_ordered(_plan_entry, md_files, jobs, _init_worker, (index,)):
+        if message:
+            print(message, file=sys.stderr)
+        if result is not None:
+            yield result
 
-def generate_rename_plan(metadata_dir: Path, patches_dir: Path, baserom_filter: Optional[str] = None) -> list[dict]:
+def iter_catalog_plan(catalog: Catalog, baserom_filter: Optional[str] = None) -> Iterator[dict]:
+    """Yield rename operations from a refreshed catalog, in iter_rename_plan's order and format.
+    
+    Args:
+        catalog: Catalog of the metadata and patches directories
+        baserom_filter: Optional base ROM filter
+    """
+    for entry in catalog.entries(baserom_filter):
+        md_name = entry.metadata_path.name
+        if entry.error is not None:
+            print(f"❌ Error processing {md_name}: {entry.error}", file=sys.stderr)
+        elif entry.patch_path is None:
+            print(f"⚠️  Warning: No patch file found for {md_name}", file=sys.stderr)
+        else:
+            yield {
+                'old_filename': entry.old_filename,
+                'new_filename': entry.new_filename,
+                'metadata_path': str(entry.metadata_path),
+                'patch_path': str(entry.patch_path),
+                'needs_rename': entry.needs_rename,
+                'warnings': entry.warnings,
+            }
+
+def generate_rename_plan(metadata_dir: Path, patches_dir: Path, baserom_filter: Optional[str] = None,
+                         jobs: Optional[int] = 1) -> list[dict]:
     """Generate rename plan for all patches.
     
     Args:
         metadata_dir: Path to metadata directory
         patches_dir: Path to patches directory
         baserom_filter: Optional base ROM filter
+        jobs: Worker processes (None for one per CPU, 1 for serial)
         
     Returns:
         List of rename operations
     """
-    md_files = scan_metadata_files(metadata_dir, baserom_filter)
-    plan = []
+    return list(iter_rename_plan(metadata_dir, patches_dir, baserom_filter, jobs))
+
+def is_identical_target(item: dict, store: Optional[PatchStore]) -> bool:
+    """Whether a rename's target already exists with the same bytes as its patch."""
+    if store is None:
+        return False
+    patch_path = Path(item['patch_path'])
+    new_path = patch_path.parent / item['new_filename']
+    return new_path != patch_path and new_path.exists() and store.identical(patch_path, new_path)
+
+def check_plan_item(item: dict, new_filenames: set[str], store: Optional[PatchStore] = None,
+                    vacated: Optional[set[str]] = None) -> list[str]:
+    """Validate one rename operation against the ones checked before it.
     
-    for md_path in md_files:
-        try:
-            metadata = parse_metadata_file(md_path)
-            patch_path = find_patch_file(metadata, patches_dir, md_path)
-            
-            if not patch_path:
-                print(f"⚠️  Warning: No patch file found for {md_path.name}", file=sys.stderr)
-                continue
-            
-            result = standardize_from_metadata(md_path, patch_path)
-            plan.append(result)
-            
-        except Exception as e:
-            print(f"❌ Error processing {md_path.name}: {e}", file=sys.stderr)
-    
-    return plan
+    Args:
+        item: Rename operation
+        new_filenames: Target names claimed so far; updated in place
+        store: Patch store; targets byte-identical to their patch are
+            allowed (execute_renames skips them)
+        vacated: Patch paths the plan renames away; targets among them are
+            allowed (swaps and cycles)
+        
+    Returns:
+        Error messages (empty if valid)
+    """
+    errors = []
+    new_filename = item['new_filename']
+    if is_identical_target(item, store):
+        return errors
+    
+    # Check for collisions
+    if new_filename in new_filenames:
+        errors.append(f"Duplicate filename: {new_filename}")
+    new_filenames.add(new_filename)
+    
+    # Check if new file already exists (and it's not the same file)
+    if target_taken(item, vacated):
+        errors.append(f"File already exists: {new_filename}")
+    
+    return errors
+
+def target_taken(item: dict, vacated: Optional[set[str]] = None) -> bool:
+    """Whether a rename's target exists, is another file, and is not renamed away."""
+    patch_path = Path(item['patch_path'])
+    new_path = patch_path.parent / item['new_filename']
+    return new_path.exists() and new_path != patch_path and str(new_path) not in (vacated or ())
 
-def validate_plan(plan: list[dict]) -> tuple[bool, list[str]]:
+def validate_plan(plan: list[dict], store: Optional[PatchStore] = None) -> tuple[bool, list[str]]:
     """Validate rename plan.
     
     Args:
         plan: List of rename operations
+        store: Patch store; targets byte-identical to their patch are
+            allowed (execute_renames skips them)
         
     Returns:
         Tuple of (is_valid, errors)
     """
     errors = []
-    new_filenames = set()
+    new_filenames: set[str] = set()
+    vacated = {item['patch_path'] for item in plan if item['needs_rename']}
     
     for item in plan:
-        new_filename = item['new_filename']
-        
-        # Check for collisions
-        if new_filename in new_filenames:
-            errors.append(f"Duplicate filename: {new_filename}")
-        new_filenames.add(new_filename)
-        
-        # Check if new file already exists (and it's not the same file)
-        patch_path = Path(item['patch_path'])
-        new_path = patch_path.parent / new_filename
-        if new_path.exists() and new_path != patch_path:
-            errors.append(f"File already exists: {new_filename}")
+        errors.extend(check_plan_item(item, new_filenames, store, vacated))
     
     return len(errors) == 0, errors
 
-def execute_renames(plan: list[dict], backup: bool = False, dry_run: bool = True) -> None:
-    """Execute rename operations.
+def execute_renames(plan: list[dict], backup: bool = False, dry_run: bool = True,
+                    store: Optional[PatchStore] = None, journal_path: Path = DEFAULT_JOURNAL) -> None:
+    """Execute rename operations through a journal.
+    
+    Every step is written to the journal before any file is touched, so an
+    interrupted run can be finished with resume_renames() or undone with
+    rollback_renames(). Swaps and cycles go through temporary names.
+    Renames whose target already exists with identical bytes are skipped,
+    leaving both files and the metadata untouched.
     
     Args:
         plan: List of rename operations
-        backup: Whether to create backups
+        backup: Whether to create backups (reflinks or hard links where possible)
         dry_run: If True, only show what would be done
+        store: Patch store used to recognize byte-identical targets
+        journal_path: Journal file
+        
+    Raises:
+        RuntimeError: If an unfinished journal exists
+        ValueError: If a metadata file would overwrite an existing one
     """
-    backup_dir: Optional[Path] = None
-    if backup and not dry_run:
-        backup_dir = Path('.backup') / datetime.now().strftime('%Y-%m-%d_%H%M%S')
-        backup_dir.mkdir(parents=True, exist_ok=True)
-        print(f"📦 Backup directory: {backup_dir}\n")
+    if dry_run:
+        return
     
+    renames = []
     for item in plan:
         if not item['needs_rename']:
             continue
@@ -143,76 +227,109 @@ def execute_renames(plan: list[dict], backup: bool = False, dry_run: bool = True
         patch_path = Path(item['patch_path'])
         new_path = patch_path.parent / item['new_filename']
         
-        if dry_run:
+        if is_identical_target(item, store):
+            print(f"  ⏭️  Skipped {patch_path.name}: identical to existing {new_path.name}")
             continue
         
-        # Create backup
-        if backup and backup_dir is not None:
-            backup_path = backup_dir / patch_path.name
-            shutil.copy2(patch_path, backup_path)
-        
-        # Rename file
-        patch_path.rename(new_path)
-        
-        # Update and rename metadata file
-        new_md_path = update_metadata_file(Path(item['metadata_path']), item['new_filename'])
-        print(f"  ✓ Renamed metadata: {new_md_path.name}")
-
-def update_metadata_file(md_path: Path, new_filename: str) -> Path:
-    """Update 'file' field in metadata and rename metadata file to match.
+        md_path = Path(item['metadata_path'])
+        content = rewrite_file_field(md_path.read_text(encoding='utf-8'), md_path, item['new_filename'])
+        renames.append((str(patch_path), str(new_path), str(md_path), content))
     
-    Args:
-        md_path: Path to metadata file
-        new_filename: New patch filename
-        
-    Returns:
-        New metadata file path
-    """
-    with open(md_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    if not renames:
+        return
+    
+    backup_dir: Optional[Path] = None
+    if backup:
+        backup_dir = Path('.backup') / datetime.now().strftime('%Y-%m-%d_%H%M%S')
+        print(f"📦 Backup directory: {backup_dir}\n")
     
+    journal = RenameJournal(journal_path)
+    with profiling.stage('journal'):
+        journal.create(plan_steps(renames, backup_dir), info={'backup_dir': str(backup_dir) if backup_dir else None})
+    with profiling.stage('rename'):
+        journal.run(on_step=_report_step)
+
+def _report_step(step: dict) -> None:
+    # Moves into a cycle-breaking temporary name are reported once they
+    # reach their destination
+    if step['op'] == 'move' and not step.get('temp'):
+        print(f"  ✓ Renamed {Path(step.get('from', step['src'])).name} → {Path(step['dst']).name}")
+
+def resume_renames(journal_path: Path = DEFAULT_JOURNAL) -> int:
+    """Finish an interrupted run from its journal. Returns the number of steps carried out."""
+    with profiling.stage('rename'):
+        return RenameJournal(journal_path).run(on_step=_report_step)
+
+def rollback_renames(journal_path: Path = DEFAULT_JOURNAL) -> int:
+    """Undo the last run (finished or not) from its journal. Returns the number of steps undone."""
+    with profiling.stage('rename'):
+        return RenameJournal(journal_path).rollback()
+
+def rewrite_file_field(content: str, md_path: Path, new_filename: str) -> str:
+    """Point the 'file' field of a metadata file's contents at a new patch filename."""
     # Extract baserom subdirectory from metadata path
     baserom_subdir = md_path.parent.name
     new_file_path = f"../patches/{baserom_subdir}/{new_filename}"
     
     # Update 'file' field in YAML frontmatter
-    content = re.sub(
+    return re.sub(
         r'(file:\s*)["\']?.*?["\']?\s*\n',
         f'\\1"{new_file_path}"\n',
         content
     )
+
+def update_metadata_file(md_path: Path, new_filename: str) -> Path:
+    """Update 'file' field in metadata and rename metadata file to match.
     
-    # Generate new metadata filename (same as patch but .md extension)
-    new_md_filename = Path(new_filename).stem + '.md'
-    new_md_path = md_path.parent / new_md_filename
+    The new contents are written atomically; use execute_renames for
+    batches that must survive interruption.
     
-    # Write to new location
-    with open(new_md_path, 'w', encoding='utf-8') as f:
-        f.write(content)
+    Args:
+        md_path: Path to metadata file
+        new_filename: New patch filename
+        
+    Returns:
+        New metadata file path
+    """
+    with profiling.stage('write'):
+        content = rewrite_file_field(md_path.read_text(encoding='utf-8'), md_path, new_filename)
+        
+        # Generate new metadata filename (same as patch but .md extension)
+        new_md_path = md_path.parent / (Path(new_filename).stem + '.md')
+        atomic_write(md_path, content)
+        if new_md_path != md_path:
+            md_path.rename(new_md_path)
+        return new_md_path
+
+def print_plan(plan: Iterable[dict], total: Optional[int] = None) -> int:
+    """Print rename plan in formatted output, one operation at a time.
     
-    # Remove old file if different
-    if new_md_path != md_path:
-        md_path.unlink()
+    Args:
+        plan: Rename operations (a list, or a generator such as iter_rename_plan)
+        total: Number of operations, for the [i/total] counter (default: len(plan))
+        
+    Returns:
+        Number of files to rename
+    """
+    if total is None:
+        total = len(plan)
     
-    return new_md_path
-
-def print_plan(plan: list[dict]) -> None:
-    """Print rename plan in formatted output."""
     print("╔" + "═" * 78 + "╗")
     print("║" + " " * 25 + "PATCH RENAME PLAN" + " " * 36 + "║")
     print("╚" + "═" * 78 + "╝")
     print()
     
-    rename_count = sum(1 for item in plan if item['needs_rename'])
+    rename_count = 0
     
     for i, item in enumerate(plan, 1):
         if not item['needs_rename']:
             continue
+        rename_count += 1
         
         patch_path = Path(item['patch_path'])
         baserom_subdir = patch_path.parent.name
         
-        print(f"[{i}/{len(plan)}] {baserom_subdir}/{item['old_filename']}")
+        print(f"[{i}/{total}] {baserom_subdir}/{item['old_filename']}")
         print(f"  OLD: {item['old_filename']}")
         print(f"  NEW: {item['new_filename']}")
         print(f"  📄 Metadata: {Path(item['metadata_path']).relative_to(Path.cwd())}")
@@ -227,6 +344,48 @@ def print_plan(plan: list[dict]) -> None:
     print("─" * 80)
     print(f"Summary: {rename_count} files to rename")
     print()
+    return rename_count
+
+def stream_plan(plan: Iterable[dict], store: Optional[PatchStore] = None) -> bool:
+    """Write each rename operation as an NDJSON record as it is planned, then a summary.
+    
+    Records are checked as validate_plan checks them. One whose target
+    exists is held, with those after it, until the plan shows whether that
+    target is renamed away.
+    
+    Returns:
+        True if no operation has validation errors
+    """
+    writer = NdjsonWriter()
+    new_filenames: set[str] = set()
+    vacated: set[str] = set()
+    # A target that exists now may be renamed away by a later operation
+    # (swaps and cycles), so such records wait, in order, for the full plan
+    pending: deque[dict] = deque()
+    checked = renames = failed = 0
+    
+    def flush(complete: bool) -> None:
+        nonlocal checked, renames, failed
+        while pending:
+            item = pending[0]
+            if not complete and not is_identical_target(item, store) and target_taken(item, vacated):
+                return
+            pending.popleft()
+            errors = check_plan_item(item, new_filenames, store, vacated)
+            checked += 1
+            renames += bool(item['needs_rename'])
+            failed += bool(errors)
+            writer.emit('result', **item, identical_target=is_identical_target(item, store),
+                        valid=not errors, errors=errors)
+    
+    for item in plan:
+        if item['needs_rename']:
+            vacated.add(item['patch_path'])
+        pending.append(item)
+        flush(complete=False)
+    flush(complete=True)
+    writer.summary(valid=failed == 0, checked=checked, renames=renames, invalid=failed)
+    return failed == 0
 
 def main():
     parser = argparse.ArgumentParser(
@@ -245,6 +404,19 @@ Examples:
   
   # With backup
   python scripts/rename_patches.py --apply --backup
+  
+  # Finish or undo an interrupted --apply run
+  python scripts/rename_patches.py --resume
+  python scripts/rename_patches.py --rollback
+  
+  # Plan as NDJSON records, streamed while planning
+  python scripts/rename_patches.py --ndjson
+  
+  # Serial planning (no worker processes)
+  python scripts/rename_patches.py --jobs 1
+  
+  # Per-stage timing and memory report
+  python scripts/rename_patches.py --profile rename-profile.json
         """
     )
     
@@ -258,18 +430,51 @@ Examples:
         action='store_true',
         help='Create backup before renaming'
     )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Finish an interrupted --apply run from its journal'
+    )
+    parser.add_argument(
+        '--rollback',
+        action='store_true',
+        help='Undo the last --apply run (finished or interrupted) from its journal'
+    )
     parser.add_argument(
         '--baserom',
         type=str,
         help='Filter by base ROM subdirectory (e.g., emerald)'
     )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=default_jobs(),
+        metavar='N',
+        help='Worker processes for planning (default: CPU count, 1 = serial)'
+    )
+    parser.add_argument(
+        '--no-catalog',
+        action='store_true',
+        help='Parse every metadata file instead of reading the catalog (.cache/catalog.sqlite)'
+    )
+    parser.add_argument(
+        '--ndjson',
+        action='store_true',
+        help='Stream the plan as one JSON record per file, then a summary (dry-run only)'
+    )
     parser.add_argument(
         '--verbose',
         action='store_true',
         help='Verbose output'
     )
+    profiling.add_profile_arguments(parser, 'rename_patches')
     
     args = parser.parse_args()
+    if args.ndjson and args.apply:
+        parser.error('--ndjson only streams the plan; it cannot be combined with --apply')
+    if sum((args.apply, args.resume, args.rollback)) > 1:
+        parser.error('--apply, --resume and --rollback are mutually exclusive')
+    profiling.enable_from_args(args, 'rename_patches')
     
     # Paths
     root_dir = Path(__file__).parent.parent
@@ -284,16 +489,57 @@ Examples:
         print(f"❌ Error: Patches directory not found: {patches_dir}", file=sys.stderr)
         sys.exit(1)
     
+    journal = RenameJournal(root_dir / DEFAULT_JOURNAL)
+    if args.resume or args.rollback:
+        if not journal.exists():
+            print("❌ Error: No rename journal found", file=sys.stderr)
+            sys.exit(1)
+        if args.resume:
+            if journal.complete():
+                print("✅ The last run already finished; nothing to resume")
+                sys.exit(0)
+            print("🔁 Resuming interrupted renames...\n")
+            ran = resume_renames(journal.path)
+            print(f"✅ Done! ({ran} steps carried out)")
+        else:
+            print("↩️  Rolling back the last run...\n")
+            undone = rollback_renames(journal.path)
+            print(f"✅ Rolled back {undone} steps")
+        sys.exit(0)
+    if args.apply and journal.exists() and not journal.complete():
+        print("❌ Error: An interrupted rename run was found; "
+              "finish it with --resume or undo it with --rollback", file=sys.stderr)
+        sys.exit(1)
+    
+    catalog = None if args.no_catalog else open_catalog(root_dir, jobs=args.jobs)
+    
+    if args.ndjson:
+        if catalog is not None:
+            store = catalog.patch_store()
+            plan = iter_catalog_plan(catalog, args.baserom)
+        else:
+            store, _ = build_patch_store(patches_dir, root_dir / DEFAULT_CACHE, jobs=args.jobs)
+            plan = iter_rename_plan(metadata_dir, patches_dir, args.baserom, jobs=args.jobs)
+        sys.exit(0 if stream_plan(plan, store) else 1)
+    
     # Generate plan
     print("🔍 Scanning metadata files...\n")
-    plan = generate_rename_plan(metadata_dir, patches_dir, args.baserom)
+    if catalog is not None:
+        plan = list(iter_catalog_plan(catalog, args.baserom))
+    else:
+        plan = generate_rename_plan(metadata_dir, patches_dir, args.baserom, jobs=args.jobs)
     
     if not plan:
         print("No patches found to rename.")
         sys.exit(0)
     
+    if catalog is not None:
+        store = catalog.patch_store()
+    else:
+        store, _ = build_patch_store(patches_dir, root_dir / DEFAULT_CACHE, jobs=args.jobs)
+    
     # Validate plan
-    is_valid, errors = validate_plan(plan)
+    is_valid, errors = validate_plan(plan, store)
     if not is_valid:
         print("❌ Validation errors:", file=sys.stderr)
         for error in errors:
@@ -303,10 +549,19 @@ Examples:
     # Print plan
     print_plan(plan)
     
+    savings = store.dedup_savings()
+    if savings:
+        print(f"♻️  {len(store.duplicate_groups())} sets of identical patches; "
+              f"deduplicating would save {format_bytes(savings)} (see find_duplicates.py)\n")
+    
     # Execute
     if args.apply:
         print("✅ Executing renames...\n")
-        execute_renames(plan, backup=args.backup, dry_run=False)
+        try:
+            execute_renames(plan, backup=args.backup, dry_run=False, store=store, journal_path=journal.path)
+        except ValueError as e:
+            print(f"❌ Error: {e}", file=sys.stderr)
+            sys.exit(1)
         print("✅ Done!")
     else:
         print("Run with --apply to execute renames")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Call the standardizer through a running standardizer_server.py.
+
+Falls back to running the standardizer in this process when no server
+is listening, so it works either way; with a server, a call costs a
+socket round trip instead of loading YAML and config/.
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from utils.standardizer_client import DEFAULT_SOCKET, StandardizerClient, StandardizerError
+
+# Positional params that are paths, made absolute for the server's working directory
+PATH_PARAMS = {'standardize': 2, 'validate': 2}
+
+def main():
+    project_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(
+        description='Call the filename standardizer (server if running, in-process otherwise)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python scripts/standardize.py normalize_title "Pokemon Emerald"
+  python scripts/standardize.py parse_version "v1.1 VANILLA+"
+  python scripts/standardize.py standardize metadata/emerald/HACK.md
+  python scripts/standardize.py validate metadata/emerald/HACK.md patches/emerald/HACK.bps
+
+  # Forward JSON-RPC request lines from stdin, print one response per line
+  python scripts/standardize.py - < requests.ndjson
+        """
+    )
+    parser.add_argument('method', help='standardize, validate, parse_version, normalize_title, or - for stdin')
+    parser.add_argument('params', nargs='*', help='Positional params')
+    parser.add_argument('--socket', type=Path, default=project_root / DEFAULT_SOCKET,
+                        help=f'Server socket (default: {DEFAULT_SOCKET.as_posix()})')
+    parser.add_argument('--no-server', action='store_true', help='Always run in-process')
+
+    args = parser.parse_args()
+
+    with StandardizerClient(None if args.no_server else args.socket) as client:
+        if args.method == '-':
+            lines = [line for line in sys.stdin if line.strip()]
+            for response in client.send_lines(lines):
+                print(response)
+            return
+
+        params = list(args.params)
+        for i in range(min(PATH_PARAMS.get(args.method, 0), len(params))):
+            params[i] = os.path.abspath(params[i])
+        try:
+            result = client.call(args.method, *params)
+        except StandardizerError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            sys.exit(1)
+
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Long-lived JSON-RPC server for the filename standardizer.
+
+Keeps filename_standardizer, the YAML loader, config/ and the compiled
+metadata schema loaded, so tooling that makes many calls pays Python
+startup once. Methods: standardize, validate, parse_version,
+normalize_title (see utils/standardizer_rpc.py).
+
+Requests are one JSON-RPC 2.0 message (or batch) per line, answered with
+one line each, on stdin/stdout or on a Unix socket. Config changes are
+picked up on the next request.
+"""
+import argparse
+import os
+import signal
+import socket
+import socketserver
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from utils.standardizer_client import DEFAULT_SOCKET
+from utils.standardizer_rpc import handle_line, warm_up
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        for raw in self.rfile:
+            response = handle_line(raw.decode('utf-8'))
+            self.wfile.write(((response or '') + '\n').encode('utf-8'))
+            self.wfile.flush()
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def serve_stdio() -> None:
+    """Answer request lines from stdin on stdout until EOF."""
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        sys.stdout.write((handle_line(line) or '') + '\n')
+        sys.stdout.flush()
+
+def _interrupt(signum, frame) -> None:
+    raise KeyboardInterrupt
+
+def serve_socket(socket_path: Path) -> None:
+    """Answer requests on a Unix socket until interrupted."""
+    if socket_path.exists():
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(socket_path))
+        except OSError:
+            socket_path.unlink()  # left behind by a server that died
+        else:
+            print(f"❌ Error: A server is already listening on {socket_path}", file=sys.stderr)
+            sys.exit(1)
+        finally:
+            probe.close()
+
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    server = _Server(str(socket_path), _Handler)
+    signal.signal(signal.SIGTERM, _interrupt)
+    print(f"🔌 Standardizer listening on {socket_path} (pid {os.getpid()})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
+
+def main():
+    project_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(
+        description='Serve the filename standardizer over JSON-RPC',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"""
+Examples:
+  # Unix socket (clients: scripts/standardize.py, utils/standardizer_client.py)
+  python scripts/standardizer_server.py --socket &
+
+  # stdin/stdout, one request per line
+  echo '{{"jsonrpc": "2.0", "id": 1, "method": "normalize_title", "params": ["Pokemon Emerald"]}}' \\
+    | python scripts/standardizer_server.py
+
+Default socket: {DEFAULT_SOCKET.as_posix()}
+        """
+    )
+    parser.add_argument('--socket', type=Path, nargs='?', const=project_root / DEFAULT_SOCKET, metavar='PATH',
+                        help='Listen on a Unix socket instead of stdin/stdout')
+
+    args = parser.parse_args()
+
+    warm_up()
+
+    if args.socket:
+        serve_socket(args.socket)
+    else:
+        serve_stdio()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,482 @@
+"""Dependency graph of the generated site outputs.
+
+Each target names the files it is built from and the outputs it writes:
+
+- badges: config/systems.json + config/base-roms.json -> badges.css
+- docs-config: config/*.json -> docs/config (plus hashed copies)
+- manifest: metadata/ + patch file names -> docs/manifest.json and shards
+- docs-metadata: metadata/ -> docs/metadata
+- detail-pages: metadata/ + patch file names -> docs/hacks (one page per hack)
+
+A target is rebuilt when the combined hash of its inputs differs from the
+last build, or when an output is missing or was changed by hand. File
+hashes are cached by mtime and size, so a no-op build only stats files.
+Targets whose dependencies are satisfied run in parallel.
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+
+from .detail_pages import DEFAULT_CACHE as DETAIL_PAGES_CACHE
+from .detail_pages import DEFAULT_OUT as DETAIL_PAGES_OUT
+from .detail_pages import build_detail_pages
+from .manifest_builder import DEFAULT_CACHE as MANIFEST_CACHE
+from .manifest_builder import MANIFEST_EXTENSIONS, build_manifest, render_manifest, write_if_changed
+from .manifest_shards import write_shards
+from .parallel import map_ordered
+from .profiling import stage
+from .static_assets import find_assets, hashed_copy_source, precompress_dir, publish_assets
+
+STATE_VERSION = 1
+DEFAULT_STATE = Path('.cache') / 'build-state.json'
+
+class Target(NamedTuple):
+    """One buildable output of the graph."""
+    name: str
+    description: str
+    # Globs (relative to the root) whose file contents are inputs
+    inputs: tuple[str, ...]
+    # Globs whose file names, but not contents, are inputs
+    listed: tuple[str, ...]
+    outputs: tuple[str, ...]
+    deps: tuple[str, ...] = ()
+
+# Builder code is an input too, so changing a generator rebuilds its output
+TARGETS = (
+    Target(
+        'badges', 'Badge CSS from config/',
+        inputs=('config/systems.json', 'config/base-roms.json', 'scripts/generate_badge_css.py'),
+        listed=(),
+        outputs=('docs/assets/css/generated/badges.css',),
+    ),
+    Target(
+        'docs-config', 'Site copy of config/',
+        inputs=('config/*.json',),
+        listed=(),
+        outputs=('docs/config',),
+    ),
+    Target(
+        'manifest', 'docs/manifest.json and library shards',
+        inputs=(
+            'metadata/**/*.md',
+            'scripts/utils/manifest_builder.py',
+            'scripts/utils/frontmatter.py',
+            'scripts/utils/manifest_shards.py',
+            'scripts/utils/search_index.py',
+        ),
+        listed=tuple(f'patches/**/*.{ext}' for ext in MANIFEST_EXTENSIONS),
+        outputs=('docs/manifest.json', 'docs/manifest/latest.json'),
+    ),
+    Target(
+        'docs-metadata', 'Site copy of metadata/',
+        inputs=('metadata/**/*',),
+        listed=(),
+        outputs=('docs/metadata',),
+    ),
+    Target(
+        'detail-pages', 'Pre-rendered hack pages in docs/hacks',
+        inputs=(
+            'metadata/**/*.md',
+            'config/base-roms.json',
+            'config/site.json',
+            'scripts/utils/detail_pages.py',
+            'scripts/utils/manifest_builder.py',
+            'scripts/utils/frontmatter.py',
+        ),
+        listed=tuple(f'patches/**/*.{ext}' for ext in MANIFEST_EXTENSIONS),
+        outputs=(DETAIL_PAGES_OUT.as_posix(),),
+    ),
+)
+
+@lru_cache(maxsize=None)
+def _glob_regex(pattern: str) -> re.Pattern:
+    """Compile a glob with *, ? and **/ (any directories) to a path regex."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+        elif pattern[i] == '*':
+            out.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            out.append('[^/]')
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile(''.join(out) + '$')
+
+def affected_targets(paths: set[str], targets: tuple[Target, ...] = TARGETS) -> list[str]:
+    """Names of the targets with an input or listed glob matching a changed path.
+
+    Args:
+        paths: Root-relative paths; a trailing slash marks a directory,
+            which affects every glob below it
+
+    Returns:
+        Target names in graph order
+    """
+    names = []
+    for target in targets:
+        for pattern in target.inputs + target.listed:
+            match = _glob_regex(pattern).match
+            top = pattern.partition('/')[0] + '/'
+            if any(
+                (path.startswith(top) or top.startswith(path)) if path.endswith('/') else match(path)
+                for path in paths
+            ):
+                names.append(target.name)
+                break
+    return names
+
+class FileTree:
+    """Files under the root, scanned once per top-level directory."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        # top-level dir -> sorted [(rel path, DirEntry)]; DirEntry caches its stat
+        self._files: dict[str, list[tuple[str, os.DirEntry]]] = {}
+        self._entries: dict[str, os.DirEntry] = {}
+
+    def _scan(self, top: str) -> list[tuple[str, os.DirEntry]]:
+        if top in self._files:
+            return self._files[top]
+        files = []
+        stack = [top]
+        while stack:
+            rel_dir = stack.pop()
+            try:
+                entries = os.scandir(self.root / rel_dir)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    rel = f"{rel_dir}/{entry.name}"
+                    if entry.is_dir():
+                        stack.append(rel)
+                    elif entry.is_file():
+                        files.append((rel, entry))
+        files.sort()
+        self._files[top] = files
+        self._entries.update(files)
+        return files
+
+    def stat(self, rel: str) -> Optional[os.stat_result]:
+        """Stat of a scanned file, or None if it was not scanned."""
+        entry = self._entries.get(rel)
+        return entry.stat() if entry is not None else None
+
+    def glob(self, pattern: str) -> list[str]:
+        """Files matching a root-relative glob, sorted."""
+        top, _, rest = pattern.partition('/')
+        if not rest or any(ch in top for ch in '*?['):
+            # Top-level file patterns are rare; fall back to pathlib
+            return sorted(
+                path.relative_to(self.root).as_posix()
+                for path in self.root.glob(pattern)
+                if path.is_file()
+            )
+        match = _glob_regex(pattern).match
+        return [rel for rel, _ in self._scan(top) if match(rel)]
+
+class FileHasher:
+    """SHA-256 of files, reusing the last hash while mtime and size match."""
+
+    def __init__(self, root: Path, cache: dict, tree: Optional[FileTree] = None):
+        self.root = root
+        self.cache = cache  # rel path -> [mtime_ns, size, sha256]
+        self.tree = tree
+        self.seen: set[str] = set()
+
+    def digest(self, rel: str, fresh: bool = False) -> Optional[str]:
+        """Hash of a file, or None if it does not exist.
+
+        Args:
+            rel: Root-relative path
+            fresh: Stat again instead of using the tree scan (for outputs)
+        """
+        st = None if fresh or self.tree is None else self.tree.stat(rel)
+        if st is None:
+            try:
+                st = os.stat(self.root / rel)
+            except OSError:
+                return None
+        self.seen.add(rel)
+        cached = self.cache.get(rel)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        sha = hashlib.sha256((self.root / rel).read_bytes()).hexdigest()
+        self.cache[rel] = [st.st_mtime_ns, st.st_size, sha]
+        return sha
+
+def input_fingerprint(target: Target, tree: FileTree, hasher: FileHasher) -> str:
+    """Combined hash of a target's input paths and contents."""
+    h = hashlib.sha256()
+    for pattern in target.inputs:
+        for rel in tree.glob(pattern):
+            h.update(f"{rel}\0{hasher.digest(rel)}\n".encode('utf-8'))
+    for pattern in target.listed:
+        for rel in tree.glob(pattern):
+            h.update(f"{rel}\n".encode('utf-8'))
+    return h.hexdigest()
+
+def _dir_fingerprint(path: Path) -> str:
+    """Symlink target, or a hash of the names and sizes of files in a directory."""
+    if path.is_symlink():
+        return f"symlink:{os.readlink(path)}"
+    h = hashlib.sha256()
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames.sort()
+        for name in sorted(filenames):
+            file_path = os.path.join(dirpath, name)
+            h.update(f"{os.path.relpath(file_path, path)}\0{os.path.getsize(file_path)}\n".encode('utf-8'))
+    return f"dir:{h.hexdigest()}"
+
+def output_fingerprint(target: Target, root: Path, hasher: FileHasher) -> Optional[dict]:
+    """Hashes of a target's outputs, or None if one is missing."""
+    outputs = {}
+    for rel in target.outputs:
+        path = root / rel
+        if path.is_dir():
+            outputs[rel] = _dir_fingerprint(path)
+            continue
+        digest = hasher.digest(rel, fresh=True)
+        if digest is None:
+            return None
+        outputs[rel] = digest
+    return outputs
+
+def build_levels(targets: list[Target]) -> list[list[Target]]:
+    """Group targets into levels; every target's deps are in earlier levels.
+
+    Raises:
+        ValueError: On unknown dependencies or cycles
+    """
+    by_name = {target.name: target for target in targets}
+    for target in targets:
+        for dep in target.deps:
+            if dep not in by_name:
+                raise ValueError(f"{target.name} depends on unknown target {dep}")
+
+    levels = []
+    done: set[str] = set()
+    remaining = list(targets)
+    while remaining:
+        ready = [target for target in remaining if all(dep in done for dep in target.deps)]
+        if not ready:
+            raise ValueError(f"Dependency cycle among: {', '.join(t.name for t in remaining)}")
+        levels.append(ready)
+        done.update(target.name for target in ready)
+        remaining = [target for target in remaining if target.name not in done]
+    return levels
+
+# Builders: (root, jobs) -> one-line summary
+
+def _build_badges(root: Path, jobs: int) -> str:
+    import generate_badge_css  # scripts/ is on sys.path for every script
+
+    systems = generate_badge_css.load_config(root / 'config' / 'systems.json')
+    base_roms = generate_badge_css.load_config(root / 'config' / 'base-roms.json')
+    css = f"{generate_badge_css.generate_system_badges(systems)}\n{generate_badge_css.generate_rom_badges(base_roms)}"
+    generate_badge_css.write_css_file(
+        root / 'docs' / 'assets' / 'css' / 'generated' / 'badges.css', css, docs_root=root / 'docs'
+    )
+    return f"{len(systems)} system badges, {len(base_roms)} ROM badges"
+
+def mirror_dir(source: Path, mirror: Path) -> str:
+    """Make mirror reflect source: a relative symlink, or a synced copy.
+
+    An existing symlink to source (the repo's layout) is left alone. A real
+    directory, as on checkouts without symlink support, is synced by
+    copying changed files and deleting extra ones. Hashed copies written
+    by static_assets are kept while their source file exists.
+    """
+
+    if mirror.is_symlink():
+        if mirror.resolve() == source.resolve():
+            return 'symlink'
+        raise ValueError(f"{mirror} links to {os.readlink(mirror)}, not {source}")
+    if not mirror.exists():
+        mirror.symlink_to(os.path.relpath(source, mirror.parent), target_is_directory=True)
+        return 'created symlink'
+    if not mirror.is_dir():
+        raise ValueError(f"{mirror} exists and is not a directory")
+
+    copied = removed = 0
+    for src in source.rglob('*'):
+        dst = mirror / src.relative_to(source)
+        if src.is_dir():
+            dst.mkdir(exist_ok=True)
+        elif not dst.is_file() or dst.read_bytes() != src.read_bytes():
+            shutil.copy2(src, dst)
+            copied += 1
+    for dst in sorted(mirror.rglob('*'), reverse=True):
+        copy_of = hashed_copy_source(dst)
+        kept = dst if copy_of is None else copy_of
+        if not (source / kept.relative_to(mirror)).exists():
+            if dst.is_dir():
+                dst.rmdir()
+            else:
+                dst.unlink()
+            removed += 1
+    return f"copied {copied}, removed {removed}"
+
+def _build_docs_config(root: Path, jobs: int) -> str:
+    result = mirror_dir(root / 'config', root / 'docs' / 'config')
+    published, _ = publish_assets(root / 'docs', find_assets(root / 'docs', ['config/*.json']))
+    return f"{result}; {len(published)} hashed copies"
+
+def _build_docs_metadata(root: Path, jobs: int) -> str:
+    return mirror_dir(root / 'metadata', root / 'docs' / 'metadata')
+
+def _build_manifest(root: Path, jobs: int) -> str:
+    patches, warnings, stats = build_manifest(root, root / MANIFEST_CACHE, jobs=jobs)
+    output = root / 'docs' / 'manifest.json'
+    write_if_changed(output, render_manifest(patches))
+    write_shards(patches, root / 'docs' / 'manifest')
+    publish_assets(output.parent, [output])
+    precompress_dir(root / 'docs' / 'manifest')
+    summary = f"{len(patches)} patches ({stats['rebuilt']} rebuilt, {stats['cached']} cached)"
+    if warnings:
+        summary += f", {len(warnings)} warnings"
+    return summary
+
+def _build_detail_pages(root: Path, jobs: int) -> str:
+    warnings, stats = build_detail_pages(root, cache_path=root / DETAIL_PAGES_CACHE, jobs=jobs)
+    summary = f"{stats['total']} pages ({stats['rendered']} rendered, {stats['skipped']} unchanged)"
+    if warnings:
+        summary += f", {len(warnings)} warnings"
+    return summary
+
+BUILDERS: dict[str, Callable[[Path, int], str]] = {
+    'badges': _build_badges,
+    'docs-config': _build_docs_config,
+    'manifest': _build_manifest,
+    'docs-metadata': _build_docs_metadata,
+    'detail-pages': _build_detail_pages,
+}
+
+def _run_target(task: tuple) -> tuple[str, Optional[str], Optional[str]]:
+    """Build one target: (name, root, jobs) -> (name, summary, error)."""
+    name, root, jobs = task
+    try:
+        with stage(name):
+            return name, BUILDERS[name](Path(root), jobs), None
+    except Exception as e:
+        return name, None, f"{type(e).__name__}: {e}"
+
+def load_state(state_path: Optional[Path]) -> dict:
+    """Read the build state, or an empty one if missing or outdated."""
+    if state_path is not None:
+        try:
+            state = json.loads(Path(state_path).read_text(encoding='utf-8'))
+            if state.get('version') == STATE_VERSION:
+                return state
+        except (OSError, ValueError):
+            pass
+    return {'version': STATE_VERSION, 'files': {}, 'targets': {}}
+
+class BuildResult(NamedTuple):
+    name: str
+    status: str  # 'built', 'up-to-date', 'would-build', 'failed', 'skipped'
+    detail: str
+
+def run_build(
+    root: Path,
+    names: Optional[list[str]] = None,
+    state_path: Optional[Path] = None,
+    force: bool = False,
+    dry_run: bool = False,
+    jobs: int = 1,
+    targets: tuple[Target, ...] = TARGETS,
+    state: Optional[dict] = None
+) -> list[BuildResult]:
+    """Build out-of-date targets, level by level.
+
+    Args:
+        root: Project root
+        names: Targets to consider (default: all) plus their dependencies
+        state_path: Build state file; None keeps no state (everything builds)
+        force: Rebuild even if inputs are unchanged
+        dry_run: Report what would be built without building
+        jobs: Worker processes for independent targets and inside builders
+        targets: The graph
+        state: Build state from load_state(), updated in place; by default
+            it is read from state_path (long-running callers keep one)
+
+    Returns:
+        One BuildResult per considered target, in graph order
+    """
+    root = Path(root)
+    by_name = {target.name: target for target in targets}
+    unknown = [name for name in names or [] if name not in by_name]
+    if unknown:
+        raise ValueError(f"Unknown target(s): {', '.join(unknown)}")
+
+    selected = set(names or by_name)
+    pending = list(selected)
+    while pending:
+        for dep in by_name[pending.pop()].deps:
+            if dep not in selected:
+                selected.add(dep)
+                pending.append(dep)
+
+    if state is None:
+        state = load_state(state_path)
+    tree = FileTree(root)
+    hasher = FileHasher(root, state['files'], tree)
+    results = []
+    failed: set[str] = set()
+
+    for level in build_levels([t for t in targets if t.name in selected]):
+        to_build = []
+        fingerprints = {}
+        for target in level:
+            if any(dep in failed for dep in target.deps):
+                failed.add(target.name)
+                results.append(BuildResult(target.name, 'skipped', 'dependency failed'))
+                continue
+            with stage('hash'):
+                fingerprint = input_fingerprint(target, tree, hasher)
+                recorded = state['targets'].get(target.name, {})
+                outputs = output_fingerprint(target, root, hasher)
+            fingerprints[target.name] = fingerprint
+            if not force and recorded.get('inputs') == fingerprint and recorded.get('outputs') == outputs:
+                results.append(BuildResult(target.name, 'up-to-date', ''))
+            else:
+                to_build.append(target)
+
+        if dry_run:
+            results.extend(BuildResult(target.name, 'would-build', '') for target in to_build)
+            continue
+
+        tasks = [(target.name, str(root), jobs) for target in to_build]
+        for name, summary, error in map_ordered(_run_target, tasks, jobs=jobs, min_parallel=2):
+            if error is not None:
+                failed.add(name)
+                state['targets'].pop(name, None)
+                results.append(BuildResult(name, 'failed', error))
+                continue
+            state['targets'][name] = {
+                'inputs': fingerprints[name],
+                'outputs': output_fingerprint(by_name[name], root, hasher),
+            }
+            results.append(BuildResult(name, 'built', summary))
+
+    # Forget hashes of files that no longer exist in any considered glob
+    if selected == set(by_name):
+        for rel in set(state['files']) - hasher.seen:
+            del state['files'][rel]
+
+    if state_path is not None and not dry_run:
+        write_if_changed(Path(state_path), json.dumps(state, separators=(',', ':')))
+
+    order = {target.name: index for index, target in enumerate(targets)}
+    return sorted(results, key=lambda result: order[result.name])
@@ -0,0 +1,413 @@
+"""SQLite catalog of metadata frontmatter, standardized filenames and patch digests.
+
+One database (.cache/catalog.sqlite by default) holds, per metadata file,
+its parsed frontmatter, the patch it pairs with and the standardized
+filename of that patch, and per patch file its SHA-256. refresh() stats
+both trees and re-reads only what changed since the last refresh:
+
+- metadata files whose mtime or size changed are parsed again
+- patch files whose mtime or size changed are hashed again
+- metadata paired with an added, removed or changed patch is re-paired
+  and re-standardized (embedded CRC32s can change the filename)
+- a change to config/, or to the code that parses, pairs or
+  standardizes (see source_files()), re-reads everything
+
+Columns for the common filters (baseRom, system, title, status) are
+indexed; any other frontmatter field is reachable through SQLite's
+json_extract() on the frontmatter column.
+"""
+import datetime
+import hashlib
+import json
+import os
+import posixpath
+import re
+import sqlite3
+from pathlib import Path
+from typing import Any, Iterator, NamedTuple, Optional
+
+from .config_loader import BASE_ROMS_FILE, CONFIG_DIR, FINGERPRINTS_FILE, SYSTEMS_FILE, get_config
+from .filename_standardizer import standardize_from_metadata
+from .frontmatter import load_frontmatter
+from .manifest_builder import to_json_value
+from .parallel import map_ordered
+from .patch_store import MIN_PARALLEL_FILES, PatchStore, StoredFile, file_digest
+from .profiling import stage
+from .repo_index import RepoIndex, patch_key
+
+# Bump when the tables or the way rows are computed change; older
+# catalogs are dropped and rebuilt
+CATALOG_VERSION = 1
+DEFAULT_CATALOG = Path('.cache') / 'catalog.sqlite'
+
+# The code that computes the metadata rows is this module plus every
+# scripts/utils module it imports; a change to any of them re-reads every
+# metadata file on the next refresh
+SOURCE_DIR = Path(__file__).parent
+_RELATIVE_IMPORT_RE = re.compile(r'^\s*from \.(\w+) import', re.M)
+
+_SCHEMA = """
+CREATE TABLE info (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE patches (
+    path TEXT PRIMARY KEY,        -- relative to patches/, e.g. "emerald/X.bps"
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE INDEX patches_sha256 ON patches (sha256);
+CREATE TABLE metadata (
+    path TEXT PRIMARY KEY,        -- relative to metadata/, e.g. "emerald/X.md"
+    dir TEXT NOT NULL,            -- base ROM subdirectory, e.g. "emerald"
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    frontmatter TEXT,             -- JSON as the manifest has it; NULL if unparsable
+    error TEXT,                   -- parse or standardization error
+    title TEXT,
+    base_rom TEXT,
+    system TEXT,
+    status TEXT,
+    author TEXT,
+    version TEXT,
+    released TEXT,                -- YYYY-MM-DD
+    file_key TEXT,                -- 'file' field relative to patches/
+    patch TEXT,                   -- paired patch relative to patches/; NULL if none
+    new_filename TEXT,            -- standardized name of the paired patch
+    needs_rename INTEGER,
+    warnings TEXT                 -- JSON list
+);
+CREATE INDEX metadata_base_rom ON metadata (base_rom);
+CREATE INDEX metadata_system ON metadata (system);
+CREATE INDEX metadata_title ON metadata (title);
+CREATE INDEX metadata_status ON metadata (status);
+CREATE INDEX metadata_file_key ON metadata (file_key);
+CREATE INDEX metadata_patch ON metadata (patch);
+"""
+
+# Columns computed from the file contents, in _scan_metadata's order
+_ROW_COLUMNS = ('frontmatter', 'error', 'title', 'base_rom', 'system', 'status', 'author',
+                'version', 'released', 'file_key', 'patch', 'new_filename', 'needs_rename', 'warnings')
+
+class CatalogEntry(NamedTuple):
+    """One metadata file as recorded in the catalog."""
+    path: str                     # relative to metadata/
+    metadata_path: Path
+    patch_path: Optional[Path]    # None if no patch pairs with it
+    frontmatter: Optional[dict]
+    error: Optional[str]
+    old_filename: Optional[str]
+    new_filename: Optional[str]
+    needs_rename: bool
+    warnings: list[str]
+
+def source_files(module: str = 'catalog.py') -> list[str]:
+    """A scripts/utils module and everything it imports from there, directly or not."""
+    seen: set[str] = set()
+    pending = [module]
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        try:
+            text = (SOURCE_DIR / name).read_text(encoding='utf-8')
+        except FileNotFoundError:
+            continue
+        pending.extend(f"{imported}.py" for imported in _RELATIVE_IMPORT_RE.findall(text))
+    return sorted(seen)
+
+def config_digest(config_dir: Path = CONFIG_DIR) -> str:
+    """SHA-256 over the config files and code that cached columns depend on."""
+    digest = hashlib.sha256()
+    files = [(name, config_dir / name) for name in (SYSTEMS_FILE, BASE_ROMS_FILE, FINGERPRINTS_FILE)]
+    files += [(name, SOURCE_DIR / name) for name in source_files()]
+    for name, path in files:
+        digest.update(name.encode() + b'\0')
+        try:
+            digest.update(path.read_bytes())
+        except FileNotFoundError:
+            digest.update(b'\0missing')
+    return digest.hexdigest()
+
+def _text(value: Any) -> Optional[str]:
+    return value if isinstance(value, str) else None
+
+def _date_text(value: Any) -> Optional[str]:
+    if isinstance(value, datetime.datetime):
+        return value.date().isoformat()
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return _text(value)
+
+def _version_text(value: Any) -> Optional[str]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return _text(value)
+
+_worker_index: Optional[RepoIndex] = None
+
+def _init_worker(index: RepoIndex) -> None:
+    """Install the shared repository index in a worker process."""
+    global _worker_index
+    _worker_index = index
+
+def _scan_metadata(md_path: Path) -> tuple:
+    """Parse, pair and standardize one metadata file into catalog columns."""
+    index = _worker_index
+    metadata = frontmatter = patch_path = result = error = None
+    try:
+        metadata = load_frontmatter(md_path)
+        frontmatter = json.dumps(to_json_value(metadata), ensure_ascii=False)
+        patch_path = index.find_patch(md_path, metadata)
+        if patch_path is not None:
+            result = standardize_from_metadata(md_path, patch_path, metadata)
+    except Exception as e:
+        error = str(e)
+
+    fields = metadata if isinstance(metadata, dict) else {}
+    file_field = _text(fields.get('file'))
+    patch = patch_path.relative_to(index.patches_dir).as_posix() if patch_path is not None else None
+    return (
+        frontmatter,
+        error,
+        _text(fields.get('title')),
+        _text(fields.get('baseRom')),
+        _text(fields.get('system')),
+        _text(fields.get('status')),
+        _text(fields.get('author')),
+        _version_text(fields.get('version')),
+        _date_text(fields.get('released')),
+        patch_key(file_field) if file_field else None,
+        patch,
+        result['new_filename'] if result else None,
+        int(result['needs_rename']) if result else None,
+        json.dumps(result['warnings'], ensure_ascii=False) if result else None,
+    )
+
+def _digest_task(path: str) -> Optional[str]:
+    try:
+        return file_digest(Path(path))
+    except OSError:
+        return None
+
+def _stamp(path: Path) -> Optional[tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+class Catalog:
+    """SQLite catalog of a metadata/ and patches/ tree.
+
+    Call refresh() before querying to bring it up to date with the files.
+    """
+
+    def __init__(self, db_path: Path, metadata_dir: Path, patches_dir: Path):
+        self.db_path = Path(db_path)
+        self.metadata_dir = Path(metadata_dir)
+        self.patches_dir = Path(patches_dir)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._ensure_schema()
+
+    def __enter__(self) -> 'Catalog':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _ensure_schema(self) -> None:
+        (version,) = self._conn.execute('PRAGMA user_version').fetchone()
+        if version == CATALOG_VERSION:
+            return
+        with self._conn:
+            for (name,) in self._conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'").fetchall():
+                self._conn.execute(f'DROP TABLE IF EXISTS "{name}"')
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(f'PRAGMA user_version = {CATALOG_VERSION}')
+
+    def refresh(self, jobs: Optional[int] = 1) -> dict:
+        """Bring the catalog up to date with the metadata and patch files.
+
+        Args:
+            jobs: Worker processes for files that need hashing or parsing
+
+        Returns:
+            Stats dict with 'metadata' and 'patches' totals and the number
+            of 'parsed', 'hashed' and 'removed' files
+        """
+        conn = self._conn
+        with stage('scan'):
+            index = RepoIndex(self.metadata_dir, self.patches_dir)
+            md_stamps = {}
+            for md_path in index.metadata_files():
+                stamp = _stamp(md_path)
+                if stamp is not None:
+                    md_stamps[md_path.relative_to(self.metadata_dir).as_posix()] = stamp
+            patch_stamps = {}
+            for patch_path in index.patch_files():
+                stamp = _stamp(patch_path)
+                if stamp is not None:
+                    patch_stamps[patch_path.relative_to(self.patches_dir).as_posix()] = stamp
+
+            known_md = {row[0]: (row[1], row[2])
+                        for row in conn.execute('SELECT path, mtime_ns, size FROM metadata')}
+            known_patches = {row[0]: (row[1], row[2])
+                             for row in conn.execute('SELECT path, mtime_ns, size FROM patches')}
+            row = conn.execute("SELECT value FROM info WHERE key = 'config'").fetchone()
+            config = config_digest()
+            config_changed = row is None or row[0] != config
+
+        changed_patches = sorted(rel for rel, stamp in patch_stamps.items() if known_patches.get(rel) != stamp)
+        removed_patches = sorted(known_patches.keys() - patch_stamps.keys())
+        with stage('hash'):
+            paths = [str(self.patches_dir / rel) for rel in changed_patches]
+            digests = map_ordered(_digest_task, paths, jobs, min_parallel=MIN_PARALLEL_FILES)
+        patch_rows = [(rel, *patch_stamps[rel], sha256)
+                      for rel, sha256 in zip(changed_patches, digests) if sha256 is not None]
+
+        if config_changed:
+            stale = set(md_stamps)
+        else:
+            stale = {rel for rel, stamp in md_stamps.items() if known_md.get(rel) != stamp}
+            # Pairs whose patch appeared, vanished or changed: by stem, or by 'file' field
+            touched = changed_patches + removed_patches
+            for rel in touched:
+                md_rel = posixpath.splitext(rel)[0] + '.md'
+                if md_rel in md_stamps:
+                    stale.add(md_rel)
+            for start in range(0, len(touched), 500):
+                chunk = touched[start:start + 500]
+                marks = ', '.join('?' * len(chunk))
+                stale.update(
+                    row[0] for row in conn.execute(
+                        f'SELECT path FROM metadata WHERE file_key IN ({marks}) OR patch IN ({marks})',
+                        chunk + chunk)
+                    if row[0] in md_stamps
+                )
+        stale_paths = sorted(stale)
+        removed_md = sorted(known_md.keys() - md_stamps.keys())
+
+        rows = map_ordered(_scan_metadata, [self.metadata_dir / rel for rel in stale_paths],
+                           jobs, _init_worker, (index,))
+
+        with stage('catalog'), conn:
+            conn.executemany('DELETE FROM patches WHERE path = ?', ((rel,) for rel in removed_patches))
+            conn.executemany('INSERT OR REPLACE INTO patches VALUES (?, ?, ?, ?)', patch_rows)
+            conn.executemany('DELETE FROM metadata WHERE path = ?', ((rel,) for rel in removed_md))
+            conn.executemany(
+                f'INSERT OR REPLACE INTO metadata (path, dir, mtime_ns, size, {", ".join(_ROW_COLUMNS)}) '
+                f'VALUES ({", ".join("?" * (4 + len(_ROW_COLUMNS)))})',
+                ((rel, rel.rpartition('/')[0], *md_stamps[rel], *columns)
+                 for rel, columns in zip(stale_paths, rows))
+            )
+            conn.execute("INSERT OR REPLACE INTO info VALUES ('config', ?)", (config,))
+
+        return {
+            'metadata': len(md_stamps),
+            'patches': len(patch_stamps),
+            'parsed': len(stale_paths),
+            'hashed': len(patch_rows),
+            'removed': len(removed_md) + len(removed_patches),
+        }
+
+    def _entry(self, row: sqlite3.Row) -> CatalogEntry:
+        patch_path = self.patches_dir / row['patch'] if row['patch'] is not None else None
+        return CatalogEntry(
+            path=row['path'],
+            metadata_path=self.metadata_dir / row['path'],
+            patch_path=patch_path,
+            frontmatter=json.loads(row['frontmatter']) if row['frontmatter'] is not None else None,
+            error=row['error'],
+            old_filename=patch_path.name if patch_path is not None else None,
+            new_filename=row['new_filename'],
+            needs_rename=bool(row['needs_rename']),
+            warnings=json.loads(row['warnings']) if row['warnings'] is not None else [],
+        )
+
+    def entries(self, baserom_filter: Optional[str] = None) -> Iterator[CatalogEntry]:
+        """Catalog entries in RepoIndex.metadata_files() order.
+
+        Args:
+            baserom_filter: Only files directly in this metadata subdirectory
+        """
+        if baserom_filter:
+            rows = self._conn.execute('SELECT * FROM metadata WHERE dir = ?', (baserom_filter,))
+        else:
+            rows = self._conn.execute('SELECT * FROM metadata')
+        for row in sorted(rows, key=lambda row: row['path'].split('/')):
+            yield self._entry(row)
+
+    def find(self, base_rom: Optional[str] = None, system: Optional[str] = None,
+             status: Optional[str] = None, released_after: Optional[str] = None,
+             where: Optional[str] = None, params: tuple = ()) -> list[CatalogEntry]:
+        """Metadata entries matching every given filter, sorted by path.
+
+        Args:
+            base_rom: Base ROM key, full name or abbreviation (aliases match each other)
+            system: System name or abbreviation (aliases match each other)
+            status: Exact status (e.g., "Perpetual Beta")
+            released_after: YYYY, YYYY-MM or YYYY-MM-DD; a year or month means
+                after its end
+            where: Extra SQL condition on the metadata table
+            params: Parameters for placeholders in where
+        """
+        config = get_config()
+        clauses: list[str] = []
+        args: list = []
+
+        def alias_clause(column: str, value: str, by_name: dict[str, str]) -> None:
+            key = by_name.get(value)
+            names = [name for name, target in by_name.items() if target == key] if key else [value]
+            clauses.append(f"{column} IN ({', '.join('?' * len(names))})")
+            args.extend(names)
+
+        if base_rom:
+            alias_clause('base_rom', base_rom, config.baserom_by_name)
+        if system:
+            alias_clause('system', system, config.system_by_name)
+        if status:
+            clauses.append('status = ?')
+            args.append(status)
+        if released_after:
+            clauses.append('substr(released, 1, ?) > ?')
+            args.extend([len(released_after), released_after])
+        if where:
+            clauses.append(f'({where})')
+            args.extend(params)
+
+        sql = 'SELECT * FROM metadata'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        rows = self._conn.execute(sql + ' ORDER BY path', args)
+        return [self._entry(row) for row in rows]
+
+    def execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        """Run an ad-hoc SQL statement against the catalog."""
+        return self._conn.execute(sql, params)
+
+    def patch_store(self) -> PatchStore:
+        """Content-addressed index of the patches, built from the catalog's digests."""
+        rows = self._conn.execute('SELECT path, sha256, size FROM patches')
+        return PatchStore(self.patches_dir, [StoredFile(*row) for row in rows])
+
+def open_catalog(root: Path, db_path: Optional[Path] = None, jobs: Optional[int] = 1) -> Catalog:
+    """Open and refresh the catalog of root/metadata and root/patches.
+
+    Args:
+        root: Project root
+        db_path: Database file (default: root/.cache/catalog.sqlite)
+        jobs: Worker processes for files that need hashing or parsing
+    """
+    root = Path(root)
+    catalog = Catalog(db_path or root / DEFAULT_CATALOG, root / 'metadata', root / 'patches')
+    catalog.refresh(jobs)
+    return catalog
@@ -1,61 +1,214 @@
 """Config loader for systems and base ROMs."""
 import json
+import os
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
+
+from .profiling import stage
 
 CONFIG_DIR = Path(__file__).parent.parent.parent / "config"
 
+SYSTEMS_FILE = "systems.json"
+BASE_ROMS_FILE = "base-roms.json"
+FINGERPRINTS_FILE = "rom-fingerprints.json"
+
+class ConfigIndex:
+    """Parsed config files with precomputed lookup tables.
+
+    Attributes:
+        systems: Raw contents of systems.json
+        base_roms: Raw contents of base-roms.json
+        system_by_name: System display name or abbreviation -> abbreviation
+        system_by_abbr: System abbreviation -> system entry
+        baserom_by_name: Base ROM key, fullName or abbreviation -> base ROM key
+        variant_by_crc: CRC code -> (base ROM key, variant entry)
+        fingerprints: Raw contents of rom-fingerprints.json (CRC code -> fingerprint)
+        fingerprint_by_digest: Upper-case CRC32/MD5/SHA-1 hex digest -> CRC code
+        fingerprints_by_game_code: Header game code -> CRC codes
+    """
+
+    def __init__(self, systems: dict, base_roms: dict, fingerprints: Optional[dict] = None):
+        self.systems = systems
+        self.base_roms = base_roms
+        self.fingerprints = fingerprints or {}
+
+        self.system_by_name: dict[str, str] = {}
+        self.system_by_abbr: dict[str, dict] = {}
+        for abbr, data in systems.items():
+            # First match wins, mirroring a linear scan in file order
+            self.system_by_name.setdefault(data["name"], abbr)
+            self.system_by_name.setdefault(abbr, abbr)
+            self.system_by_abbr[abbr] = data
+
+        self.baserom_by_name: dict[str, str] = {}
+        self.variant_by_crc: dict[str, tuple[str, dict]] = {}
+        for rom_name, data in base_roms.items():
+            self.baserom_by_name[rom_name] = rom_name
+        for rom_name, data in base_roms.items():
+            # Exact keys take precedence over fullName/abbreviation aliases
+            self.baserom_by_name.setdefault(data.get("fullName", rom_name), rom_name)
+            self.baserom_by_name.setdefault(data.get("abbreviation", rom_name), rom_name)
+            for variant in data.get("variants", []):
+                self.variant_by_crc.setdefault(variant["crc"], (rom_name, variant))
+
+        self.fingerprint_by_digest: dict[str, str] = {}
+        self.fingerprints_by_game_code: dict[str, list[str]] = {}
+        for crc_code, fingerprint in self.fingerprints.items():
+            for key in ("crc32", "md5", "sha1"):
+                if fingerprint.get(key):
+                    self.fingerprint_by_digest.setdefault(fingerprint[key].upper(), crc_code)
+            if fingerprint.get("gameCode"):
+                self.fingerprints_by_game_code.setdefault(fingerprint["gameCode"], []).append(crc_code)
+
+    def find_baserom(self, name: str) -> Optional[str]:
+        """Resolve a base ROM key from its key, fullName or abbreviation."""
+        return self.baserom_by_name.get(name)
+
+    def find_variant_by_digest(self, digest: str) -> Optional[str]:
+        """Resolve a variant CRC code from a full CRC32, MD5 or SHA-1 hex digest."""
+        return self.fingerprint_by_digest.get(digest.upper())
+
+_config_cache: dict[Path, tuple[tuple, ConfigIndex]] = {}
+# Snapshots taken by pinned_config(), returned without a stat check
+_pinned: dict[Path, ConfigIndex] = {}
+
+def _file_stamp(path: Path) -> tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+def _optional_file_stamp(path: Path) -> Optional[tuple[int, int]]:
+    try:
+        return _file_stamp(path)
+    except FileNotFoundError:
+        return None
+
+def get_config(config_dir: Path = CONFIG_DIR) -> ConfigIndex:
+    """Get the indexed config, re-parsing only when a config file changed.
+
+    The cached index is invalidated by the mtime and size of the config
+    files, so repeated lookups cost a few stat calls instead of JSON parses;
+    inside pinned_config() they cost none. The ROM fingerprint file is
+    optional.
+    """
+    pinned = _pinned.get(config_dir)
+    if pinned is not None:
+        return pinned
+
+    systems_path = config_dir / SYSTEMS_FILE
+    base_roms_path = config_dir / BASE_ROMS_FILE
+    fingerprints_path = config_dir / FINGERPRINTS_FILE
+    stamp = (
+        _file_stamp(systems_path),
+        _file_stamp(base_roms_path),
+        _optional_file_stamp(fingerprints_path)
+    )
+
+    cached = _config_cache.get(config_dir)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    with stage('config'):
+        with open(systems_path) as f:
+            systems = json.load(f)
+        with open(base_roms_path) as f:
+            base_roms = json.load(f)
+        fingerprints = {}
+        if stamp[2] is not None:
+            with open(fingerprints_path) as f:
+                fingerprints = json.load(f)
+
+        config = ConfigIndex(systems, base_roms, fingerprints)
+    _config_cache[config_dir] = (stamp, config)
+    return config
+
+@contextmanager
+def pinned_config(config_dir: Path = CONFIG_DIR) -> Iterator[ConfigIndex]:
+    """Check the config files once, then serve that snapshot for the whole block.
+
+    One standardize call looks the config up several times; a batch pins
+    it so the files are stat'ed once per batch instead of per lookup.
+    Nested blocks reuse the outer snapshot.
+    """
+    if config_dir in _pinned:
+        yield _pinned[config_dir]
+        return
+    config = _pinned[config_dir] = get_config(config_dir)
+    try:
+        yield config
+    finally:
+        del _pinned[config_dir]
+
+def clear_config_cache() -> None:
+    """Drop all cached config indexes."""
+    _config_cache.clear()
+
 def load_systems() -> dict:
-    """Load systems configuration."""
-    with open(CONFIG_DIR / "systems.json") as f:
-        return json.load(f)
+    """Load systems configuration.
+
+    The returned dict is shared with the config cache; do not mutate it.
+    """
+    return get_config().systems
 
 def load_base_roms() -> dict:
-    """Load base ROMs configuration."""
-    with open(CONFIG_DIR / "base-roms.json") as f:
-        return json.load(f)
+    """Load base ROMs configuration.
+
+    The returned dict is shared with the config cache; do not mutate it.
+    """
+    return get_config().base_roms
+
+def load_fingerprints() -> dict:
+    """Load ROM fingerprints (CRC code -> crc32/md5/sha1/size/gameCode).
+
+    The returned dict is shared with the config cache; do not mutate it.
+    """
+    return get_config().fingerprints
 
 def get_system_abbr(system_name: str) -> str:
     """Get system abbreviation from full name."""
-    systems = load_systems()
-    for abbr, data in systems.items():
-        if data["name"] == system_name or abbr == system_name:
-            return abbr
-    return "UNK"
+    try:
+        return get_config().system_by_name.get(system_name, "UNK")
+    except TypeError:
+        # Unhashable values (e.g. a YAML list) never match a system
+        return "UNK"
 
 def get_baserom_abbr(rom_name: str) -> str:
     """Get base ROM abbreviation."""
-    base_roms = load_base_roms()
+    base_roms = get_config().base_roms
     if rom_name in base_roms:
         return base_roms[rom_name]["abbreviation"]
     return "UNK"
 
 def get_baserom_variants(rom_name: str) -> list[dict]:
     """Get all CRC variants for a base ROM."""
-    base_roms = load_base_roms()
+    base_roms = get_config().base_roms
     if rom_name in base_roms:
         return base_roms[rom_name]["variants"]
     return []
 
 def find_matching_crc(rom_name: str, crc_hint: Optional[str] = None) -> str:
     """Find matching CRC code for a base ROM.
-    
+
     Args:
         rom_name: Base ROM name
         crc_hint: Optional CRC hint to match against
-        
+
     Returns:
         CRC code or "XXXX" if not found
     """
+    config = get_config()
     variants = get_baserom_variants(rom_name)
-    
+
     if not variants:
         return "XXXX"
-    
+
     if crc_hint:
+        match = config.variant_by_crc.get(crc_hint)
+        if match is not None and match[0] == rom_name:
+            return match[1]["crc"]
         for variant in variants:
             if variant["crc"] == crc_hint:
                 return variant["crc"]
-    
+
     # Return first variant if no hint or no match
     return variants[0]["crc"]
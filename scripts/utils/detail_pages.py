@@ -0,0 +1,637 @@
+"""Pre-rendered detail pages, one static HTML file per manifest entry.
+
+The library's detail panel is built in the browser from the manifest, with
+the metadata body parsed by marked. These pages hold the same header,
+metadata table, description and links as finished HTML, so deep links and
+crawlers need no JavaScript. Entries come from manifest_builder.build_entry,
+so ids, titles and fields match docs/manifest.json exactly.
+
+Each page is keyed by a SHA-256 of its inputs: the metadata file's bytes,
+the patch name, config/base-roms.json, config/site.json and this
+generator's source. Pages whose key matches the last build are neither
+re-rendered nor rewritten. Canonical URLs and sitemap.xml are absolute
+under the site URL from config/site.json.
+"""
+import hashlib
+import html
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import quote, urlencode, urljoin
+
+from .manifest_builder import MANIFEST_EXTENSIONS, build_entry, entry_id, js_truthy, write_if_changed
+from .parallel import map_ordered
+from .profiling import stage
+
+# Bump when page output changes in a way the source digest does not capture
+PAGES_VERSION = 1
+DEFAULT_CACHE = Path('.cache') / 'detail-pages.json'
+DEFAULT_OUT = Path('docs') / 'hacks'
+INDEX_PAGE = 'index.html'
+SITEMAP = 'sitemap.xml'
+# Where the output directory is served, relative to the site URL
+PAGES_PATH = 'hacks/'
+
+# (field, Lucide icon, label, format) as in ui.js renderMetadataTable
+METADATA_ROWS = (
+    ('hackType', 'layers', 'Type', 'string'),
+    ('graphics', 'image', 'Graphics', 'string'),
+    ('story', 'book', 'Story', 'string'),
+    ('maps', 'map', 'Maps', 'string'),
+    ('postgame', 'flag', 'Postgame', 'string'),
+    ('mechanics', 'settings', 'Mechanics', 'array'),
+    ('fakemons', 'sparkles', 'Fakemons', 'string'),
+    ('variants', 'git-branch', 'Variants', 'array'),
+    ('typeChanges', 'zap', 'Type Changes', 'array'),
+    ('physicalSpecialSplit', 'divide', 'Phys/Spec Split', 'boolean'),
+    ('antiCheat', 'shield', 'Anti-Cheat', 'boolean'),
+    ('totalCatchable', 'hash', 'Total Catchable', 'string'),
+    ('pokedexIncludes', 'book-open', 'Pokédex Gen', 'string'),
+    ('openWorld', 'globe', 'Open World', 'boolean'),
+    ('randomizer', 'shuffle', 'Randomizer', 'string'),
+    ('nuzlocke', 'skull', 'Nuzlocke', 'string'),
+    ('tags', 'tag', 'Tags', 'array'),
+)
+LINK_ICONS = {'website': 'globe', 'discord': 'message-circle', 'documentation': 'file-text'}
+
+# ---------------------------------------------------------------------------
+# Markdown
+
+_FENCE_RE = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+_HEADING_RE = re.compile(r'^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$')
+_RULE_RE = re.compile(r'^ {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$')
+_QUOTE_RE = re.compile(r'^ {0,3}> ?')
+_ITEM_RE = re.compile(r'^( {0,3})([-*+]|\d{1,9}[.)])([ \t]+|$)')
+_CODE_SPAN_RE = re.compile(r'(`+)(.+?)\1', re.S)
+# Link destinations may contain balanced parentheses (one level deep)
+_DESTINATION = r'((?:[^()\s]|\([^()\s]*\))+)'
+_IMAGE_RE = re.compile(r'!\[([^\]]*)\]\(' + _DESTINATION + r'(?:\s+&quot;(.*?)&quot;)?\)')
+_LINK_RE = re.compile(r'\[([^\]]+)\]\(' + _DESTINATION + r'(?:\s+&quot;(.*?)&quot;)?\)')
+_PLACEHOLDER_RE = re.compile(r'\0(\d+)\0')
+_AUTOLINK_RE = re.compile(r'&lt;((?:https?|mailto):[^\s&]+)&gt;')
+_STRONG_RE = re.compile(r'(\*\*|__)(?=\S)(.+?)(?<=\S)\1', re.S)
+_EM_RE = re.compile(r'(?<![\w*])([*_])(?=\S)(.+?)(?<=\S)\1(?![\w*])', re.S)
+_STRIKE_RE = re.compile(r'~~(?=\S)(.+?)(?<=\S)~~', re.S)
+# http(s), mailto, or relative (no scheme before the first /, ? or #)
+_SAFE_URL_RE = re.compile(r'^(?:https?:|mailto:|[^:/?#]*(?:[/?#]|$))', re.I)
+
+def _href(escaped_url: str) -> str:
+    # javascript: and other schemes become '#'
+    return escaped_url if _SAFE_URL_RE.match(html.unescape(escaped_url).strip()) else '#'
+
+def _emphasis(text: str) -> str:
+    text = _STRONG_RE.sub(r'<strong>\2</strong>', text)
+    text = _EM_RE.sub(r'<em>\2</em>', text)
+    return _STRIKE_RE.sub(r'<del>\1</del>', text)
+
+def render_inline(text: str) -> str:
+    """Render inline Markdown (code, images, links, emphasis) as escaped HTML."""
+    # Finished HTML (code spans, links, images) is swapped for \0n\0 so the
+    # emphasis rules never touch URLs or code
+    stashed: list[str] = []
+
+    def stash(markup: str) -> str:
+        stashed.append(markup)
+        return f"\0{len(stashed) - 1}\0"
+
+    def title(match: re.Match) -> str:
+        return f' title="{match.group(3)}"' if match.group(3) else ''
+
+    out = _CODE_SPAN_RE.sub(lambda m: stash(f"<code>{m.group(2).strip()}</code>"), html.escape(text, quote=True))
+    out = _IMAGE_RE.sub(lambda m: stash(f'<img src="{_href(m.group(2))}" alt="{m.group(1)}"{title(m)}>'), out)
+    out = _LINK_RE.sub(lambda m: stash(f'<a href="{_href(m.group(2))}"{title(m)}>{_emphasis(m.group(1))}</a>'), out)
+    out = _AUTOLINK_RE.sub(lambda m: stash(f'<a href="{m.group(1)}">{m.group(1)}</a>'), out)
+    out = re.sub(r' {2,}\n|\\\n', '<br>\n', _emphasis(out))
+
+    def restore(match: re.Match) -> str:
+        return _PLACEHOLDER_RE.sub(restore, stashed[int(match.group(1))])
+
+    return _PLACEHOLDER_RE.sub(restore, out)
+
+def _indent(line: str) -> int:
+    return len(line) - len(line.lstrip(' '))
+
+def _list_block(lines: list[str], start: int) -> tuple[str, int]:
+    """Render the list starting at lines[start]. Returns (html, next line index)."""
+    first = _ITEM_RE.match(lines[start])
+    ordered = first.group(2)[0].isdigit()
+    items: list[list[str]] = []
+    loose = False
+    i = start
+    while i < len(lines):
+        line = lines[i]
+        match = _ITEM_RE.match(line)
+        if match and match.group(2)[0].isdigit() == ordered and _indent(line) <= _indent(lines[start]):
+            items.append([line[len(match.group(0)):]])
+            item_indent = max(len(match.group(0)), _indent(line) + 2)
+            i += 1
+            continue
+        if not line.strip():
+            # A blank line ends the list unless an indented continuation follows
+            nxt = next((l for l in lines[i + 1:] if l.strip()), None)
+            nxt_item = _ITEM_RE.match(nxt) if nxt is not None else None
+            same_list = (nxt_item and nxt_item.group(2)[0].isdigit() == ordered
+                         and _indent(nxt) <= _indent(lines[start]))
+            if nxt is None or not (same_list or _indent(nxt) >= item_indent):
+                break
+            loose = True
+            items[-1].append('')
+            i += 1
+            continue
+        if _indent(line) >= item_indent:
+            items[-1].append(line[item_indent:])
+        elif items[-1][-1] != '' and not _ITEM_RE.match(line) and not _block_start(line):
+            items[-1].append(line.strip())  # lazy paragraph continuation
+        else:
+            break
+        i += 1
+
+    tag = 'ol' if ordered else 'ul'
+    number = int(first.group(2)[:-1]) if ordered else 1
+    attrs = f' start="{number}"' if ordered and number != 1 else ''
+    rendered = []
+    for item in items:
+        body = render_markdown('\n'.join(item))
+        if not loose and body.startswith('<p>'):
+            # Tight list: unwrap the item's leading paragraph
+            body = re.sub(r'^<p>(.*?)</p>', r'\1', body, count=1, flags=re.S)
+        rendered.append(f"<li>{body}</li>")
+    return f"<{tag}{attrs}>\n" + '\n'.join(rendered) + f"\n</{tag}>", i
+
+def _block_start(line: str) -> bool:
+    return bool(_FENCE_RE.match(line) or _HEADING_RE.match(line) or _RULE_RE.match(line)
+                or _QUOTE_RE.match(line))
+
+def render_markdown(text: str) -> str:
+    """Render Markdown to HTML.
+
+    Covers what metadata bodies use: ATX headings, paragraphs, nested
+    ordered and unordered lists, block quotes, fenced code, horizontal
+    rules, and inline code, links, images and emphasis. Raw HTML in the
+    source is escaped rather than passed through, and links other than
+    http(s), mailto and relative ones are neutralized.
+
+    Args:
+        text: Markdown source
+
+    Returns:
+        HTML fragment
+    """
+    lines = text.replace('\r\n', '\n').replace('\r', '\n').expandtabs(4).split('\n')
+    blocks = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if not line.strip():
+            i += 1
+            continue
+
+        fence = _FENCE_RE.match(line)
+        if fence:
+            marker = fence.group(1)
+            info = line.strip()[len(marker):].strip().split(' ')[0]
+            code = []
+            i += 1
+            while i < len(lines) and not lines[i].strip().startswith(marker):
+                code.append(lines[i])
+                i += 1
+            i += 1
+            lang = f' class="language-{html.escape(info)}"' if info else ''
+            blocks.append(f"<pre><code{lang}>{html.escape(chr(10).join(code))}\n</code></pre>")
+            continue
+
+        heading = _HEADING_RE.match(line)
+        if heading:
+            level = len(heading.group(1))
+            blocks.append(f"<h{level}>{render_inline(heading.group(2) or '')}</h{level}>")
+            i += 1
+            continue
+
+        if _RULE_RE.match(line):
+            blocks.append('<hr>')
+            i += 1
+            continue
+
+        if _QUOTE_RE.match(line):
+            quoted = []
+            while i < len(lines) and lines[i].strip() and (_QUOTE_RE.match(lines[i]) or quoted):
+                quoted.append(_QUOTE_RE.sub('', lines[i], count=1))
+                i += 1
+            blocks.append(f"<blockquote>\n{render_markdown(chr(10).join(quoted))}\n</blockquote>")
+            continue
+
+        if _ITEM_RE.match(line):
+            block, i = _list_block(lines, i)
+            blocks.append(block)
+            continue
+
+        paragraph = []
+        while i < len(lines) and lines[i].strip():
+            if paragraph and (_block_start(lines[i]) or _ITEM_RE.match(lines[i])):
+                break
+            paragraph.append(lines[i].strip())
+            i += 1
+        blocks.append(f"<p>{render_inline(chr(10).join(paragraph))}</p>")
+    return '\n'.join(blocks)
+
+# ---------------------------------------------------------------------------
+# Pages
+
+def _attr(value: Any) -> str:
+    return html.escape(str(value), quote=True)
+
+def _js_string(value: Any) -> str:
+    """Template-literal interpolation of a JSON value, as ui.js shows it."""
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if value is None:
+        return 'null'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, list):
+        return ','.join('' if item is None else _js_string(item) for item in value)
+    if isinstance(value, dict):
+        return '[object Object]'
+    return str(value)
+
+def _or(value: Any, default: str) -> str:
+    return _js_string(value) if js_truthy(value) else default
+
+def _css_url(url: Any) -> str:
+    # Percent-encode what could close url('...') or the style attribute
+    return quote(_js_string(url), safe=":/?#[]@!$&*+,;=%~.-_")
+
+def _format_value(value: Any, kind: str) -> Optional[str]:
+    """ui.js formatValue; None where it shows N/A (those rows are dropped)."""
+    if not js_truthy(value):
+        return None
+    if kind == 'array':
+        return ', '.join(_js_string(item) for item in value) if isinstance(value, list) else _js_string(value)
+    if kind == 'boolean':
+        return 'Yes' if value is True or value == 'Yes' else 'No'
+    return _js_string(value)
+
+def _icon(name: str, size: int = 16, extra: str = '') -> str:
+    return f'<i data-lucide="{name}"{extra} width="{size}" height="{size}"></i>'
+
+def _star_rating(rating: Any) -> str:
+    try:
+        filled = float(rating)
+    except (TypeError, ValueError):
+        filled = 0
+    return ''.join(
+        _icon('star', extra=f' class="star-{"filled" if i <= filled else "empty"}"') for i in range(1, 7)
+    )
+
+def _badge(kind: str, value: Any, rom_names: dict[str, str]) -> str:
+    if not js_truthy(value):
+        return ''
+    text = _js_string(value)
+    normalized = rom_names.get(text, text) if kind == 'rom' else text
+    return f'<span class="badge badge-{kind}" data-{kind}="{_attr(normalized)}">{html.escape(text)}</span>'
+
+def strip_title_heading(changelog: str, title: str) -> str:
+    """Drop a leading '# <title>' line, which the page header already shows."""
+    first, _, rest = changelog.partition('\n')
+    match = re.match(r'#\s*(.*?)\s*$', first)
+    if match and match.group(1).lower() == title.lower():
+        return rest.lstrip('\n')
+    return changelog
+
+PAGE_STYLE = """\
+        .detail-page{max-width:1100px;margin:0 auto;padding:2rem}
+        .detail-page .detail-banner{display:flex;min-height:200px}
+        .detail-page .detail-back{display:inline-flex;align-items:center;gap:.5rem;margin-bottom:1rem;color:var(--text-secondary)}
+        .detail-page .detail-section{margin-top:2rem}
+        .hack-index li{margin:.25rem 0}"""
+
+def page_url(site_url: str, name: str) -> str:
+    """Absolute URL of a file in the pages directory (relative without a site URL)."""
+    return urljoin(site_url, PAGES_PATH + name) if site_url else (name or INDEX_PAGE)
+
+def _page(title: str, description: str, canonical: str, body: str) -> str:
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=5.0, user-scalable=yes">
+    <title>{html.escape(title)}</title>
+    <meta name="description" content="{_attr(description)}">
+    <link rel="canonical" href="{_attr(canonical)}">
+    <link rel="stylesheet" href="../assets/css/design-system/background-system.css">
+    <link rel="stylesheet" href="../assets/css/design-system/status-system.css">
+    <link rel="stylesheet" href="../assets/css/main.css?v=3">
+    <style>
+{PAGE_STYLE}
+    </style>
+</head>
+<body>
+{body}
+    <script src="https://cdn.jsdelivr.net/npm/lucide@latest/dist/umd/lucide.js" defer></script>
+    <script>
+        window.addEventListener('DOMContentLoaded', () => {{
+            if (typeof lucide !== 'undefined') lucide.createIcons();
+        }});
+    </script>
+</body>
+</html>
+"""
+
+def render_page(entry: dict, rom_names: dict[str, str], site_url: str = '') -> str:
+    """Render one manifest entry as a standalone page, mirroring ui.js renderDetailPanel.
+
+    Args:
+        entry: Manifest entry from build_entry()
+        rom_names: base-roms.json key or full name -> full name (badge data-rom)
+        site_url: Site URL for the canonical link (see load_site_url)
+
+    Returns:
+        HTML document
+    """
+    meta = entry.get('meta', {})
+    title = _js_string(entry['title'])
+    status = _or(meta.get('status'), 'Completed')
+    status_class = 'status-' + re.sub(r'\s+', '-', status.lower())
+
+    header_meta = [
+        f'<span class="tooltip" data-tooltip="Author">{_icon("user")} '
+        f'{html.escape(_or(meta.get("author"), "Unknown"))}</span>'
+    ]
+    for field, icon, label in (('playtime', 'clock', 'Playtime'), ('released', 'calendar', 'Release Date')):
+        if js_truthy(meta.get(field)):
+            header_meta.append(f'<span class="tooltip" data-tooltip="{label}">{_icon(icon)} '
+                               f'{html.escape(_js_string(meta[field]))}</span>')
+    header_meta.append(f'<div class="detail-status"><div class="status-dot {_attr(status_class)}"></div> '
+                       f'{html.escape(status)}</div>')
+
+    badges = ''.join(filter(None, (
+        _badge('rom', meta.get('baseRom'), rom_names),
+        _badge('system', meta.get('system'), rom_names),
+        _badge('difficulty', meta.get('difficulty'), rom_names),
+    )))
+
+    images = meta.get('images') if isinstance(meta.get('images'), dict) else {}
+    if js_truthy(images.get('banner')):
+        banner = f'<div class="detail-banner has-banner" style="--banner-bg: url(\'{_css_url(images["banner"])}\')"></div>'
+    else:
+        banner = f'<div class="detail-banner">{html.escape(title)}</div>'
+
+    rows = []
+    for field, icon, label, kind in METADATA_ROWS:
+        value = _format_value(meta.get(field), kind)
+        if value is not None:
+            rows.append(f'<div class="metadata-row"><span class="metadata-label">{_icon(icon, 14)}{label}</span>'
+                        f'<span class="metadata-value">{html.escape(value)}</span></div>')
+    if js_truthy(meta.get('rating')):
+        rows.append(f'<div class="metadata-row"><span class="metadata-label">{_icon("award", 14)}Rating</span>'
+                    f'<span class="metadata-value">{_star_rating(meta["rating"])}</span></div>')
+
+    changelog = entry.get('changelog')
+    description = (render_markdown(strip_title_heading(changelog, title)) if changelog
+                   else '<p>No description available.</p>')
+
+    links = meta.get('links') if isinstance(meta.get('links'), dict) else {}
+    link_buttons = ''.join(
+        f'<a href="{_href(_attr(_js_string(links[kind])))}" target="_blank" rel="noopener" '
+        f'class="link-btn">{_icon(LINK_ICONS[kind])} {kind.capitalize()}</a>'
+        for kind in LINK_ICONS if js_truthy(links.get(kind))
+    )
+
+    patcher_query = urlencode({'patch': entry['file'], 'name': title, 'baseRom': entry.get('baseRom') or ''})
+    summary = f"{title} by {_or(meta.get('author'), 'Unknown')}"
+    if js_truthy(meta.get('baseRom')):
+        summary += f", a {_js_string(meta['baseRom'])} ROM hack"
+
+    body = f"""    <main class="detail-page">
+        <a href="../library/" class="detail-back">{_icon('arrow-left')} ROM Library</a>
+        <article class="detail-content">
+            <header class="detail-header">
+                {banner}
+                <div class="detail-title">
+                    <h1>{html.escape(title)}</h1>
+                    <div class="detail-meta">
+                        {''.join(header_meta)}
+                    </div>
+                    <div class="detail-header-row">
+                        <div class="detail-badges">{badges}</div>
+                    </div>
+                </div>
+            </header>
+            <section class="info-grid detail-section">
+                <div class="info-metadata">
+                    <div class="metadata-grid">{''.join(rows)}</div>
+                </div>
+                <div class="info-description">
+{description}
+                </div>
+            </section>
+            <section class="detail-section">
+                <a href="../patcher/?{_attr(patcher_query)}" class="link-btn">{_icon('external-link', 20)} Open ROM Patcher</a>
+            </section>
+            <section class="detail-section">
+                <div class="links-grid">{link_buttons or '<p>No links available.</p>'}</div>
+            </section>
+        </article>
+    </main>"""
+    return _page(f"{title} - ROM Library", summary, page_url(site_url, f"{entry['id']}.html"), body)
+
+def render_index(entries: list[tuple[str, str, str]], site_url: str = '') -> str:
+    """Render the page listing every detail page.
+
+    Args:
+        entries: (id, title, base ROM directory) per page
+        site_url: Site URL for the canonical link
+    """
+    items = '\n'.join(
+        f'            <li><a href="{_attr(page_id)}.html">{html.escape(title)}</a> '
+        f'<span class="badge badge-rom">{html.escape(base_rom)}</span></li>'
+        for page_id, title, base_rom in sorted(entries, key=lambda e: (e[1].lower(), e[0]))
+    )
+    body = f"""    <main class="detail-page">
+        <a href="../library/" class="detail-back">{_icon('arrow-left')} ROM Library</a>
+        <h1>ROM Hacks</h1>
+        <ul class="hack-index">
+{items}
+        </ul>
+    </main>"""
+    return _page('ROM Hacks - ROM Library', f"All {len(entries)} ROM hacks in the library",
+                 page_url(site_url, ''), body)
+
+def render_sitemap(site_url: str, page_ids: list[str]) -> str:
+    """sitemaps.org sitemap of the index page and every detail page."""
+    urls = [page_url(site_url, '')] + [page_url(site_url, f"{page_id}.html") for page_id in sorted(page_ids)]
+    lines = ''.join(f"  <url><loc>{html.escape(url)}</loc></url>\n" for url in urls)
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+            f"{lines}</urlset>\n")
+
+# ---------------------------------------------------------------------------
+# Build
+
+# Per-worker state set by _init_worker
+_rom_names: dict[str, str] = {}
+_site_url = ''
+_digest = ''
+
+def _init_worker(rom_names: dict[str, str], site_url: str, digest: str) -> None:
+    global _rom_names, _site_url, _digest
+    _rom_names = rom_names
+    _site_url = site_url
+    _digest = digest
+
+def load_site_url(config_path: Path) -> str:
+    """The 'url' of config/site.json with a trailing slash, or '' if unset."""
+    try:
+        url = json.loads(Path(config_path).read_text(encoding='utf-8')).get('url')
+    except (OSError, ValueError, AttributeError):
+        return ''
+    if not isinstance(url, str) or not url.strip():
+        return ''
+    return url.strip().rstrip('/') + '/'
+
+def load_rom_names(config_path: Path) -> dict[str, str]:
+    """base-roms.json key and full name -> full name, as badge-renderer.js normalizes."""
+    try:
+        base_roms = json.loads(Path(config_path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    names = {}
+    for key, data in base_roms.items():
+        full_name = data.get('fullName') if isinstance(data, dict) else None
+        if full_name:
+            names.setdefault(key, full_name)
+            names.setdefault(full_name, full_name)
+    return names
+
+def generator_digest(config_paths: list[Path]) -> str:
+    """Hash of everything every page depends on besides its own metadata."""
+    h = hashlib.sha256(f"{PAGES_VERSION}\n".encode('utf-8'))
+    for path in [Path(__file__), Path(__file__).with_name('manifest_builder.py'),
+                 Path(__file__).with_name('frontmatter.py'), *map(Path, config_paths)]:
+        try:
+            h.update(path.read_bytes())
+        except OSError:
+            h.update(b'\0missing')
+    return h.hexdigest()
+
+def _render_task(task: tuple) -> tuple[str, bool, Optional[str], list[str]]:
+    """Hash one page's inputs and render it unless the key matches.
+
+    Returns:
+        Tuple of (input key, whether the page was written, title or None
+        when skipped, warnings)
+    """
+    base_rom, patch_name, md_path, out_path, cached_key = task
+    raw = None
+    md_error = None
+    if md_path is not None:
+        try:
+            with open(md_path, 'rb') as f:
+                raw = f.read()
+        except OSError as e:
+            md_error = e.strerror or str(e)
+
+    h = hashlib.sha256(f"{_digest}\0{base_rom}\0{patch_name}\0".encode('utf-8'))
+    h.update(raw if raw is not None else f"\0{md_error}".encode('utf-8'))
+    key = h.hexdigest()
+    if key == cached_key and os.path.exists(out_path):
+        return key, False, None, []
+
+    md_text = raw.decode('utf-8', 'replace') if raw is not None else None
+    entry, warnings = build_entry(base_rom, patch_name, md_text, md_error=md_error)
+    written = write_if_changed(Path(out_path), render_page(entry, _rom_names, _site_url))
+    return key, written, _js_string(entry['title']), warnings
+
+def _load_cache(cache_path: Optional[Path]) -> dict:
+    if cache_path is None:
+        return {}
+    try:
+        cache = json.loads(Path(cache_path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return cache.get('pages', {}) if cache.get('version') == PAGES_VERSION else {}
+
+def build_detail_pages(root: Path, out_dir: Optional[Path] = None, cache_path: Optional[Path] = None,
+                       jobs: Optional[int] = 1, force: bool = False) -> tuple[list[str], dict]:
+    """Write a detail page per patch in root/patches, plus an index page and sitemap.
+
+    Args:
+        root: Project root
+        out_dir: Output directory (default: root/docs/hacks)
+        cache_path: Page key cache, or None to render every page
+        jobs: Worker processes for hashing and rendering
+        force: Render every page even if its key is unchanged
+
+    Returns:
+        Tuple of (warnings, stats dict with 'total', 'rendered', 'written',
+        'skipped' and 'removed' counts)
+    """
+    root = Path(root)
+    out_dir = Path(out_dir) if out_dir is not None else root / DEFAULT_OUT
+    patches_dir = root / 'patches'
+    metadata_dir = root / 'metadata'
+    base_roms_path = root / 'config' / 'base-roms.json'
+    site_path = root / 'config' / 'site.json'
+    site_url = load_site_url(site_path)
+
+    cached = {} if force else _load_cache(cache_path)
+    warnings = []
+    tasks = []
+    page_ids = []
+    taken = set()
+    with stage('scan'):
+        rom_dirs = sorted(p for p in patches_dir.iterdir() if p.is_dir()) if patches_dir.is_dir() else []
+        for rom_dir in rom_dirs:
+            for patch in sorted(rom_dir.iterdir()):
+                if not patch.is_file() or patch.suffix.lower()[1:] not in MANIFEST_EXTENSIONS:
+                    continue
+                page_id = entry_id(rom_dir.name, patch.name)
+                if page_id in taken:
+                    warnings.append(f"Skipping {rom_dir.name}/{patch.name}: page {page_id}.html already taken")
+                    continue
+                md_path = metadata_dir / rom_dir.name / f"{patch.stem}.md"
+                taken.add(page_id)
+                page_ids.append(page_id)
+                tasks.append((rom_dir.name, patch.name, str(md_path) if md_path.exists() else None,
+                              str(out_dir / f"{page_id}.html"), cached.get(page_id, {}).get('key')))
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    initargs = (load_rom_names(base_roms_path), site_url, generator_digest([base_roms_path, site_path]))
+    pages = {}
+    rendered = written = 0
+    with stage('render'):
+        results = map_ordered(_render_task, tasks, jobs, initializer=_init_worker, initargs=initargs)
+    for page_id, task, (key, was_written, title, page_warnings) in zip(page_ids, tasks, results):
+        if title is None:
+            pages[page_id] = cached[page_id]
+        else:
+            rendered += 1
+            written += was_written
+            pages[page_id] = {'key': key, 'title': title, 'baseRom': task[0]}
+        warnings.extend(page_warnings)
+
+    keep = {f"{page_id}.html" for page_id in pages} | {INDEX_PAGE}
+    removed = 0
+    for path in sorted(out_dir.glob('*.html')):
+        if path.name not in keep:
+            path.unlink()
+            removed += 1
+    index = [(page_id, page['title'], page['baseRom']) for page_id, page in pages.items()]
+    write_if_changed(out_dir / INDEX_PAGE, render_index(index, site_url))
+    sitemap = out_dir / SITEMAP
+    if site_url:
+        write_if_changed(sitemap, render_sitemap(site_url, list(pages)))
+    else:
+        sitemap.unlink(missing_ok=True)
+        warnings.append(f"No site URL in {site_path}; canonical links are relative and no {SITEMAP} is written")
+
+    if cache_path is not None:
+        write_if_changed(Path(cache_path), json.dumps({'version': PAGES_VERSION, 'pages': pages}, ensure_ascii=False))
+
+    stats = {'total': len(pages), 'rendered': rendered, 'written': written,
+             'skipped': len(pages) - rendered, 'removed': removed}
+    return warnings, stats
@@ -2,12 +2,37 @@
 import re
 import unicodedata
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
-import yaml
+from typing import Iterable, NamedTuple, Optional, Union
 
-from .config_loader import get_system_abbr, get_baserom_abbr, find_matching_crc
+from .config_loader import (
+    get_config, get_system_abbr, get_baserom_abbr, get_baserom_variants, find_matching_crc, pinned_config
+)
+from .frontmatter import load_frontmatter, load_frontmatter_many
+from .patch_inspector import read_source_crc32
+from .profiling import stage
 
+# Bound for the title/version memo caches
+NORMALIZE_CACHE_SIZE = 4096
+
+_POKEMON_PREFIX_RE = re.compile(r'^pokemon\s+', re.IGNORECASE)
+_TITLE_INVALID_RE = re.compile(r'[^A-Za-z0-9\-]')
+_VERSION_PREFIX_RE = re.compile(r'^[vV]')
+_VERSION_CORE_RE = re.compile(r'^([\d\.]+)')
+_WHITESPACE_RE = re.compile(r'\s+')
+_VARIANT_INVALID_RE = re.compile(r'[^\w\-\+]')
+
+class StandardizedName(NamedTuple):
+    """Result of standardizing one metadata/patch pair."""
+    old_filename: str
+    new_filename: str
+    metadata_path: str
+    patch_path: str
+    needs_rename: bool
+    warnings: tuple[str, ...]
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
 def normalize_title(title: str) -> str:
     """Normalize title to ALL_CAPS with hyphens.
     
@@ -21,17 +46,18 @@ def normalize_title(title: str) -> str:
     title = unicodedata.normalize('NFKD', title).encode('ascii', 'ignore').decode()
     
     # Remove "Pokemon" prefix (case insensitive)
-    title = re.sub(r'^pokemon\s+', '', title, flags=re.IGNORECASE)
+    title = _POKEMON_PREFIX_RE.sub('', title)
     
     # Replace spaces with hyphens
     title = title.replace(' ', '-')
     
     # Remove special chars except hyphens, numbers, and letters
-    title = re.sub(r'[^A-Za-z0-9\-]', '', title)
+    title = _TITLE_INVALID_RE.sub('', title)
     
     # Convert to uppercase
     return title.upper()
 
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
 def parse_version(version: str) -> tuple[str, str]:
     """Parse version string into core and variant.
     
@@ -55,24 +81,24 @@ def parse_version(version: str) -> tuple[str, str]:
     version = version.strip()
     
     # Remove 'v' or 'V' prefix
-    version = re.sub(r'^[vV]', '', version)
+    version = _VERSION_PREFIX_RE.sub('', version)
     
     # Extract numeric version (numbers and dots only)
-    core_match = re.search(r'^([\d\.]+)', version)
+    core_match = _VERSION_CORE_RE.search(version)
     if core_match:
         core = core_match.group(1)
         # Everything after core is variant
         variant = version[len(core):].strip()
         # Normalize variant (remove spaces, keep alphanumeric, hyphens, underscores, plus)
         if variant:
-            variant = re.sub(r'\s+', '', variant)
-            variant = re.sub(r'[^\w\-\+]', '', variant)
+            variant = _WHITESPACE_RE.sub('', variant)
+            variant = _VARIANT_INVALID_RE.sub('', variant)
             variant = variant.upper()
         return core, variant
     
     # If no numeric version found, treat entire string as variant
-    variant = re.sub(r'\s+', '', version)
-    variant = re.sub(r'[^\w\-\+]', '', variant)
+    variant = _WHITESPACE_RE.sub('', version)
+    variant = _VARIANT_INVALID_RE.sub('', variant)
     return "0.0", variant.upper()
 
 def extract_year(date_str: str) -> str:
@@ -102,16 +128,7 @@ def parse_metadata_file(md_path: Path) -> dict:
     Returns:
         Dictionary of metadata fields
     """
-    with open(md_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Extract YAML frontmatter
-    match = re.match(r'^---\s*\n(.*?)\n---\s*\n', content, re.DOTALL)
-    if not match:
-        raise ValueError(f"No YAML frontmatter found in {md_path}")
-    
-    frontmatter = match.group(1)
-    return yaml.safe_load(frontmatter)
+    return load_frontmatter(md_path)
 
 def generate_filename(
     title: str,
@@ -158,29 +175,9 @@ def generate_filename(
     filename = "_".join(parts) + f".{extension}"
     return filename
 
-def standardize_from_metadata(md_path: Path, patch_path: Path) -> dict:
-    """Generate standardized filename from metadata file.
-    
-    Args:
-        md_path: Path to metadata .md file
-        patch_path: Path to current patch file
-        
-    Returns:
-        Dictionary with:
-            - old_filename: Current filename
-            - new_filename: Standardized filename
-            - metadata_path: Path to metadata file
-            - patch_path: Path to patch file
-            - needs_rename: Boolean indicating if rename needed
-            - warnings: List of warning messages
-    """
-    metadata = parse_metadata_file(md_path)
+def _resolve_baserom(baserom_name: str) -> tuple[str, str, tuple[str, ...]]:
+    """Resolve base ROM abbreviation, CRC and config warnings."""
     warnings = []
-    
-    # Extract fields
-    title = normalize_title(metadata.get('title', ''))
-    system = get_system_abbr(metadata.get('system', ''))
-    baserom_name = metadata.get('baseRom', '')
     baserom = get_baserom_abbr(baserom_name)
     
     # Get CRC (use first variant if multiple)
@@ -189,12 +186,53 @@ def standardize_from_metadata(md_path: Path, patch_path: Path) -> dict:
         warnings.append(f"No CRC found for {baserom_name}")
     
     # Check for multiple CRC variants
-    from .config_loader import get_baserom_variants
     variants = get_baserom_variants(baserom_name)
     if len(variants) > 1:
         regions = ", ".join([f"{v['crc']} ({v['region']})" for v in variants])
         warnings.append(f"Multiple CRC variants available: {regions}")
     
+    return baserom, crc, tuple(warnings)
+
+def _patch_crc_hint(patch_path: Path) -> Optional[str]:
+    """Variant CRC code identified by a patch's embedded source CRC32, if any."""
+    config = get_config()
+    if not config.fingerprints:
+        return None
+    try:
+        source_crc = read_source_crc32(patch_path)
+    except OSError:
+        return None
+    return config.find_variant_by_digest(source_crc) if source_crc else None
+
+def _standardize(
+    metadata: dict,
+    md_path: Path,
+    patch_path: Path,
+    systems: dict,
+    baseroms: dict
+) -> StandardizedName:
+    """Standardize one pair using per-batch system and base ROM lookups."""
+    # Extract fields
+    title = normalize_title(metadata.get('title', ''))
+    
+    system_name = metadata.get('system', '')
+    system = systems.get(system_name) if isinstance(system_name, str) else None
+    if system is None:
+        system = get_system_abbr(system_name)
+        if isinstance(system_name, str):
+            systems[system_name] = system
+    
+    baserom_name = metadata.get('baseRom', '')
+    resolved = baseroms.get(baserom_name)
+    if resolved is None:
+        resolved = baseroms[baserom_name] = _resolve_baserom(baserom_name)
+    baserom, crc, warnings = resolved
+    
+    # UPS/BPS patches embed their source CRC32, which pins the exact variant
+    crc_hint = _patch_crc_hint(patch_path)
+    if crc_hint is not None:
+        crc = find_matching_crc(baserom_name, crc_hint)
+    
     # Parse version
     version_raw = metadata.get('version', '')
     version_core, variant = parse_version(version_raw)
@@ -211,13 +249,67 @@ def standardize_from_metadata(md_path: Path, patch_path: Path) -> dict:
     )
     
     old_filename = patch_path.name
-    needs_rename = old_filename != new_filename
-    
-    return {
-        'old_filename': old_filename,
-        'new_filename': new_filename,
-        'metadata_path': str(md_path),
-        'patch_path': str(patch_path),
-        'needs_rename': needs_rename,
-        'warnings': warnings
-    }
+    
+    return StandardizedName(
+        old_filename=old_filename,
+        new_filename=new_filename,
+        metadata_path=str(md_path),
+        patch_path=str(patch_path),
+        needs_rename=old_filename != new_filename,
+        warnings=warnings
+    )
+
+def standardize_from_metadata(md_path: Path, patch_path: Path, metadata: Optional[dict] = None) -> dict:
+    """Generate standardized filename from metadata file.
+    
+    Args:
+        md_path: Path to metadata .md file
+        patch_path: Path to current patch file
+        metadata: Already parsed metadata, to avoid reading md_path again
+        
+    Returns:
+        Dictionary with:
+            - old_filename: Current filename
+            - new_filename: Standardized filename
+            - metadata_path: Path to metadata file
+            - patch_path: Path to patch file
+            - needs_rename: Boolean indicating if rename needed
+            - warnings: List of warning messages
+    """
+    if metadata is None:
+        metadata = parse_metadata_file(md_path)
+    with stage('standardize'), pinned_config():
+        result = _standardize(metadata, md_path, patch_path, {}, {})
+    return result._replace(warnings=list(result.warnings))._asdict()
+
+def standardize_many(pairs: Iterable[tuple[Path, Path]]) -> list[Union[StandardizedName, Exception]]:
+    """Generate standardized filenames for many metadata/patch pairs.
+    
+    Frontmatter is parsed in one batch, and each system and base ROM is
+    resolved once per call rather than once per file. Filenames and
+    warnings are identical to standardize_from_metadata.
+    
+    Args:
+        pairs: (metadata path, patch path) tuples
+        
+    Returns:
+        One entry per pair, in input order: a StandardizedName, or the
+        exception raised while processing that pair
+    """
+    pairs = list(pairs)
+    parsed = load_frontmatter_many(md_path for md_path, _ in pairs)
+    systems: dict = {}
+    baseroms: dict = {}
+    results: list[Union[StandardizedName, Exception]] = []
+    
+    with stage('standardize'), pinned_config():
+        for (md_path, patch_path), metadata in zip(pairs, parsed):
+            if isinstance(metadata, Exception):
+                results.append(metadata)
+                continue
+            try:
+                results.append(_standardize(metadata, md_path, patch_path, systems, baseroms))
+            except Exception as e:
+                results.append(e)
+    
+    return results
@@ -0,0 +1,203 @@
+"""Fast YAML frontmatter reader for metadata files."""
+import json
+import re
+from collections.abc import Hashable
+from pathlib import Path
+from typing import Any, Iterable, Union
+
+import yaml
+
+from .profiling import stage
+
+# libyaml-backed loader when available, pure-Python otherwise
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+def read_frontmatter(md_path: Path) -> str:
+    """Read the raw YAML frontmatter block of a metadata file.
+
+    Reads line by line and stops at the closing '---', so the Markdown
+    body is never loaded.
+
+    Args:
+        md_path: Path to .md metadata file
+
+    Returns:
+        Frontmatter text without the '---' delimiters
+
+    Raises:
+        ValueError: If the file has no frontmatter block
+    """
+    with open(md_path, 'r', encoding='utf-8') as f:
+        first = f.readline()
+        if first.rstrip() != '---' or not first.endswith('\n'):
+            raise ValueError(f"No YAML frontmatter found in {md_path}")
+
+        lines = []
+        for line in f:
+            if line.rstrip() == '---' and line.endswith('\n'):
+                # The newline before the closing delimiter is not content
+                return ''.join(lines)[:-1]
+            lines.append(line)
+
+    raise ValueError(f"No YAML frontmatter found in {md_path}")
+
+def load_frontmatter(md_path: Path) -> dict:
+    """Parse YAML frontmatter from a metadata file.
+
+    Args:
+        md_path: Path to .md metadata file
+
+    Returns:
+        Dictionary of metadata fields
+    """
+    with stage('yaml'):
+        return yaml.load(read_frontmatter(md_path), Loader=SafeLoader)
+
+def load_frontmatter_many(md_paths: Iterable[Path]) -> list[Union[dict, Exception]]:
+    """Parse the frontmatter of many metadata files in one loader pass.
+
+    All frontmatter blocks are joined into a single multi-document YAML
+    stream so one loader instance handles the whole batch. If any block
+    breaks the stream, files are parsed individually instead.
+
+    Args:
+        md_paths: Paths to .md metadata files
+
+    Returns:
+        One entry per path, in input order: the parsed metadata, or the
+        exception raised while reading or parsing that file
+    """
+    with stage('yaml'):
+        return _load_many(list(md_paths))
+
+def _load_many(md_paths: list[Path]) -> list[Union[dict, Exception]]:
+    results: list[Union[dict, Exception]] = [None] * len(md_paths)
+    blocks: list[tuple[int, str]] = []
+
+    for i, md_path in enumerate(md_paths):
+        try:
+            blocks.append((i, read_frontmatter(md_path)))
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            results[i] = e
+
+    if not blocks:
+        return results
+
+    stream = "\n---\n".join(text for _, text in blocks)
+    try:
+        documents = list(yaml.load_all(stream, Loader=SafeLoader))
+    except yaml.YAMLError:
+        documents = None
+
+    if documents is not None and len(documents) == len(blocks):
+        for (i, _), document in zip(blocks, documents):
+            results[i] = document
+        return results
+
+    for i, text in blocks:
+        try:
+            results[i] = yaml.load(text, Loader=SafeLoader)
+        except yaml.YAMLError as e:
+            results[i] = e
+    return results
+
+class JsYamlLoader(SafeLoader):
+    """SafeLoader resolving scalars the way js-yaml 3 (gray-matter) does.
+
+    Booleans are only true/false in any case style (not yes/no/on/off),
+    floats do not need a decimal point ("1e5"), and duplicate mapping keys
+    are an error instead of last-one-wins.
+    """
+
+    def construct_mapping(self, node, deep=False):
+        if isinstance(node, yaml.MappingNode):
+            seen = set()
+            for key_node, _ in node.value:
+                if key_node.tag == 'tag:yaml.org,2002:merge':
+                    continue
+                key = self.construct_object(key_node, deep=True)
+                if isinstance(key, Hashable):
+                    if key in seen:
+                        raise yaml.constructor.ConstructorError(
+                            "while constructing a mapping", node.start_mark,
+                            "duplicated mapping key", key_node.start_mark
+                        )
+                    seen.add(key)
+        return super().construct_mapping(node, deep)
+
+JsYamlLoader.yaml_implicit_resolvers = {
+    first: [(tag, regexp) for tag, regexp in resolvers
+            if tag not in ('tag:yaml.org,2002:bool', 'tag:yaml.org,2002:float')]
+    for first, resolvers in SafeLoader.yaml_implicit_resolvers.items()
+}
+JsYamlLoader.add_implicit_resolver(
+    'tag:yaml.org,2002:bool',
+    re.compile(r'^(?:true|True|TRUE|false|False|FALSE)$'),
+    list('tTfF')
+)
+# Added after the int resolver so plain integers still resolve as int
+JsYamlLoader.add_implicit_resolver(
+    'tag:yaml.org,2002:float',
+    re.compile(r'''^(?:[-+]?(?:0|[1-9][0-9_]*)(?:\.[0-9_]*)?(?:[eE][-+]?[0-9]+)?
+                    |\.[0-9_]+(?:[eE][-+]?[0-9]+)?
+                    |[-+]?[0-9][0-9_]*(?::[0-5]?[0-9])+\.[0-9_]*
+                    |[-+]?\.(?:inf|Inf|INF)
+                    |\.(?:nan|NaN|NAN))$''', re.X),
+    list('-+0123456789.')
+)
+
+_MATTER_OPEN = '---'
+_MATTER_CLOSE = '\n---'
+_MATTER_COMMENT_RE = re.compile(r'^\s*#[^\n]+', re.M)
+
+def parse_matter(text: str) -> tuple[Any, str]:
+    """Split and parse a Markdown file exactly as gray-matter 4 does.
+
+    Used where output must match scripts/generate-manifest.js: the block
+    runs from the opening '---' to the first '\\n---' anywhere after it,
+    YAML is resolved with JsYamlLoader, and the body loses one leading
+    newline. A language after the opening delimiter ('---json') selects
+    JSON instead of YAML.
+
+    Args:
+        text: Full file contents
+
+    Returns:
+        Tuple of (parsed data, body text); data is {} without frontmatter
+
+    Raises:
+        ValueError: For an unsupported frontmatter language
+        yaml.YAMLError / json.JSONDecodeError: If the block does not parse
+    """
+    if text.startswith('\ufeff'):
+        text = text[1:]
+    if not text.startswith(_MATTER_OPEN) or text[len(_MATTER_OPEN):len(_MATTER_OPEN) + 1] == '-':
+        return {}, text
+
+    rest = text[len(_MATTER_OPEN):]
+    newline = re.search(r'\r?\n', rest)
+    language_raw = rest[:newline.start() if newline else -1]
+    language = language_raw.strip() or 'yaml'
+    if language_raw.strip():
+        rest = rest[len(language_raw):]
+
+    close = rest.find(_MATTER_CLOSE)
+    if close == -1:
+        close = len(rest)
+    block = rest[:close]
+    if close == len(rest):
+        content = ''
+    else:
+        content = rest[close + len(_MATTER_CLOSE):]
+        if content[:1] == '\r':
+            content = content[1:]
+        if content[:1] == '\n':
+            content = content[1:]
+
+    if _MATTER_COMMENT_RE.sub('', block).strip() == '':
+        return {}, content
+    if language in ('yaml', 'yml'):
+        return yaml.load(block, Loader=JsYamlLoader), content
+    if language == 'json':
+        return json.loads(block), content
+    raise ValueError(f'gray-matter engine "{language}" is not registered')
@@ -0,0 +1,344 @@
+"""Mirror hack images locally and generate responsive thumbnails.
+
+Metadata points boxArt/bannerImage at third-party hosts. This module
+fetches them concurrently (asyncio, bounded overall and per host) into a
+content-addressed store under docs/, so the site serves its own copies:
+
+    <store>/<sha[:2]>/<sha256>.<ext>          original bytes
+    <store>/<sha[:2]>/<sha256>-<width>w.webp  thumbnail (also .avif)
+    <store>/index.json                        source URL -> image record
+
+Fetching goes through a Fetcher, any object with an async fetch(url)
+method, so callers can substitute a local stand-in for the network.
+Dimensions come from the image headers; thumbnails need the optional
+Pillow package (AVIF also needs Pillow built with AVIF support).
+"""
+import asyncio
+import hashlib
+import json
+import struct
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Optional, Protocol
+from urllib.parse import urlsplit
+
+from .manifest_builder import write_if_changed
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+    features = None
+
+INDEX_VERSION = 1
+INDEX_FILE = 'index.json'
+DEFAULT_STORE = Path('docs') / 'assets' / 'images' / 'mirror'
+DEFAULT_THUMB_WIDTH = 320
+THUMB_FORMATS = ('webp', 'avif')
+# images.<key> in manifest entries (see manifest_builder.IMAGE_FIELDS)
+IMAGE_KEYS = ('boxArt', 'banner')
+
+MAX_IMAGE_BYTES = 20 * 1024 * 1024
+USER_AGENT = 'pkmn-rom-patcher-image-mirror/1.0'
+
+_EXTENSIONS = {'jpeg': 'jpg'}
+
+class FetchError(Exception):
+    """An image could not be fetched or is not a supported image."""
+
+class Fetcher(Protocol):
+    async def fetch(self, url: str) -> bytes:
+        """Return the body of url, or raise FetchError."""
+
+class UrllibFetcher:
+    """Default fetcher: urllib requests run in worker threads."""
+
+    def __init__(self, timeout: float = 30.0, max_bytes: int = MAX_IMAGE_BYTES):
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+
+    def _get(self, url: str) -> bytes:
+        request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                data = response.read(self.max_bytes + 1)
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            raise FetchError(str(e)) from e
+        if len(data) > self.max_bytes:
+            raise FetchError(f"larger than {self.max_bytes} bytes")
+        return data
+
+    async def fetch(self, url: str) -> bytes:
+        return await asyncio.to_thread(self._get, url)
+
+def _jpeg_size(data: bytes) -> Optional[tuple[int, int]]:
+    pos = 2
+    while pos + 9 < len(data):
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            pos += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            pos += 2
+            continue
+        length = struct.unpack('>H', data[pos + 2:pos + 4])[0]
+        # SOF0-SOF15, except DHT (C4), JPG (C8) and DAC (CC)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack('>HH', data[pos + 5:pos + 9])
+            return width, height
+        pos += 2 + length
+    return None
+
+def _webp_size(data: bytes) -> Optional[tuple[int, int]]:
+    chunk = data[12:16]
+    if chunk == b'VP8 ' and len(data) >= 30:
+        width, height = struct.unpack('<HH', data[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L' and len(data) >= 25:
+        bits = int.from_bytes(data[21:25], 'little')
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b'VP8X' and len(data) >= 30:
+        return int.from_bytes(data[24:27], 'little') + 1, int.from_bytes(data[27:30], 'little') + 1
+    return None
+
+def sniff_image(data: bytes) -> Optional[tuple[str, int, int]]:
+    """Detect the format and pixel size of an image from its header.
+
+    Returns:
+        Tuple of (format, width, height), or None if not a supported image
+    """
+    size = None
+    if data.startswith(b'\x89PNG\r\n\x1a\n') and data[12:16] == b'IHDR':
+        fmt, size = 'png', struct.unpack('>II', data[16:24])
+    elif data[:6] in (b'GIF87a', b'GIF89a'):
+        fmt, size = 'gif', struct.unpack('<HH', data[6:10])
+    elif data.startswith(b'\xff\xd8'):
+        fmt, size = 'jpeg', _jpeg_size(data)
+    elif data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        fmt, size = 'webp', _webp_size(data)
+    elif data[4:8] == b'ftyp' and data[8:12] in (b'avif', b'avis'):
+        fmt = 'avif'
+        ispe = data.find(b'ispe')
+        if ispe != -1 and ispe + 16 <= len(data):
+            size = struct.unpack('>II', data[ispe + 8:ispe + 16])
+    if not size:
+        return None
+    return fmt, size[0], size[1]
+
+def _store_path(sha: str, suffix: str) -> str:
+    return f"{sha[:2]}/{sha}{suffix}"
+
+def load_index(store: Path) -> dict:
+    try:
+        index = json.loads((Path(store) / INDEX_FILE).read_text(encoding='utf-8'))
+        if index.get('version') == INDEX_VERSION:
+            return index
+    except (OSError, ValueError):
+        pass
+    return {'version': INDEX_VERSION, 'images': {}}
+
+def save_index(store: Path, index: dict) -> bool:
+    index['images'] = dict(sorted(index['images'].items()))
+    return write_if_changed(Path(store) / INDEX_FILE, json.dumps(index, indent=2) + '\n')
+
+async def _mirror_one(url: str, store: Path, fetcher: Fetcher,
+                      limit: asyncio.Semaphore, host_limit: asyncio.Semaphore) -> dict:
+    async with limit, host_limit:
+        data = await fetcher.fetch(url)
+    sniffed = sniff_image(data)
+    if sniffed is None:
+        raise FetchError('not a PNG, JPEG, GIF, WebP or AVIF image')
+    fmt, width, height = sniffed
+
+    sha = hashlib.sha256(data).hexdigest()
+    rel = _store_path(sha, f".{_EXTENSIONS.get(fmt, fmt)}")
+    path = store / rel
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + '.tmp')
+        tmp.write_bytes(data)
+        tmp.replace(path)
+    return {'sha256': sha, 'file': rel, 'format': fmt, 'width': width, 'height': height}
+
+async def _mirror_all(urls: list[str], store: Path, fetcher: Fetcher,
+                      concurrency: int, per_host: int) -> list:
+    limit = asyncio.Semaphore(concurrency)
+    host_limits: dict[str, asyncio.Semaphore] = {}
+    tasks = []
+    for url in urls:
+        host = urlsplit(url).hostname or ''
+        host_limit = host_limits.setdefault(host, asyncio.Semaphore(per_host))
+        tasks.append(_mirror_one(url, store, fetcher, limit, host_limit))
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+def mirror_images(
+    urls: list[str],
+    store: Path,
+    fetcher: Optional[Fetcher] = None,
+    concurrency: int = 16,
+    per_host: int = 4,
+    refresh: bool = False
+) -> tuple[dict, dict[str, str]]:
+    """Fetch images not yet in the store and record them in its index.
+
+    Args:
+        urls: Image URLs
+        store: Content-addressed store directory
+        fetcher: Fetcher to use (default: UrllibFetcher())
+        concurrency: Maximum fetches in flight overall
+        per_host: Maximum fetches in flight per host
+        refresh: Fetch again even if a URL is already in the index
+
+    Returns:
+        Tuple of (index, {url: error message} for failed fetches). The
+        index is not saved; see save_index().
+    """
+    store = Path(store)
+    index = load_index(store)
+    images = index['images']
+    pending = sorted({
+        url for url in urls
+        if refresh or url not in images or not (store / images[url]['file']).exists()
+    })
+    if not pending:
+        return index, {}
+
+    results = asyncio.run(_mirror_all(pending, store, fetcher or UrllibFetcher(), concurrency, per_host))
+
+    failures = {}
+    for url, result in zip(pending, results):
+        if isinstance(result, BaseException):
+            failures[url] = str(result) or type(result).__name__
+            continue
+        previous = images.get(url, {})
+        if previous.get('sha256') == result['sha256'] and 'thumbnails' in previous:
+            result['thumbnails'] = previous['thumbnails']
+        images[url] = result
+    return index, failures
+
+def prune_store(store: Path, index: dict, keep_urls: set[str]) -> int:
+    """Forget URLs outside keep_urls and delete files no index entry references.
+
+    Returns:
+        Number of files deleted
+    """
+    store = Path(store)
+    images = index['images']
+    for url in set(images) - keep_urls:
+        del images[url]
+
+    referenced = set()
+    for record in images.values():
+        referenced.add(record['file'])
+        referenced.update((record.get('thumbnails') or {}).get('files', {}).values())
+
+    removed = 0
+    for path in store.glob('??/*'):
+        if path.relative_to(store).as_posix() not in referenced:
+            path.unlink()
+            removed += 1
+    for directory in store.glob('??'):
+        if directory.is_dir() and not any(directory.iterdir()):
+            directory.rmdir()
+    return removed
+
+def thumbnail_formats(requested: tuple[str, ...] = THUMB_FORMATS) -> list[str]:
+    """Requested thumbnail formats that the installed Pillow can write."""
+    if Image is None:
+        return []
+    return [fmt for fmt in requested if features.check(fmt)]
+
+def make_thumbnails(task: tuple) -> dict:
+    """Write thumbnails for one stored image.
+
+    Args:
+        task: (store, record, width, formats)
+
+    Returns:
+        Thumbnail record: width, height and {format: store path}
+    """
+    store, record, max_width, formats = task
+    store = Path(store)
+    with Image.open(store / record['file']) as image:
+        image.seek(0)
+        width = min(max_width, image.width)
+        height = max(1, round(image.height * width / image.width))
+        thumb = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+        thumb = thumb.resize((width, height), Image.Resampling.LANCZOS)
+
+    files = {}
+    for fmt in formats:
+        rel = _store_path(record['sha256'], f"-{width}w.{fmt}")
+        path = store / rel
+        if not path.exists():
+            tmp = path.with_name(path.name + '.tmp')
+            thumb.save(tmp, format=fmt.upper(), quality=80)
+            tmp.replace(path)
+        files[fmt] = rel
+    return {'width': width, 'height': height, 'files': files}
+
+def thumbnail_task(task: tuple):
+    """make_thumbnails() for map_ordered: errors are returned as strings."""
+    try:
+        return make_thumbnails(task)
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+
+def localize_images(patches: list[dict], index: dict, prefix: str) -> int:
+    """Point manifest image URLs at mirrored copies.
+
+    images.<key> becomes the local original, images.remote keeps the
+    source URL, images.sizes holds [width, height], and images.thumbnails
+    holds the thumbnail record. Images that were not mirrored keep their
+    remote URL. Running it again on a localized manifest is a no-op.
+
+    Args:
+        patches: Manifest entries, modified in place
+        index: Store index from mirror_images()
+        prefix: URL prefix of the store as seen from the site pages
+
+    Returns:
+        Number of image URLs pointing at local copies
+    """
+    localized = 0
+    for entry in patches:
+        images = (entry.get('meta') or {}).get('images')
+        if not isinstance(images, dict):
+            continue
+        remote = dict(images.get('remote') or {})
+        for key in IMAGE_KEYS:
+            url = remote.get(key, images.get(key))
+            record = index['images'].get(url) if isinstance(url, str) else None
+            if record is None:
+                continue
+            remote[key] = url
+            images[key] = prefix + record['file']
+            images.setdefault('sizes', {})[key] = [record['width'], record['height']]
+            thumbnail = record.get('thumbnails')
+            if thumbnail:
+                images.setdefault('thumbnails', {})[key] = {
+                    'width': thumbnail['width'],
+                    'height': thumbnail['height'],
+                    **{fmt: prefix + rel for fmt, rel in thumbnail['files'].items()},
+                }
+            localized += 1
+        if remote:
+            images['remote'] = remote
+    return localized
+
+def image_urls(patches: list[dict]) -> list[str]:
+    """Remote image URLs referenced by manifest entries (original URLs once localized)."""
+    urls = set()
+    for entry in patches:
+        images = (entry.get('meta') or {}).get('images')
+        if not isinstance(images, dict):
+            continue
+        remote = images.get('remote') or {}
+        for key in IMAGE_KEYS:
+            url = remote.get(key, images.get(key))
+            if isinstance(url, str) and urlsplit(url).scheme in ('http', 'https'):
+                urls.add(url)
+    return sorted(urls)
@@ -0,0 +1,362 @@
+"""Manifest builder matching scripts/generate-manifest.js, with a build cache.
+
+Entries are rebuilt only when their inputs change. The cache is keyed by
+the patch path and the SHA-256 of its metadata file; a matching mtime and
+size skips even the hashing. Patch bytes never reach the manifest, so
+patches are keyed by path only.
+"""
+import datetime
+import hashlib
+import json
+import math
+import os
+import re
+from pathlib import Path
+from typing import Any, Optional
+
+from .frontmatter import parse_matter
+from .parallel import map_ordered
+from .profiling import stage
+
+MANIFEST_EXTENSIONS = ('ips', 'bps', 'ups', 'xdelta')
+ESSENTIAL_FIELDS = ('baseRom', 'system', 'status', 'author')
+IMAGE_FIELDS = (('boxArt', 'boxArt'), ('bannerImage', 'banner'))
+LINK_FIELDS = ('website', 'discord', 'documentation')
+
+# Bump when entry construction changes so stale cache entries are dropped
+CACHE_VERSION = 1
+DEFAULT_CACHE = Path('.cache') / 'manifest-build.json'
+
+# JavaScript's String.prototype.trim() and \s whitespace set
+_JS_SPACE = '\t\n\v\f\r \u00a0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000\ufeff'
+_JS_TRIM_RE = re.compile(f'^[{_JS_SPACE}]+|[{_JS_SPACE}]+$')
+_CRC32_RE = re.compile(r'\[([A-Fa-f0-9]{8})\]')
+_CRC32_STRIP_RE = re.compile(f'[{_JS_SPACE}]*\\[([A-Fa-f0-9]{{8}})\\][{_JS_SPACE}]*')
+_ARRAY_INDEX_RE = re.compile(r'^(?:0|[1-9][0-9]*)$')
+
+def js_truthy(value: Any) -> bool:
+    """Truthiness of a JSON value as JavaScript sees it (empty lists are true)."""
+    if value is None or isinstance(value, bool):
+        return bool(value)
+    if isinstance(value, (int, float)):
+        return value != 0 and not math.isnan(value)
+    if isinstance(value, str):
+        return value != ''
+    return True
+
+def _js_trim(text: str) -> str:
+    return _JS_TRIM_RE.sub('', text)
+
+def _js_slug(name: str) -> str:
+    # /[^a-z0-9]/g replaces UTF-16 code units, so astral characters become two dashes
+    return ''.join(
+        ch if 'a' <= ch <= 'z' or '0' <= ch <= '9' else ('--' if ord(ch) > 0xFFFF else '-')
+        for ch in name
+    )
+
+def _js_key(key: Any) -> str:
+    if isinstance(key, str):
+        return key
+    if key is None or isinstance(key, bool):
+        return json.dumps(key)
+    return str(to_json_value(key))
+
+def _js_date(value: datetime.date) -> str:
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc)
+        return value.strftime('%Y-%m-%dT%H:%M:%S.') + f"{value.microsecond // 1000:03d}Z"
+    return value.strftime('%Y-%m-%dT00:00:00.000Z')
+
+def to_json_value(value: Any) -> Any:
+    """Convert parsed YAML to what JSON.stringify would emit for js-yaml's result.
+
+    Dates become UTC ISO strings, integral floats lose their fraction,
+    NaN/Infinity become null, and object keys are strings ordered the way
+    JavaScript orders them (array-index keys first, ascending).
+    """
+    if isinstance(value, dict):
+        items = [(_js_key(k), to_json_value(v)) for k, v in value.items()]
+        indexed = sorted(
+            ((k, v) for k, v in items if _ARRAY_INDEX_RE.match(k) and int(k) < 2**32 - 1),
+            key=lambda kv: int(kv[0])
+        )
+        if not indexed:
+            return dict(items)
+        index_keys = {k for k, _ in indexed}
+        return dict(indexed + [(k, v) for k, v in items if k not in index_keys])
+    if isinstance(value, (list, tuple)):
+        return [to_json_value(v) for v in value]
+    if isinstance(value, float):
+        if math.isnan(value) or math.isinf(value):
+            return None
+        if value.is_integer() and abs(value) < 1e21:
+            return int(value)
+        return value
+    if isinstance(value, datetime.date):
+        return _js_date(value)
+    if isinstance(value, bytes):
+        return {'type': 'Buffer', 'data': list(value)}
+    if isinstance(value, (set, frozenset)):
+        return {_js_key(k): None for k in value}
+    return value
+
+def _as_object(data: Any) -> dict:
+    """What `{...data}` yields for a parsed frontmatter value."""
+    if isinstance(data, dict):
+        return data
+    if isinstance(data, (list, str)):
+        return {str(i): v for i, v in enumerate(data)}
+    return {}
+
+def entry_id(base_rom: str, patch_name: str) -> str:
+    """Manifest id of a patch (e.g., "emerald-emerald-enhanced-gba-em-1961-11-010-2025")."""
+    base_name = os.path.splitext(patch_name)[0]
+    return f"{base_rom.lower()}-{_js_slug(_CRC32_STRIP_RE.sub('', base_name, count=1).lower())}"
+
+def build_entry(base_rom: str, patch_name: str, md_text: Optional[str],
+                md_error: Optional[str] = None) -> tuple[dict, list[str]]:
+    """Build one manifest entry the way generate-manifest.js does.
+
+    Args:
+        base_rom: Base ROM subdirectory name (e.g., "emerald")
+        patch_name: Patch filename
+        md_text: Metadata file contents, or None when there is no metadata file
+        md_error: Message if the metadata file exists but could not be read
+
+    Returns:
+        Tuple of (entry dict, warning messages)
+    """
+    base_name, ext = os.path.splitext(patch_name)
+    warnings = []
+    meta: dict = {}
+    changelog = None
+    incomplete = False
+
+    if md_text is not None or md_error is not None:
+        try:
+            if md_error is not None:
+                raise ValueError(md_error)
+            data, content = parse_matter(md_text)
+            if data is None:
+                raise ValueError("Cannot read properties of null")
+            meta = to_json_value(_as_object(data))
+            changelog = _js_trim(content)
+
+            missing = [field for field in ESSENTIAL_FIELDS if not js_truthy(meta.get(field))]
+            if missing:
+                warnings.append(f"Missing essential fields in {base_rom}/{base_name}.md: {', '.join(missing)}")
+            incomplete = bool(missing)
+        except Exception as e:
+            warnings.append(f"Error parsing {base_rom}/{base_name}.md: {e}")
+            incomplete = True
+    else:
+        warnings.append(f"No metadata file found for {base_rom}/{patch_name}")
+        incomplete = True
+
+    crc32_match = _CRC32_RE.search(base_name)
+    clean_name = _CRC32_STRIP_RE.sub('', base_name, count=1)
+
+    entry = {
+        'id': entry_id(base_rom, patch_name),
+        'title': meta['title'] if js_truthy(meta.get('title')) else clean_name,
+        'file': f"../patches/{base_rom}/{patch_name}",
+        'type': ext.lower()[1:],
+        'baseRom': base_rom,
+    }
+    if crc32_match:
+        entry['crc32'] = crc32_match.group(1).upper()
+    if incomplete:
+        entry['incomplete'] = True
+
+    entry_meta = dict(meta)
+    if js_truthy(meta.get('boxArt')) or js_truthy(meta.get('bannerImage')):
+        entry_meta['images'] = {
+            out: meta[field] for field, out in IMAGE_FIELDS if js_truthy(meta.get(field))
+        }
+    if any(js_truthy(meta.get(field)) for field in LINK_FIELDS):
+        entry_meta['links'] = {
+            field: meta[field] for field in LINK_FIELDS if js_truthy(meta.get(field))
+        }
+    for field in ('boxArt', 'bannerImage', 'website', 'discord', 'documentation', 'title'):
+        entry_meta.pop(field, None)
+    entry['meta'] = entry_meta
+
+    if changelog:
+        entry['changelog'] = changelog
+
+    return entry, warnings
+
+def _build_task(task: tuple) -> tuple[Optional[str], Optional[dict], Optional[list[str]]]:
+    """Read, hash and (if changed) build one entry.
+
+    Returns:
+        Tuple of (metadata sha256, entry, warnings); entry and warnings
+        are None when the hash matches the cached one
+    """
+    base_rom, patch_name, md_path, cached_sha = task
+    if md_path is None:
+        entry, warnings = build_entry(base_rom, patch_name, None)
+        return None, entry, warnings
+
+    try:
+        with open(md_path, 'rb') as f:
+            raw = f.read()
+    except OSError as e:
+        entry, warnings = build_entry(base_rom, patch_name, None, md_error=e.strerror or str(e))
+        return None, entry, warnings
+
+    sha = hashlib.sha256(raw).hexdigest()
+    if sha == cached_sha:
+        return sha, None, None
+    entry, warnings = build_entry(base_rom, patch_name, raw.decode('utf-8', 'replace'))
+    return sha, entry, warnings
+
+def _sorted_entries(path: Path) -> list[os.DirEntry]:
+    # Node's readdirSync returns names in strcmp (byte) order
+    with os.scandir(path) as it:
+        return sorted(it, key=lambda e: os.fsencode(e.name))
+
+# Cache file -> ((mtime_ns, size), entries) as last read or written by this
+# process, so long-running callers (build.py --watch) skip the JSON parse
+_cache_memo: dict[Path, tuple[tuple[int, int], dict]] = {}
+
+def _cache_stamp(cache_path: Path) -> Optional[tuple[int, int]]:
+    try:
+        st = os.stat(cache_path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def _load_cache(cache_path: Optional[Path]) -> dict:
+    if cache_path is None:
+        return {}
+    memo = _cache_memo.get(cache_path)
+    if memo is not None and memo[0] == _cache_stamp(cache_path):
+        return memo[1]
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('version') != CACHE_VERSION:
+        return {}
+    entries = cache.get('entries', {})
+    _cache_memo[cache_path] = (_cache_stamp(cache_path), entries)
+    return entries
+
+def build_manifest(root: Path, cache_path: Optional[Path] = None,
+                   jobs: Optional[int] = 1) -> tuple[list[dict], list[str], dict]:
+    """Build the manifest for root/patches and root/metadata.
+
+    Args:
+        root: Project root
+        cache_path: Build cache file, or None to rebuild every entry
+        jobs: Worker processes for entries that need rebuilding
+
+    Returns:
+        Tuple of (manifest entries, warnings in generate-manifest.js order,
+        stats dict with 'total', 'rebuilt' and 'cached' counts)
+    """
+    root = Path(root)
+    patches_dir = root / 'patches'
+    metadata_dir = root / 'metadata'
+    patches_dir.mkdir(parents=True, exist_ok=True)
+    metadata_dir.mkdir(parents=True, exist_ok=True)
+
+    cached = _load_cache(cache_path)
+    new_cache: dict = {}
+
+    # Walk in the JS script's order; a slot is a warning or a patch
+    slots: list[tuple] = []
+    tasks: list[tuple] = []
+    with stage('scan'):
+        for rom_entry in _sorted_entries(patches_dir):
+            if not rom_entry.is_dir(follow_symlinks=False):
+                continue
+            base_rom = rom_entry.name
+            rom_metadata_dir = metadata_dir / base_rom
+            if not rom_metadata_dir.exists():
+                slots.append(('warning', f"Metadata directory not found for {base_rom}: {os.path.abspath(rom_metadata_dir)}"))
+                continue
+
+            for patch_entry in _sorted_entries(Path(rom_entry.path)):
+                if not patch_entry.is_file(follow_symlinks=False):
+                    continue
+                base_name, ext = os.path.splitext(patch_entry.name)
+                if ext.lower()[1:] not in MANIFEST_EXTENSIONS:
+                    continue
+
+                key = f"{base_rom}/{patch_entry.name}"
+                md_path = rom_metadata_dir / f"{base_name}.md"
+                hit = cached.get(key)
+                try:
+                    st = md_path.stat()
+                    stamp = [st.st_mtime_ns, st.st_size]
+                except OSError:
+                    md_path, stamp = None, None
+
+                if hit is not None and stamp is not None and hit.get('stat') == stamp:
+                    new_cache[key] = hit
+                    slots.append(('entry', key))
+                    continue
+                if hit is not None and md_path is None and hit.get('sha256') is None:
+                    new_cache[key] = hit
+                    slots.append(('entry', key))
+                    continue
+
+                cached_sha = hit.get('sha256') if hit is not None else None
+                tasks.append((base_rom, patch_entry.name, str(md_path) if md_path else None, cached_sha))
+                new_cache[key] = {'stat': stamp, 'hit': hit}
+                slots.append(('entry', key))
+
+    rebuilt = 0
+    keys = [f"{task[0]}/{task[1]}" for task in tasks]
+    for key, (sha, entry, warnings) in zip(keys, map_ordered(_build_task, tasks, jobs)):
+        previous = new_cache[key].pop('hit')
+        if entry is None:
+            entry, warnings = previous['entry'], previous['warnings']
+        else:
+            rebuilt += 1
+        new_cache[key].update({'sha256': sha, 'entry': entry, 'warnings': warnings})
+
+    patches = []
+    messages = []
+    for kind, value in slots:
+        if kind == 'warning':
+            messages.append(value)
+            continue
+        record = new_cache[value]
+        messages.extend(record['warnings'])
+        patches.append(record['entry'])
+
+    if cache_path is not None and (new_cache != cached or not cache_path.exists()):
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # json.dumps uses the C encoder; json.dump to a file does not
+        text = json.dumps({'version': CACHE_VERSION, 'entries': new_cache}, ensure_ascii=False)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        _cache_memo[cache_path] = (_cache_stamp(cache_path), new_cache)
+
+    stats = {'total': len(patches), 'rebuilt': rebuilt, 'cached': len(patches) - rebuilt}
+    return patches, messages, stats
+
+def render_manifest(patches: list[dict]) -> str:
+    """Serialize entries byte-for-byte like JSON.stringify(patches, null, 2)."""
+    return json.dumps(patches, indent=2, ensure_ascii=False)
+
+def write_if_changed(path: Path, text: str) -> bool:
+    """Write text to path only if the file's bytes differ.
+
+    Returns:
+        True if the file was written
+    """
+    data = text.encode('utf-8')
+    try:
+        if Path(path).read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_bytes(data)
+    return True
@@ -0,0 +1,114 @@
+"""Content-hashed manifest shards for the library page.
+
+The library grid and filters only need a few fields per hack, so the full
+manifest is split into:
+
+- index.<hash>.json: compact entries (grid, filter and search fields),
+  each tagged with the shard holding its full entry
+- <baseRom>.<hash>.json: full entries for one base ROM, keyed by id
+- search.<hash>.json: inverted search index and filter counts (see
+  search_index.py)
+- latest.json: the only unhashed file, naming the current index and shards
+
+Hashed files never change once written, so browsers and the service worker
+can cache them indefinitely; only latest.json has to be revalidated.
+"""
+import hashlib
+import json
+import re
+from pathlib import Path
+
+from .manifest_builder import write_if_changed
+from .search_index import build_search_index
+
+SHARD_VERSION = 1
+POINTER_FILE = 'latest.json'
+HASH_LENGTH = 12
+
+# Fields read by ui.js cards, search.js filters and the Fuse.js keys
+INDEX_META_FIELDS = (
+    'baseRom', 'system', 'status', 'difficulty', 'author', 'tags', 'mechanics',
+    'fakemons', 'graphics', 'story', 'rating', 'images'
+)
+INDEX_ENTRY_FIELDS = ('id', 'title', 'file', 'type', 'baseRom', 'crc32', 'incomplete')
+
+_SHARD_NAME_RE = re.compile(r'[^a-z0-9-]')
+
+def _dumps(data) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+def _hashed_name(stem: str, text: str) -> str:
+    digest = hashlib.sha256(text.encode('utf-8')).hexdigest()[:HASH_LENGTH]
+    return f"{stem}.{digest}.json"
+
+def shard_key(entry: dict) -> str:
+    """Shard name for an entry: its base ROM directory, made filename-safe."""
+    return _SHARD_NAME_RE.sub('-', str(entry.get('baseRom', '')).lower()) or 'other'
+
+def compact_entry(entry: dict) -> dict:
+    """Reduce a manifest entry to the fields the library grid needs."""
+    compact = {field: entry[field] for field in INDEX_ENTRY_FIELDS if field in entry}
+    meta = entry.get('meta') or {}
+    compact['meta'] = {field: meta[field] for field in INDEX_META_FIELDS if field in meta}
+    compact['shard'] = shard_key(entry)
+    return compact
+
+def write_shards(patches: list[dict], shards_dir: Path) -> tuple[dict, int]:
+    """Write the index, search index, detail shards and pointer for a manifest.
+
+    Files that already exist are left alone (their name is their content
+    hash), and hashed files no longer referenced are removed.
+
+    Args:
+        patches: Manifest entries, as written to docs/manifest.json
+        shards_dir: Output directory (e.g., docs/manifest)
+
+    Returns:
+        Tuple of (pointer dict, number of files written or removed)
+    """
+    shards_dir = Path(shards_dir)
+    shards_dir.mkdir(parents=True, exist_ok=True)
+
+    by_shard: dict[str, dict] = {}
+    for entry in patches:
+        by_shard.setdefault(shard_key(entry), {})[entry['id']] = entry
+
+    files: dict[str, str] = {}
+    shard_names = {}
+    for key in sorted(by_shard):
+        text = _dumps(by_shard[key])
+        name = _hashed_name(key, text)
+        files[name] = text
+        shard_names[key] = name
+
+    index_text = _dumps([compact_entry(entry) for entry in patches])
+    index_name = _hashed_name('index', index_text)
+    files[index_name] = index_text
+
+    search_text = _dumps(build_search_index(patches))
+    search_name = _hashed_name('search', search_text)
+    files[search_name] = search_text
+
+    pointer = {
+        'version': SHARD_VERSION,
+        'count': len(patches),
+        'index': index_name,
+        'search': search_name,
+        'shards': shard_names,
+    }
+
+    changes = 0
+    for name, text in files.items():
+        path = shards_dir / name
+        if not path.exists():
+            path.write_bytes(text.encode('utf-8'))
+            changes += 1
+    if write_if_changed(shards_dir / POINTER_FILE, json.dumps(pointer, indent=2) + '\n'):
+        changes += 1
+
+    for path in shards_dir.glob('*.json'):
+        if path.name != POINTER_FILE and path.name not in files:
+            path.unlink()
+            changes += 1
+
+    return pointer, changes
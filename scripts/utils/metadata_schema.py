@@ -0,0 +1,259 @@
+"""Schema for metadata/**/*.md frontmatter, compiled to checker functions.
+
+SCHEMA declares each field once (mirroring docs/assets/js/config/
+metadata-fields.js, the submission form's field list). compile_schema()
+turns it into one closure per field, with enum sets, regexes and the
+config lookups bound in, so validating a file is a dict walk with no
+schema interpretation.
+"""
+import datetime
+import re
+from typing import Any, Callable, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+from .config_loader import ConfigIndex
+
+# Field kinds:
+#   text        non-empty string
+#   version     string or number (YAML reads 1.0 as a float)
+#   enum        one of options; booleans allowed when options are Yes/No
+#   list        list of non-empty strings (custom values allowed)
+#   yes-no      boolean, or "Yes"/"No"
+#   text-or-bool  boolean or non-empty string ("Yes: challenge modifiers")
+#   date        ISO 8601 calendar date (YAML date or "YYYY-MM-DD")
+#   url         absolute http(s) URL
+#   count       non-negative integer
+#   rating      number from 0 to 5
+#   patch-file  "../patches/<baserom>/<file>"
+#   base-rom    key, fullName or abbreviation in config/base-roms.json
+#   system      name or abbreviation in config/systems.json
+class Field(NamedTuple):
+    kind: str
+    required: bool = False
+    options: tuple[str, ...] = ()
+
+YES_NO = ('Yes', 'No')
+
+SCHEMA: dict[str, Field] = {
+    'title': Field('text', required=True),
+    'file': Field('patch-file', required=True),
+    'baseRom': Field('base-rom', required=True),
+    'system': Field('system', required=True),
+    'status': Field('enum', required=True,
+                    options=('Completed', 'Perpetual Beta', 'Updating', 'Cancelled', 'In Development')),
+    'author': Field('text', required=True),
+    'version': Field('version'),
+    'released': Field('date'),
+    'hackType': Field('enum', options=('New', 'Improvement')),
+    'difficulty': Field('enum', options=('Normal', 'Hard', 'Challenging', 'Kaizo', 'Customisable')),
+    'graphics': Field('enum', options=('New', 'Enhanced', 'Same')),
+    'story': Field('enum', options=('New', 'Enhanced', 'Same')),
+    'maps': Field('enum', options=('New', 'Enhanced', 'Same')),
+    'postgame': Field('enum', options=('Yes', 'No', 'N/A')),
+    'tags': Field('list'),
+    'mechanics': Field('list'),
+    'fakemons': Field('enum', options=('All', 'Majority', 'A few', 'None')),
+    'variants': Field('list'),
+    'typeChanges': Field('list'),
+    'physicalSpecialSplit': Field('yes-no'),
+    'antiCheat': Field('yes-no'),
+    'playtime': Field('text'),
+    'totalCatchable': Field('count'),
+    'pokedexIncludes': Field('enum', options=('I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX', 'N/A')),
+    'openWorld': Field('yes-no'),
+    'randomizer': Field('text-or-bool'),
+    'nuzlocke': Field('text-or-bool'),
+    'rating': Field('rating'),
+    'website': Field('url'),
+    'discord': Field('url'),
+    'documentation': Field('url'),
+    'boxArt': Field('url'),
+    'bannerImage': Field('url'),
+}
+
+# Returns an error message, or None if the value is valid
+Check = Callable[[Any], Optional[str]]
+
+_ISO_DATE_RE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})$')
+_PATCH_FILE_RE = re.compile(r'^\.\./patches/[^/]+/[^/]+\.(?:ips|bps|ups|xdelta)$', re.IGNORECASE)
+
+def _type_name(value: Any) -> str:
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'boolean'
+    if isinstance(value, (int, float)):
+        return 'number'
+    if isinstance(value, datetime.date):
+        return 'date'
+    return {str: 'string', list: 'list', dict: 'mapping'}.get(type(value), type(value).__name__)
+
+def _check_text(value: Any) -> Optional[str]:
+    if not isinstance(value, str):
+        return f"expected a string, got {_type_name(value)}"
+    if not value.strip():
+        return "must not be empty"
+    return None
+
+def _check_version(value: Any) -> Optional[str]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return None
+    return _check_text(value)
+
+def _check_list(value: Any) -> Optional[str]:
+    if not isinstance(value, list):
+        return f"expected a list, got {_type_name(value)}"
+    for item in value:
+        if not isinstance(item, str) or not item.strip():
+            return f"list items must be non-empty strings, got {item!r}"
+    return None
+
+def _check_yes_no(value: Any) -> Optional[str]:
+    if isinstance(value, bool) or value in YES_NO:
+        return None
+    return f"expected true/false or Yes/No, got {value!r}"
+
+def _check_text_or_bool(value: Any) -> Optional[str]:
+    if isinstance(value, bool):
+        return None
+    return _check_text(value)
+
+def _check_date(value: Any) -> Optional[str]:
+    if isinstance(value, datetime.datetime):
+        return "expected a date without a time"
+    if isinstance(value, datetime.date):
+        return None
+    if not isinstance(value, str):
+        return f"expected an ISO date (YYYY-MM-DD), got {_type_name(value)}"
+    match = _ISO_DATE_RE.match(value)
+    if not match:
+        return f"expected an ISO date (YYYY-MM-DD), got {value!r}"
+    try:
+        datetime.date(*map(int, match.groups()))
+    except ValueError as e:
+        return f"invalid date {value!r}: {e}"
+    return None
+
+def _check_url(value: Any) -> Optional[str]:
+    if not isinstance(value, str):
+        return f"expected a URL, got {_type_name(value)}"
+    parts = urlsplit(value)
+    if parts.scheme not in ('http', 'https') or not parts.netloc:
+        return f"expected an http(s) URL, got {value!r}"
+    if any(ch.isspace() for ch in value):
+        return "URL must not contain whitespace"
+    return None
+
+def _check_count(value: Any) -> Optional[str]:
+    if isinstance(value, bool) or not isinstance(value, int):
+        return f"expected a whole number, got {_type_name(value)}"
+    if value < 0:
+        return f"must not be negative, got {value}"
+    return None
+
+def _check_rating(value: Any) -> Optional[str]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return f"expected a number, got {_type_name(value)}"
+    if not 0 <= value <= 5:
+        return f"must be between 0 and 5, got {value}"
+    return None
+
+def _check_patch_file(value: Any) -> Optional[str]:
+    if not isinstance(value, str):
+        return f"expected a path, got {_type_name(value)}"
+    if not _PATCH_FILE_RE.match(value):
+        return f"expected ../patches/<baserom>/<name>.(ips|bps|ups|xdelta), got {value!r}"
+    return None
+
+def _enum_check(options: tuple[str, ...]) -> Check:
+    allowed = frozenset(options)
+    allow_bool = set(YES_NO) <= allowed
+    listing = ', '.join(options)
+
+    def check(value: Any) -> Optional[str]:
+        if isinstance(value, str) and value in allowed:
+            return None
+        if allow_bool and isinstance(value, bool):
+            return None
+        return f"expected one of {listing}, got {value!r}"
+    return check
+
+def _lookup_check(table: dict[str, str], what: str) -> Check:
+    def check(value: Any) -> Optional[str]:
+        if not isinstance(value, str):
+            return f"expected a {what} name, got {_type_name(value)}"
+        if value not in table:
+            return f"unknown {what} {value!r}"
+        return None
+    return check
+
+_SIMPLE_CHECKS: dict[str, Check] = {
+    'text': _check_text,
+    'version': _check_version,
+    'list': _check_list,
+    'yes-no': _check_yes_no,
+    'text-or-bool': _check_text_or_bool,
+    'date': _check_date,
+    'url': _check_url,
+    'count': _check_count,
+    'rating': _check_rating,
+    'patch-file': _check_patch_file,
+}
+
+def compile_field(field: Field, config: ConfigIndex) -> Check:
+    """Build the checker function for one field."""
+    if field.kind == 'enum':
+        return _enum_check(field.options)
+    if field.kind == 'base-rom':
+        return _lookup_check(config.baserom_by_name, 'base ROM')
+    if field.kind == 'system':
+        return _lookup_check(config.system_by_name, 'system')
+    try:
+        return _SIMPLE_CHECKS[field.kind]
+    except KeyError:
+        raise ValueError(f"Unknown field kind: {field.kind}") from None
+
+def compile_schema(config: ConfigIndex, schema: dict[str, Field] = SCHEMA) -> Callable[[Any], list[str]]:
+    """Compile a schema into a function returning every error in a frontmatter dict.
+
+    Besides per-field checks, the system must be the one config/base-roms.json
+    lists for the base ROM.
+
+    Args:
+        config: Indexed config (see config_loader.get_config)
+        schema: Field name -> Field
+
+    Returns:
+        validate(metadata) -> list of "field: message" strings (empty if valid)
+    """
+    checks = tuple((name, compile_field(field, config)) for name, field in schema.items())
+    required = tuple(name for name, field in schema.items() if field.required)
+    baserom_by_name = config.baserom_by_name
+    system_by_name = config.system_by_name
+    base_roms = config.base_roms
+
+    def validate(metadata: Any) -> list[str]:
+        if not isinstance(metadata, dict):
+            return [f"frontmatter must be a mapping, got {_type_name(metadata)}"]
+        errors = [f"{name}: required field is missing" for name in required if metadata.get(name) is None]
+        for name, check in checks:
+            value = metadata.get(name)
+            if value is None:
+                continue
+            message = check(value)
+            if message is not None:
+                errors.append(f"{name}: {message}")
+
+        base_rom, system_name = metadata.get('baseRom'), metadata.get('system')
+        if isinstance(base_rom, str) and isinstance(system_name, str):
+            rom_key = baserom_by_name.get(base_rom)
+            system = system_by_name.get(system_name)
+        else:
+            rom_key = system = None
+        if rom_key is not None and system is not None:
+            expected = base_roms[rom_key].get('system')
+            if expected and expected != system:
+                errors.append(f"system: {base_rom} is a {expected} ROM, not {system}")
+        return errors
+
+    return validate
@@ -0,0 +1,26 @@
+"""Newline-delimited JSON output for streaming script results.
+
+Each record is one JSON object on its own line with a "type" field,
+written and flushed as soon as it is known, so CI annotators can consume
+results while a run is still going. A run ends with one "summary" record.
+"""
+import json
+import sys
+from typing import Any, Optional, TextIO
+
+class NdjsonWriter:
+    """Writes records to a stream, counting them by type."""
+
+    def __init__(self, out: Optional[TextIO] = None):
+        self.out = out if out is not None else sys.stdout
+        self.counts: dict[str, int] = {}
+
+    def emit(self, record_type: str, **fields: Any) -> None:
+        """Write one {"type": record_type, **fields} line and flush it."""
+        self.counts[record_type] = self.counts.get(record_type, 0) + 1
+        self.out.write(json.dumps({'type': record_type, **fields}, ensure_ascii=False) + '\n')
+        self.out.flush()
+
+    def summary(self, **fields: Any) -> None:
+        """Write the closing summary record, including the per-type counts so far."""
+        self.emit('summary', records=dict(self.counts), **fields)
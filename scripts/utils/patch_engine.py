@@ -0,0 +1,455 @@
+"""Streaming IPS/UPS/BPS patch engine.
+
+Patches are read incrementally, the source ROM is memory-mapped read-only
+and the target is written through a memory-mapped output file, so memory
+use stays bounded by CHUNK_SIZE regardless of ROM size.
+"""
+import mmap
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Iterator, NamedTuple, Optional
+
+CHUNK_SIZE = 1 << 20
+
+IPS_MAGIC = b'PATCH'
+IPS_EOF = 0x454F46
+UPS_MAGIC = b'UPS1'
+BPS_MAGIC = b'BPS1'
+FOOTER_SIZE = 12
+
+class PatchError(ValueError):
+    """Raised for malformed patches, unsupported formats and checksum mismatches."""
+
+class PatchResult(NamedTuple):
+    """Summary of an applied patch."""
+    format: str
+    source_size: int
+    target_size: int
+    target_crc32: int
+
+class _PatchReader:
+    """Buffered forward reader over a patch file with a hard end offset."""
+
+    def __init__(self, f: BinaryIO, start: int, end: int):
+        self._f = f
+        self._f.seek(start)
+        self.pos = start
+        self.end = end
+        self._buf = b''
+        self._buf_pos = 0
+
+    def _fill(self) -> None:
+        remaining = self.end - self.pos - (len(self._buf) - self._buf_pos)
+        if remaining <= 0:
+            raise PatchError("Unexpected end of patch data")
+        chunk = self._f.read(min(CHUNK_SIZE, remaining))
+        if not chunk:
+            raise PatchError("Unexpected end of patch file")
+        self._buf = self._buf[self._buf_pos:] + chunk
+        self._buf_pos = 0
+
+    def at_end(self) -> bool:
+        return self.pos >= self.end
+
+    def read(self, size: int) -> bytes:
+        while len(self._buf) - self._buf_pos < size:
+            self._fill()
+        data = self._buf[self._buf_pos:self._buf_pos + size]
+        self._buf_pos += size
+        self.pos += size
+        return data
+
+    def read_chunks(self, size: int) -> Iterator[bytes]:
+        """Yield size bytes as a sequence of bounded chunks."""
+        while size > 0:
+            if self._buf_pos >= len(self._buf):
+                self._fill()
+            take = min(size, len(self._buf) - self._buf_pos)
+            yield self.read(take)
+            size -= take
+
+    def read_byte(self) -> int:
+        if self._buf_pos >= len(self._buf):
+            self._fill()
+        value = self._buf[self._buf_pos]
+        self._buf_pos += 1
+        self.pos += 1
+        return value
+
+    def read_until_zero(self) -> Iterator[bytes]:
+        """Yield bytes up to (not including) the next 0x00, consuming it."""
+        while True:
+            if self._buf_pos >= len(self._buf):
+                self._fill()
+            stop = self._buf.find(b'\x00', self._buf_pos)
+            if stop == -1:
+                chunk = self._buf[self._buf_pos:]
+                self.pos += len(chunk)
+                self._buf_pos = len(self._buf)
+                yield chunk
+                continue
+            chunk = self._buf[self._buf_pos:stop]
+            self.pos += len(chunk) + 1
+            self._buf_pos = stop + 1
+            if chunk:
+                yield chunk
+            return
+
+    def read_varint(self) -> int:
+        """Decode a UPS/BPS variable-length integer."""
+        value = 0
+        shift = 1
+        while True:
+            byte = self.read_byte()
+            value += (byte & 0x7F) * shift
+            if byte & 0x80:
+                return value
+            shift <<= 7
+            value += shift
+
+def _xor(a: bytes, b: bytes) -> bytes:
+    size = len(a)
+    return (int.from_bytes(a, 'little') ^ int.from_bytes(b, 'little')).to_bytes(size, 'little')
+
+def crc32_buffer(buffer, length: Optional[int] = None) -> int:
+    """CRC32 of a bytes-like object or mmap, computed in bounded slices."""
+    view = memoryview(buffer)
+    length = len(view) if length is None else length
+    crc = 0
+    for offset in range(0, length, CHUNK_SIZE):
+        crc = zlib.crc32(view[offset:min(offset + CHUNK_SIZE, length)], crc)
+    view.release()
+    return crc
+
+def crc32_file(path: Path, length: Optional[int] = None) -> int:
+    """CRC32 of the first length bytes of a file (whole file by default)."""
+    crc = 0
+    remaining = os.path.getsize(path) if length is None else length
+    with open(path, 'rb') as f:
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            crc = zlib.crc32(chunk, crc)
+            remaining -= len(chunk)
+    return crc
+
+def detect_format(patch_path: Path) -> str:
+    """Detect patch format from its magic bytes.
+
+    Returns:
+        "ips", "ups" or "bps"
+
+    Raises:
+        PatchError: If the format is not supported
+    """
+    with open(patch_path, 'rb') as f:
+        magic = f.read(5)
+    if magic.startswith(IPS_MAGIC):
+        return 'ips'
+    if magic.startswith(UPS_MAGIC):
+        return 'ups'
+    if magic.startswith(BPS_MAGIC):
+        return 'bps'
+    if magic.startswith(b'\xd6\xc3\xc4'):
+        raise PatchError("xdelta (VCDIFF) patches are not supported by the Python engine")
+    raise PatchError(f"Unknown patch format: {patch_path}")
+
+class _Source:
+    """Read-only memory map of the source ROM (empty files are allowed)."""
+
+    def __init__(self, path: Path):
+        self._f = open(path, 'rb')
+        self.size = os.fstat(self._f.fileno()).st_size
+        self.data = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b''
+
+    def close(self) -> None:
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self._f.close()
+
+class _Target:
+    """Writable memory map over a pre-sized output file."""
+
+    def __init__(self, path: Path, size: int):
+        self.path = path
+        self.size = size
+        self._f = open(path, 'w+b')
+        self._f.truncate(size)
+        self.data = mmap.mmap(self._f.fileno(), size) if size else bytearray()
+
+    def copy_from(self, source: _Source, length: int) -> None:
+        """Copy the first length bytes of source in bounded chunks."""
+        for offset in range(0, length, CHUNK_SIZE):
+            end = min(offset + CHUNK_SIZE, length)
+            self.data[offset:end] = source.data[offset:end]
+
+    def close(self) -> None:
+        if isinstance(self.data, mmap.mmap):
+            self.data.flush()
+            self.data.close()
+        self._f.close()
+
+    def discard(self) -> None:
+        """Close and delete a partially written target."""
+        self.close()
+        os.unlink(self.path)
+
+def _check_range(offset: int, length: int, size: int, what: str) -> None:
+    if offset < 0 or offset + length > size:
+        raise PatchError(f"{what} out of bounds at offset {offset:#x}")
+
+def _scan_ips(f: BinaryIO, patch_size: int) -> tuple[int, Optional[int]]:
+    """First IPS pass: find the highest written offset and optional truncation."""
+    reader = _PatchReader(f, len(IPS_MAGIC), patch_size)
+    max_end = 0
+    while True:
+        if reader.at_end():
+            raise PatchError("IPS patch is missing its EOF marker")
+        offset = int.from_bytes(reader.read(3), 'big')
+        if offset == IPS_EOF:
+            break
+        size = int.from_bytes(reader.read(2), 'big')
+        if size == 0:
+            size = int.from_bytes(reader.read(2), 'big')
+            reader.read(1)
+        else:
+            for _ in reader.read_chunks(size):
+                pass
+        max_end = max(max_end, offset + size)
+
+    truncate = None
+    if patch_size - reader.pos >= 3:
+        truncate = int.from_bytes(reader.read(3), 'big')
+    return max_end, truncate
+
+def _apply_ips(source: _Source, patch_path: Path, output_path: Path) -> PatchResult:
+    patch_size = os.path.getsize(patch_path)
+    with open(patch_path, 'rb') as f:
+        max_end, truncate = _scan_ips(f, patch_size)
+        target_size = truncate if truncate is not None else max(source.size, max_end)
+
+        target = _Target(output_path, target_size)
+        try:
+            target.copy_from(source, min(source.size, target_size))
+
+            reader = _PatchReader(f, len(IPS_MAGIC), patch_size)
+            while True:
+                offset = int.from_bytes(reader.read(3), 'big')
+                if offset == IPS_EOF:
+                    break
+                size = int.from_bytes(reader.read(2), 'big')
+                if size == 0:
+                    size = int.from_bytes(reader.read(2), 'big')
+                    value = reader.read(1)
+                    end = min(offset + size, target_size)
+                    for start in range(offset, end, CHUNK_SIZE):
+                        stop = min(start + CHUNK_SIZE, end)
+                        target.data[start:stop] = value * (stop - start)
+                else:
+                    position = offset
+                    for chunk in reader.read_chunks(size):
+                        # Records past a truncation point are dropped
+                        stop = min(position + len(chunk), target_size)
+                        if stop > position:
+                            target.data[position:stop] = chunk[:stop - position]
+                        position += len(chunk)
+            target_crc = crc32_buffer(target.data, target_size)
+        except BaseException:
+            target.discard()
+            raise
+        target.close()
+
+    return PatchResult('ips', source.size, target_size, target_crc)
+
+def _read_footer(f: BinaryIO, patch_size: int) -> tuple[int, int, int]:
+    f.seek(patch_size - FOOTER_SIZE)
+    return struct.unpack('<III', f.read(FOOTER_SIZE))
+
+def _verify_header(source: _Source, patch_path: Path, f: BinaryIO, patch_size: int,
+                   expected_source_size: int, verify: bool) -> tuple[int, int]:
+    """Check source size and source/patch CRC32 before any output is written."""
+    if patch_size < FOOTER_SIZE:
+        raise PatchError("Patch is too short to contain a checksum footer")
+    source_crc, target_crc, patch_crc = _read_footer(f, patch_size)
+    if verify:
+        actual_patch_crc = crc32_file(patch_path, patch_size - 4)
+        if actual_patch_crc != patch_crc:
+            raise PatchError(f"Patch CRC32 mismatch: expected {patch_crc:08X}, got {actual_patch_crc:08X}")
+        if source.size != expected_source_size:
+            raise PatchError(f"Source size mismatch: expected {expected_source_size}, got {source.size}")
+        actual_source_crc = crc32_buffer(source.data)
+        if actual_source_crc != source_crc:
+            raise PatchError(f"Source CRC32 mismatch: expected {source_crc:08X}, got {actual_source_crc:08X}")
+    return source_crc, target_crc
+
+def _apply_ups(source: _Source, patch_path: Path, output_path: Path, verify: bool) -> PatchResult:
+    patch_size = os.path.getsize(patch_path)
+    with open(patch_path, 'rb') as f:
+        reader = _PatchReader(f, len(UPS_MAGIC), patch_size - FOOTER_SIZE)
+        source_size = reader.read_varint()
+        target_size = reader.read_varint()
+        header_end = reader.pos
+        _, expected_target_crc = _verify_header(source, patch_path, f, patch_size, source_size, verify)
+
+        target = _Target(output_path, target_size)
+        try:
+            target.copy_from(source, min(source.size, target_size))
+
+            reader = _PatchReader(f, header_end, patch_size - FOOTER_SIZE)
+            position = 0
+            while not reader.at_end():
+                position += reader.read_varint()
+                for chunk in reader.read_until_zero():
+                    # Shrinking patches XOR bytes past the target end; like
+                    # the reference tools, those are read and dropped
+                    stop = min(position + len(chunk), target_size)
+                    if stop > position:
+                        target.data[position:stop] = _xor(target.data[position:stop], chunk[:stop - position])
+                    position += len(chunk)
+                # The terminating zero byte covers one unchanged position
+                position += 1
+            target_crc = crc32_buffer(target.data, target_size)
+        except BaseException:
+            target.discard()
+            raise
+        target.close()
+
+    if verify and target_crc != expected_target_crc:
+        raise PatchError(f"Target CRC32 mismatch: expected {expected_target_crc:08X}, got {target_crc:08X}")
+    return PatchResult('ups', source.size, target_size, target_crc)
+
+def _copy_overlapping(data, src: int, dst: int, length: int) -> None:
+    """Copy data[src:src+length] to dst with byte-by-byte semantics (src < dst).
+
+    BPS TargetCopy may read bytes it has just written (run-length style).
+    The output is then periodic in dst - src, so after the first period
+    each step copies from an already written whole number of periods,
+    doubling the step size up to CHUNK_SIZE.
+    """
+    distance = dst - src
+    first = min(distance, length)
+    for offset in range(0, first, CHUNK_SIZE):
+        size = min(CHUNK_SIZE, first - offset)
+        data[dst + offset:dst + offset + size] = data[src + offset:src + offset + size]
+
+    written = first
+    while written < length:
+        period = (written // distance) * distance
+        size = min(period, length - written, CHUNK_SIZE)
+        start = dst + written
+        data[start:start + size] = data[start - period:start - period + size]
+        written += size
+
+def _apply_bps(source: _Source, patch_path: Path, output_path: Path, verify: bool) -> PatchResult:
+    patch_size = os.path.getsize(patch_path)
+    with open(patch_path, 'rb') as f:
+        reader = _PatchReader(f, len(BPS_MAGIC), patch_size - FOOTER_SIZE)
+        source_size = reader.read_varint()
+        target_size = reader.read_varint()
+        metadata_size = reader.read_varint()
+        for _ in reader.read_chunks(metadata_size):
+            pass
+        actions_start = reader.pos
+        _, expected_target_crc = _verify_header(source, patch_path, f, patch_size, source_size, verify)
+
+        target = _Target(output_path, target_size)
+        try:
+            reader = _PatchReader(f, actions_start, patch_size - FOOTER_SIZE)
+            output_offset = 0
+            source_relative = 0
+            target_relative = 0
+            while not reader.at_end():
+                data = reader.read_varint()
+                command = data & 3
+                length = (data >> 2) + 1
+                _check_range(output_offset, length, target_size, "BPS action")
+
+                if command == 0:  # SourceRead
+                    _check_range(output_offset, length, source.size, "BPS SourceRead")
+                    for offset in range(0, length, CHUNK_SIZE):
+                        start = output_offset + offset
+                        stop = start + min(CHUNK_SIZE, length - offset)
+                        target.data[start:stop] = source.data[start:stop]
+                elif command == 1:  # TargetRead
+                    position = output_offset
+                    for chunk in reader.read_chunks(length):
+                        target.data[position:position + len(chunk)] = chunk
+                        position += len(chunk)
+                elif command == 2:  # SourceCopy
+                    delta = reader.read_varint()
+                    source_relative += -(delta >> 1) if delta & 1 else delta >> 1
+                    _check_range(source_relative, length, source.size, "BPS SourceCopy")
+                    for offset in range(0, length, CHUNK_SIZE):
+                        size = min(CHUNK_SIZE, length - offset)
+                        start = output_offset + offset
+                        target.data[start:start + size] = source.data[source_relative + offset:source_relative + offset + size]
+                    source_relative += length
+                else:  # TargetCopy
+                    delta = reader.read_varint()
+                    target_relative += -(delta >> 1) if delta & 1 else delta >> 1
+                    if target_relative < 0 or target_relative >= output_offset:
+                        raise PatchError(f"BPS TargetCopy out of bounds at offset {output_offset:#x}")
+                    _copy_overlapping(target.data, target_relative, output_offset, length)
+                    target_relative += length
+                output_offset += length
+            target_crc = crc32_buffer(target.data, target_size)
+        except BaseException:
+            target.discard()
+            raise
+        target.close()
+
+    if verify and target_crc != expected_target_crc:
+        raise PatchError(f"Target CRC32 mismatch: expected {expected_target_crc:08X}, got {target_crc:08X}")
+    return PatchResult('bps', source.size, target_size, target_crc)
+
+def _same_file(a: Path, b: Path) -> bool:
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return a.resolve() == b.resolve()
+
+def apply_patch(rom_path: Path, patch_path: Path, output_path: Path, verify: bool = True) -> PatchResult:
+    """Apply an IPS, UPS or BPS patch to a ROM.
+
+    The target is written to a temporary file next to output_path and
+    moved into place only once it is complete and verified, so a failed
+    run leaves any existing output untouched.
+
+    Args:
+        rom_path: Path to the unmodified source ROM
+        patch_path: Path to the patch file
+        output_path: Path to write the patched ROM to
+        verify: Check embedded source, target and patch CRC32 (UPS/BPS)
+
+    Returns:
+        PatchResult describing the written target
+
+    Raises:
+        PatchError: If the patch is malformed, unsupported or fails
+            verification, or if output_path is the ROM or the patch
+    """
+    output_path = Path(output_path)
+    for path, what in ((rom_path, 'ROM'), (patch_path, 'patch')):
+        if _same_file(output_path, Path(path)):
+            raise PatchError(f"Output {output_path} is the {what} file; choose another output path")
+
+    patch_format = detect_format(patch_path)
+    tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+    source = _Source(rom_path)
+    try:
+        if patch_format == 'ips':
+            result = _apply_ips(source, patch_path, tmp_path)
+        elif patch_format == 'ups':
+            result = _apply_ups(source, patch_path, tmp_path, verify)
+        else:
+            result = _apply_bps(source, patch_path, tmp_path, verify)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    finally:
+        source.close()
+    return result
@@ -0,0 +1,256 @@
+"""Header/footer inspection for IPS, UPS, BPS and xdelta patches.
+
+Only the structural parts of a patch are read: IPS record headers are
+walked by seeking over their payloads, UPS/BPS read the leading size
+varints and the 12-byte CRC32 footer, and xdelta walks VCDIFF window
+headers. Patch payloads are never loaded.
+"""
+import os
+import re
+import struct
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from .config_loader import get_config
+from .patch_engine import BPS_MAGIC, FOOTER_SIZE, IPS_EOF, IPS_MAGIC, UPS_MAGIC
+
+VCDIFF_MAGIC = b'\xd6\xc3\xc4'
+
+# VCDIFF header/window indicator bits (RFC 3284, plus xdelta3's VCD_ADLER32)
+VCD_DECOMPRESS = 0x01
+VCD_CODETABLE = 0x02
+VCD_APPHEADER = 0x04
+VCD_SOURCE = 0x01
+VCD_TARGET = 0x02
+VCD_ADLER32 = 0x04
+
+SECONDARY_COMPRESSORS = {1: 'djw', 2: 'lzma', 16: 'fgk'}
+
+_FILENAME_CRC_RE = re.compile(r'_[A-Z0-9]+-([A-Z0-9]{4})_')
+
+class _Truncated(Exception):
+    """Internal signal that a structure ran past the end of the file."""
+
+def _read_exact(f: BinaryIO, size: int) -> bytes:
+    data = f.read(size)
+    if len(data) != size:
+        raise _Truncated()
+    return data
+
+def _read_varint(f: BinaryIO) -> int:
+    """Decode a UPS/BPS variable-length integer."""
+    value = 0
+    shift = 1
+    while True:
+        byte = _read_exact(f, 1)[0]
+        value += (byte & 0x7F) * shift
+        if byte & 0x80:
+            return value
+        shift <<= 7
+        value += shift
+
+def _read_vcdiff_int(f: BinaryIO) -> int:
+    """Decode a VCDIFF (RFC 3284) big-endian base-128 integer."""
+    value = 0
+    for _ in range(10):
+        byte = _read_exact(f, 1)[0]
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            return value
+    raise ValueError("VCDIFF integer too long")
+
+def _crc_hex(value: int) -> str:
+    return f"{value:08X}"
+
+def _inspect_ips(f: BinaryIO, size: int, info: dict) -> None:
+    f.seek(len(IPS_MAGIC))
+    records = 0
+    max_end = 0
+    while True:
+        header = f.read(3)
+        if len(header) < 3:
+            info['errors'].append("Missing EOF marker (truncated IPS)")
+            break
+        offset = int.from_bytes(header, 'big')
+        if offset == IPS_EOF:
+            break
+        length = int.from_bytes(_read_exact(f, 2), 'big')
+        if length == 0:
+            length = int.from_bytes(_read_exact(f, 2), 'big')
+            _read_exact(f, 1)
+        else:
+            if f.tell() + length > size:
+                raise _Truncated()
+            f.seek(length, os.SEEK_CUR)
+        records += 1
+        max_end = max(max_end, offset + length)
+
+    info['records'] = records
+    info['targetMinSize'] = max_end
+    remaining = size - f.tell()
+    if remaining >= 3:
+        info['truncate'] = int.from_bytes(_read_exact(f, 3), 'big')
+    elif remaining > 0:
+        info['errors'].append(f"{remaining} trailing bytes after EOF marker")
+
+def _inspect_checksummed(f: BinaryIO, size: int, info: dict, has_metadata: bool) -> None:
+    if size < 4 + FOOTER_SIZE:
+        raise _Truncated()
+    f.seek(4)
+    info['sourceSize'] = _read_varint(f)
+    info['targetSize'] = _read_varint(f)
+    if has_metadata:
+        info['metadataSize'] = _read_varint(f)
+    if f.tell() > size - FOOTER_SIZE:
+        raise _Truncated()
+
+    f.seek(size - FOOTER_SIZE)
+    source_crc, target_crc, patch_crc = struct.unpack('<III', _read_exact(f, FOOTER_SIZE))
+    info['sourceCrc32'] = _crc_hex(source_crc)
+    info['targetCrc32'] = _crc_hex(target_crc)
+    info['patchCrc32'] = _crc_hex(patch_crc)
+
+def _inspect_xdelta(f: BinaryIO, size: int, info: dict) -> None:
+    f.seek(3)
+    info['vcdiffVersion'] = _read_exact(f, 1)[0]
+    indicator = _read_exact(f, 1)[0]
+
+    secondary = None
+    if indicator & VCD_DECOMPRESS:
+        compressor_id = _read_exact(f, 1)[0]
+        secondary = SECONDARY_COMPRESSORS.get(compressor_id, f"unknown ({compressor_id})")
+    info['secondaryCompressor'] = secondary
+    info['customCodeTable'] = bool(indicator & VCD_CODETABLE)
+    if indicator & VCD_CODETABLE:
+        f.seek(_read_vcdiff_int(f), os.SEEK_CUR)
+    if indicator & VCD_APPHEADER:
+        app_header = _read_exact(f, _read_vcdiff_int(f))
+        # xdelta3 stores "target/target-comp/source/source-comp"
+        parts = app_header.decode('utf-8', 'replace').split('/')
+        if len(parts) == 4:
+            info['sourceName'] = parts[2]
+
+    windows = 0
+    target_size = 0
+    source_span = 0
+    while f.tell() < size:
+        window_indicator = _read_exact(f, 1)[0]
+        if window_indicator & (VCD_SOURCE | VCD_TARGET):
+            segment_size = _read_vcdiff_int(f)
+            segment_position = _read_vcdiff_int(f)
+            if window_indicator & VCD_SOURCE:
+                source_span = max(source_span, segment_position + segment_size)
+        delta_length = _read_vcdiff_int(f)
+        delta_start = f.tell()
+        target_size += _read_vcdiff_int(f)
+        windows += 1
+        if delta_start + delta_length > size:
+            raise _Truncated()
+        f.seek(delta_start + delta_length)
+
+    info['windows'] = windows
+    info['targetSize'] = target_size
+    info['sourceMinSize'] = source_span
+
+def inspect_patch(patch_path: Path) -> dict:
+    """Read structural facts from a patch without loading its payload.
+
+    Args:
+        patch_path: Path to patch file
+
+    Returns:
+        Dictionary with 'format', 'size', format-specific fields and an
+        'errors' list (empty when the structure is intact)
+    """
+    size = os.path.getsize(patch_path)
+    info = {'format': None, 'size': size, 'errors': []}
+
+    with open(patch_path, 'rb') as f:
+        magic = f.read(5)
+        try:
+            if magic.startswith(IPS_MAGIC):
+                info['format'] = 'ips'
+                _inspect_ips(f, size, info)
+            elif magic.startswith(UPS_MAGIC):
+                info['format'] = 'ups'
+                _inspect_checksummed(f, size, info, has_metadata=False)
+            elif magic.startswith(BPS_MAGIC):
+                info['format'] = 'bps'
+                _inspect_checksummed(f, size, info, has_metadata=True)
+            elif magic.startswith(VCDIFF_MAGIC):
+                info['format'] = 'xdelta'
+                _inspect_xdelta(f, size, info)
+            else:
+                info['errors'].append("Unrecognized patch header")
+        except _Truncated:
+            info['errors'].append("Patch is truncated")
+        except ValueError as e:
+            info['errors'].append(str(e))
+
+    return info
+
+def read_source_crc32(patch_path: Path) -> Optional[str]:
+    """Read the embedded source CRC32 of a UPS/BPS patch from its footer.
+
+    Returns:
+        Upper-case hex CRC32, or None for other formats or short files
+    """
+    with open(patch_path, 'rb') as f:
+        magic = f.read(4)
+        if magic not in (UPS_MAGIC, BPS_MAGIC):
+            return None
+        f.seek(0, os.SEEK_END)
+        if f.tell() < 4 + FOOTER_SIZE:
+            return None
+        f.seek(-FOOTER_SIZE, os.SEEK_END)
+        return _crc_hex(struct.unpack('<I', f.read(4))[0])
+
+def filename_crc(patch_path: Path) -> Optional[str]:
+    """Extract the base ROM CRC code from a standardized patch filename."""
+    match = _FILENAME_CRC_RE.search(Path(patch_path).name)
+    return match.group(1) if match else None
+
+def cross_check(info: dict, baserom_name: str, crc_code: Optional[str] = None) -> None:
+    """Check patch facts against the base ROM's configured variants.
+
+    Adds 'baseRomVariant' when the patch's source identifies a variant,
+    and appends to info['errors'] when it cannot belong to the base ROM.
+    Size and CRC32 checks use variants with an entry in the ROM
+    fingerprint index (config/rom-fingerprints.json).
+
+    Args:
+        info: Result of inspect_patch, updated in place
+        baserom_name: Base ROM name from metadata (e.g., "Emerald")
+        crc_code: Optional 4-digit variant code from the patch filename
+    """
+    config = get_config()
+    rom_key = config.find_baserom(baserom_name)
+    if rom_key is None:
+        info['errors'].append(f"Unknown base ROM: {baserom_name}")
+        return
+
+    variants = config.base_roms[rom_key].get('variants', [])
+    if crc_code and variants and crc_code not in {v['crc'] for v in variants}:
+        info['errors'].append(f"CRC code {crc_code} is not a {rom_key} variant")
+
+    source_crc = info.get('sourceCrc32')
+    source_size = info.get('sourceSize')
+    fingerprinted = [
+        (v['crc'], config.fingerprints[v['crc']]) for v in variants if v['crc'] in config.fingerprints
+    ]
+    if not fingerprinted or (source_crc is None and source_size is None):
+        return
+
+    for variant_crc, fingerprint in fingerprinted:
+        if source_crc is not None and fingerprint.get('crc32'):
+            if fingerprint['crc32'].upper() == source_crc:
+                info['baseRomVariant'] = variant_crc
+                return
+        elif source_size is not None and fingerprint.get('size') == source_size:
+            info['baseRomVariant'] = variant_crc
+            return
+
+    if source_crc is not None:
+        info['errors'].append(f"Source CRC32 {source_crc} matches no known {rom_key} variant")
+    else:
+        info['errors'].append(f"Source size {source_size} matches no known {rom_key} variant")
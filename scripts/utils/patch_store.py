@@ -0,0 +1,220 @@
+"""Content-addressed index of the files under patches/.
+
+Every patch is keyed by the SHA-256 of its bytes, so finding the files
+that share a digest (duplicates) is a dictionary lookup. Files are hashed
+in fixed-size chunks across a process pool, and a digest is reused from
+the cache while the file's mtime and size are unchanged.
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from .parallel import map_ordered
+from .profiling import stage
+from .repo_index import _walk
+
+# Bump when the cache layout changes so stale caches are dropped
+CACHE_VERSION = 1
+DEFAULT_CACHE = Path('.cache') / 'patch-store.json'
+CHUNK_SIZE = 1 << 20
+
+# Hashing is far costlier per file than metadata parsing, so a pool pays
+# off sooner than parallel.MIN_PARALLEL_ITEMS
+MIN_PARALLEL_FILES = 8
+
+def file_digest(path: Path, chunk_size: int = CHUNK_SIZE) -> str:
+    """SHA-256 of a file, read in chunks into one reused buffer.
+
+    Args:
+        path: File to hash
+        chunk_size: Bytes read per call
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            size = f.readinto(buffer)
+            if not size:
+                break
+            digest.update(view[:size])
+    return digest.hexdigest()
+
+def _hash_task(path: str) -> Optional[str]:
+    try:
+        return file_digest(Path(path))
+    except OSError:
+        return None
+
+class StoredFile(NamedTuple):
+    """One file in the store."""
+    path: str      # POSIX path relative to patches/
+    sha256: str
+    size: int
+
+class DuplicateGroup(NamedTuple):
+    """Files with identical contents, sorted by path."""
+    sha256: str
+    size: int
+    paths: list[str]
+
+    @property
+    def wasted(self) -> int:
+        """Bytes held by every copy after the first."""
+        return self.size * (len(self.paths) - 1)
+
+class PatchStore:
+    """Digest index of a patches directory.
+
+    Build it with build_patch_store(); lookups by path or digest are
+    dictionary hits.
+    """
+
+    def __init__(self, patches_dir: Path, files: list[StoredFile]):
+        self.patches_dir = Path(patches_dir)
+        self._files: dict[str, StoredFile] = {}
+        self._by_digest: dict[str, list[str]] = {}
+        for stored in sorted(files):
+            self._files[stored.path] = stored
+            self._by_digest.setdefault(stored.sha256, []).append(stored.path)
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def get(self, rel_path: str) -> Optional[StoredFile]:
+        """Look up a file by its patches-relative path."""
+        return self._files.get(rel_path)
+
+    def digest_of(self, path: Path) -> Optional[str]:
+        """Digest of a file, from the index when it is under patches/."""
+        try:
+            stored = self._files.get(Path(path).relative_to(self.patches_dir).as_posix())
+        except ValueError:
+            stored = None
+        if stored is not None:
+            return stored.sha256
+        try:
+            return file_digest(path)
+        except OSError:
+            return None
+
+    def paths_with(self, sha256: str) -> list[str]:
+        """Patches-relative paths of every file with the given digest."""
+        return list(self._by_digest.get(sha256, ()))
+
+    def duplicates_of(self, path: Path) -> list[str]:
+        """Other files in the store with the same contents as path."""
+        sha256 = self.digest_of(path)
+        if sha256 is None:
+            return []
+        try:
+            own = Path(path).relative_to(self.patches_dir).as_posix()
+        except ValueError:
+            own = None
+        return [rel for rel in self._by_digest.get(sha256, ()) if rel != own]
+
+    def identical(self, a: Path, b: Path) -> bool:
+        """Whether two files have the same contents."""
+        if Path(a).stat().st_size != Path(b).stat().st_size:
+            return False
+        sha_a = self.digest_of(a)
+        return sha_a is not None and sha_a == self.digest_of(b)
+
+    def duplicate_groups(self) -> list[DuplicateGroup]:
+        """Every set of two or more identical files, largest savings first."""
+        groups = [
+            DuplicateGroup(sha256, self._files[paths[0]].size, list(paths))
+            for sha256, paths in self._by_digest.items() if len(paths) > 1
+        ]
+        groups.sort(key=lambda group: (-group.wasted, group.paths[0]))
+        return groups
+
+    def total_size(self) -> int:
+        """Bytes held by every file in the store."""
+        return sum(stored.size for stored in self._files.values())
+
+    def dedup_savings(self) -> int:
+        """Bytes freed if every duplicate group were stored once."""
+        return sum(group.wasted for group in self.duplicate_groups())
+
+def _load_cache(cache_path: Optional[Path]) -> dict:
+    if cache_path is None:
+        return {}
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('version') != CACHE_VERSION:
+        return {}
+    return cache.get('files', {})
+
+def build_patch_store(patches_dir: Path, cache_path: Optional[Path] = None,
+                      jobs: Optional[int] = 1,
+                      sizes: Optional[set[int]] = None) -> tuple[PatchStore, dict]:
+    """Hash every file under patches_dir, reusing cached digests.
+
+    Files of different sizes can't be identical, so passing sizes limits
+    hashing to the files that could match a file of one of those sizes.
+    Other files are indexed only when the cache already has their digest.
+
+    Args:
+        patches_dir: Directory to index
+        cache_path: Digest cache file, or None to hash every file
+        jobs: Worker processes for files that need hashing
+        sizes: Only hash uncached files with one of these sizes (default: all)
+
+    Returns:
+        Tuple of (store, stats dict with 'total', 'hashed' and 'cached' counts)
+    """
+    patches_dir = Path(patches_dir)
+    cached = _load_cache(cache_path)
+    new_cache: dict = {}
+    files: list[StoredFile] = []
+    pending: list[tuple[str, list[int]]] = []
+
+    with stage('scan'):
+        for rel_dir, entry in _walk(patches_dir):
+            rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            st = entry.stat()
+            stamp = [st.st_mtime_ns, st.st_size]
+            hit = cached.get(rel)
+            if hit is not None and hit.get('stat') == stamp:
+                new_cache[rel] = hit
+                files.append(StoredFile(rel, hit['sha256'], st.st_size))
+            elif sizes is None or st.st_size in sizes:
+                pending.append((rel, stamp))
+
+    with stage('hash'):
+        paths = [str(patches_dir / rel) for rel, _ in pending]
+        digests = map_ordered(_hash_task, paths, jobs, min_parallel=MIN_PARALLEL_FILES)
+    hashed = 0
+    for (rel, stamp), sha256 in zip(pending, digests):
+        if sha256 is None:
+            continue
+        hashed += 1
+        new_cache[rel] = {'stat': stamp, 'sha256': sha256}
+        files.append(StoredFile(rel, sha256, stamp[1]))
+
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'files': new_cache}, f)
+
+    stats = {'total': len(files), 'hashed': hashed, 'cached': len(files) - hashed}
+    return PatchStore(patches_dir, files), stats
+
+def format_bytes(size: int) -> str:
+    """Human-readable byte count (e.g., "1.3 MiB")."""
+    if size < 1024:
+        return f"{size} B"
+    value = size / 1024
+    for unit in ('KiB', 'MiB'):
+        if value < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
@@ -0,0 +1,232 @@
+"""Opt-in per-stage and per-file instrumentation for the scripts.
+
+Library code marks stages with `with stage('yaml'):`. Until a script calls
+enable_from_args() with --profile set, no profiler is active and stage()
+returns a shared no-op context, so the markers cost one function call.
+
+When active, each stage records call count, wall time and peak traced
+memory (tracemalloc) above its entry level. Items processed through
+parallel.map_ordered are also recorded per file, including when they run
+in worker processes. The report is written as JSON when the script exits,
+optionally with a cProfile dump of the main process.
+"""
+import argparse
+import atexit
+import cProfile
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+_NULL_STAGE = nullcontext()
+_active: Optional['Profiler'] = None
+
+class Profiler:
+    """Collects stage and per-file timings for one process."""
+
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.stages: dict[str, list] = {}  # name -> [calls, seconds, peak bytes]
+        self.files: list[dict] = []
+        # Open stages: [traced bytes at entry, highest traced bytes seen]
+        self._frames: list[list[int]] = []
+
+    def start(self) -> None:
+        """Open the root frame, starting tracemalloc if needed."""
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._enter()
+
+    def finish(self) -> int:
+        """Close the root frame.
+
+        Returns:
+            Highest traced memory in bytes while the profiler was open
+        """
+        frame = self._frames[0] if self._frames else [0, 0]
+        while self._frames:
+            self._exit()
+        return frame[1]
+
+    def _enter(self) -> None:
+        if not self.trace_memory:
+            self._frames.append([0, 0])
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        if self._frames:
+            self._frames[-1][1] = max(self._frames[-1][1], peak)
+        tracemalloc.reset_peak()
+        self._frames.append([current, current])
+
+    def _exit(self) -> int:
+        frame = self._frames.pop()
+        if not self.trace_memory:
+            return 0
+        _, peak = tracemalloc.get_traced_memory()
+        frame[1] = max(frame[1], peak)
+        if self._frames:
+            self._frames[-1][1] = max(self._frames[-1][1], frame[1])
+        tracemalloc.reset_peak()
+        return frame[1] - frame[0]
+
+    def checkpoint(self) -> None:
+        """Fold the current tracemalloc peak into the open stage."""
+        if self.trace_memory and self._frames:
+            self._frames[-1][1] = max(self._frames[-1][1], tracemalloc.get_traced_memory()[1])
+
+    def fold_peak(self, peak: int) -> None:
+        """Account for an absolute traced-memory peak reached by nested work."""
+        if self._frames:
+            self._frames[-1][1] = max(self._frames[-1][1], peak)
+
+    def record_stage(self, name: str, calls: int, seconds: float, peak: int) -> None:
+        entry = self.stages.setdefault(name, [0, 0.0, 0])
+        entry[0] += calls
+        entry[1] += seconds
+        entry[2] = max(entry[2], peak)
+
+    @contextmanager
+    def stage(self, name: str):
+        self._enter()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.record_stage(name, 1, seconds, self._exit())
+
+    def collect(self, stage_name: str, results: list[tuple]) -> list:
+        """Merge profiled_call results from map_ordered and unwrap them."""
+        unwrapped = []
+        for result, stages, record in results:
+            for name, (calls, seconds, peak) in stages.items():
+                self.record_stage(name, calls, seconds, peak)
+            self.record_stage(stage_name, 1, record['seconds'], record['peakBytes'])
+            record['stage'] = stage_name
+            self.files.append(record)
+            unwrapped.append(result)
+        return unwrapped
+
+def active() -> Optional[Profiler]:
+    """Get the profiler of this process, or None when profiling is off."""
+    return _active
+
+def stage(name: str):
+    """Context manager timing one stage; a no-op unless profiling is on."""
+    if _active is None:
+        return _NULL_STAGE
+    return _active.stage(name)
+
+def _label(item: Any) -> str:
+    if isinstance(item, dict):
+        return str(item.get('file', item.get('id', '')))
+    if isinstance(item, tuple) and item:
+        return str(item[0])
+    return str(item)
+
+def profiled_call(func: Callable, trace_memory: bool, item: Any) -> tuple:
+    """Run func(item) under a fresh profiler (in a worker or in-process).
+
+    Returns:
+        Tuple of (result, stage totals, per-file record) for Profiler.collect
+    """
+    global _active
+    outer = _active
+    if outer is not None:
+        outer.checkpoint()
+
+    local = Profiler(trace_memory)
+    local.start()
+    _active = local
+    try:
+        local._enter()
+        start = time.perf_counter()
+        result = func(item)
+        seconds = time.perf_counter() - start
+        peak = local._exit()
+    finally:
+        _active = outer
+        overall_peak = local.finish()
+    if outer is not None:
+        outer.fold_peak(overall_peak)
+
+    record = {'file': _label(item), 'seconds': seconds, 'peakBytes': peak}
+    return result, local.stages, record
+
+def add_profile_arguments(parser: argparse.ArgumentParser, script: str) -> None:
+    """Add --profile and --cprofile options to a script's parser."""
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const=f'{script}-profile.json',
+        metavar='REPORT',
+        help=f'Record per-stage/per-file timing and memory to a JSON report (default: {script}-profile.json)'
+    )
+    parser.add_argument(
+        '--cprofile',
+        metavar='FILE',
+        help='With --profile, also write a cProfile dump of the main process'
+    )
+
+def enable_from_args(args: argparse.Namespace, script: str) -> None:
+    """Start profiling if --profile was given; the report is written at exit."""
+    global _active
+    if not getattr(args, 'profile', None):
+        return
+
+    profiler = Profiler()
+    profiler.start()
+    _active = profiler
+    started = time.perf_counter()
+
+    cprofiler = None
+    if args.cprofile:
+        cprofiler = cProfile.Profile()
+        cprofiler.enable()
+
+    def write_report() -> None:
+        if cprofiler is not None:
+            cprofiler.disable()
+            cprofiler.dump_stats(args.cprofile)
+        wall = time.perf_counter() - started
+        peak = profiler.finish()
+        tracemalloc.stop()
+
+        report = {
+            'script': script,
+            'argv': sys.argv[1:],
+            'wallSeconds': wall,
+            'peakMemoryBytes': peak,
+            'stages': {
+                name: {'calls': calls, 'seconds': seconds, 'peakBytes': peak_bytes}
+                for name, (calls, seconds, peak_bytes) in sorted(
+                    profiler.stages.items(), key=lambda kv: kv[1][1], reverse=True
+                )
+            },
+            'files': profiler.files,
+            'cprofile': args.cprofile,
+        }
+        Path(args.profile).write_text(json.dumps(report, indent=2) + '\n')
+        print_summary(report)
+        print(f"  Report written to {args.profile}", file=sys.stderr)
+        if args.cprofile:
+            print(f"  cProfile dump written to {args.cprofile}", file=sys.stderr)
+
+    atexit.register(write_report)
+
+def print_summary(report: dict, top: int = 5) -> None:
+    """Print a short stage table and the slowest files to stderr."""
+    out = sys.stderr
+    print(f"\n📊 Profile: {report['wallSeconds']:.3f}s wall, "
+          f"{report['peakMemoryBytes'] / 1024 / 1024:.1f} MiB peak traced", file=out)
+    for name, data in report['stages'].items():
+        print(f"  {name:24s} {data['calls']:>8d} calls {data['seconds']:10.3f}s "
+              f"{data['peakBytes'] / 1024:10.1f} KiB peak", file=out)
+    slowest = sorted(report['files'], key=lambda r: r['seconds'], reverse=True)[:top]
+    if slowest:
+        print("  Slowest files:", file=out)
+        for record in slowest:
+            print(f"    {record['seconds'] * 1000:8.2f} ms  {record['file']}", file=out)
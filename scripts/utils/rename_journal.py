@@ -0,0 +1,296 @@
+"""Journaled, resumable batch renames.
+
+A batch is planned into steps (backups, metadata rewrites, moves), the
+steps are written to a journal, and only then is anything touched. Each
+completed step is appended to a progress log, so an interrupted run can be
+finished (resume) or undone (rollback) from the journal alone.
+
+Moves are ordered so no file is overwritten before it has moved away:
+chains run from their free end, and cycles (A -> B, B -> A) go through a
+temporary name. Metadata files are rewritten atomically (temp file +
+os.replace), and backups are reflinks where the filesystem supports them,
+hard links otherwise (renames never change a file's bytes), and copies
+as a last resort.
+"""
+import errno
+import json
+import os
+import shutil
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Callable, Optional
+
+DEFAULT_JOURNAL = Path('.cache') / 'rename-journal.json'
+JOURNAL_VERSION = 1
+
+# <linux/fs.h>: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+def reflink(src: Path, dst: Path) -> bool:
+    """Clone src to dst sharing its data blocks (btrfs, XFS, ...), if supported."""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(src, 'rb') as s, open(dst, 'xb') as d:
+            try:
+                fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+            except OSError:
+                d.close()
+                os.unlink(dst)
+                return False
+    except OSError:
+        return False
+    shutil.copystat(src, dst)
+    return True
+
+def clone_file(src: Path, dst: Path) -> str:
+    """Back up src at dst as cheaply as the filesystem allows.
+
+    Returns:
+        How the backup was made: "reflink", "hardlink" or "copy"
+    """
+    if reflink(src, dst):
+        return 'reflink'
+    try:
+        os.link(src, dst)
+        return 'hardlink'
+    except OSError:
+        pass
+    shutil.copy2(src, dst)
+    return 'copy'
+
+def atomic_write(path: Path, text: str) -> None:
+    """Replace path's contents with text so readers see the old or the new file, never a mix.
+
+    The temporary file has a fixed name, so a write cut short by a crash
+    leaves at most one, and repeating the write replaces it.
+    """
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.tmp")
+    try:
+        with open(tmp, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+def order_moves(moves: dict[str, str], temp_name: Callable[[str], str]) -> list[tuple[str, str]]:
+    """Order moves so each destination is free when its move runs.
+
+    Args:
+        moves: Source path -> destination path (destinations are distinct)
+        temp_name: Free temporary path for a source, used to break cycles
+
+    Returns:
+        (source, destination) pairs in execution order
+    """
+    pending = dict(moves)
+    into = {dst: src for src, dst in pending.items()}
+    ready = deque(sorted(src for src, dst in pending.items() if dst not in pending))
+    ordered = []
+    while pending:
+        while ready:
+            src = ready.popleft()
+            ordered.append((src, pending.pop(src)))
+            waiting = into.get(src)
+            if waiting in pending:
+                ready.append(waiting)
+        if pending:
+            # Only cycles are left: park one file under a temporary name
+            src = min(pending)
+            tmp = temp_name(src)
+            ordered.append((src, tmp))
+            dst = pending.pop(src)
+            pending[tmp] = dst
+            into[dst] = tmp
+            waiting = into.get(src)
+            if waiting in pending:
+                ready.append(waiting)
+    return ordered
+
+def plan_steps(renames: list[tuple[str, str, str, str]], backup_dir: Optional[Path] = None,
+               batch_id: Optional[str] = None) -> list[dict]:
+    """Turn renames into journal steps.
+
+    Args:
+        renames: (patch path, new patch path, metadata path, new metadata
+            contents) per rename; the metadata file moves next to the patch
+            under the new patch's stem
+        backup_dir: Directory to back up each patch and metadata file into
+        batch_id: Tag for temporary names (default: random)
+
+    Returns:
+        Steps in execution order: backups, metadata rewrites, then moves.
+        A move into a temporary name has 'temp': True; the move out of it
+        carries the original source as 'from'
+
+    Raises:
+        ValueError: If a destination exists and is not moved away by the batch
+    """
+    batch_id = batch_id or uuid.uuid4().hex[:8]
+    steps: list[dict] = []
+    moves: dict[str, str] = {}
+    for patch, new_patch, md, content in renames:
+        if backup_dir is not None:
+            for path in (patch, md):
+                backup_path = Path(backup_dir) / Path(path).parent.name / Path(path).name
+                steps.append({'op': 'backup', 'src': path, 'dst': str(backup_path)})
+        steps.append({'op': 'write', 'path': md, 'content': content,
+                      'previous': Path(md).read_text(encoding='utf-8')})
+        moves[patch] = new_patch
+        new_md = str(Path(md).with_name(Path(new_patch).stem + '.md'))
+        if new_md != md:
+            moves[md] = new_md
+
+    if len(set(moves.values())) != len(moves):
+        raise ValueError("Two renames share a destination")
+    for dst in moves.values():
+        if dst not in moves and os.path.lexists(dst):
+            raise ValueError(f"Destination already exists: {dst}")
+
+    parked: dict[str, str] = {}
+
+    def temp_name(src: str) -> str:
+        path = Path(src)
+        tmp = str(path.with_name(f".{path.name}.rename-{batch_id}"))
+        parked[tmp] = src
+        return tmp
+
+    for src, dst in order_moves(moves, temp_name):
+        step = {'op': 'move', 'src': src, 'dst': dst}
+        # Cycle breaking splits one rename in two; tag the halves so
+        # progress can be reported as the rename itself
+        if dst in parked:
+            step['temp'] = True
+        elif src in parked:
+            step['from'] = parked[src]
+        steps.append(step)
+    return steps
+
+class RenameJournal:
+    """A journal file plus its append-only progress log (<journal>.log)."""
+
+    def __init__(self, path: Path = DEFAULT_JOURNAL):
+        self.path = Path(path)
+        self.log_path = self.path.with_name(self.path.name + '.log')
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def create(self, steps: list[dict], info: Optional[dict] = None) -> None:
+        """Write a new journal, replacing a finished one.
+
+        Raises:
+            RuntimeError: If an unfinished journal exists
+        """
+        if self.exists() and not self.complete():
+            raise RuntimeError(f"Unfinished rename journal at {self.path}")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.log_path.unlink(missing_ok=True)
+        atomic_write(self.path, json.dumps({'version': JOURNAL_VERSION, 'info': info or {}, 'steps': steps},
+                                           ensure_ascii=False))
+
+    def load(self) -> dict:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            journal = json.load(f)
+        if journal.get('version') != JOURNAL_VERSION:
+            raise ValueError(f"Unsupported rename journal version: {journal.get('version')}")
+        return journal
+
+    def done(self) -> int:
+        """Number of steps recorded as completed."""
+        try:
+            with open(self.log_path, 'r', encoding='utf-8') as f:
+                lines = f.read().split('\n')
+        except FileNotFoundError:
+            return 0
+        # A torn last line (interrupted mid-append) is not a completed step
+        return sum(1 for line in lines[:-1] if line.isdigit())
+
+    def complete(self) -> bool:
+        return self.done() >= len(self.load()['steps'])
+
+    def run(self, on_step: Optional[Callable[[dict], None]] = None) -> int:
+        """Run the steps not yet completed (all of them for a new journal).
+
+        Args:
+            on_step: Called after each step that was carried out
+
+        Returns:
+            Number of steps carried out
+        """
+        steps = self.load()['steps']
+        start = self.done()
+        ran = 0
+        with open(self.log_path, 'a', encoding='utf-8') as log:
+            for i in range(start, len(steps)):
+                if _apply(steps[i]):
+                    ran += 1
+                    if on_step is not None:
+                        on_step(steps[i])
+                log.write(f"{i}\n")
+                log.flush()
+        return ran
+
+    def rollback(self) -> int:
+        """Undo every step that was carried out, newest first, then delete the journal.
+
+        Backups are left in place.
+
+        Returns:
+            Number of steps undone
+        """
+        steps = self.load()['steps']
+        # The step after the last recorded one may have run before the log write
+        last = min(self.done() + 1, len(steps))
+        undone = 0
+        for step in reversed(steps[:last]):
+            undone += _undo(step)
+        self.path.unlink()
+        self.log_path.unlink(missing_ok=True)
+        return undone
+
+def _moved(step: dict) -> bool:
+    return not os.path.lexists(step['src']) and os.path.lexists(step['dst'])
+
+def _apply(step: dict) -> bool:
+    """Carry out one step unless it already took effect. Returns True if it ran."""
+    op = step['op']
+    if op == 'backup':
+        if os.path.lexists(step['dst']):
+            return False
+        Path(step['dst']).parent.mkdir(parents=True, exist_ok=True)
+        clone_file(Path(step['src']), Path(step['dst']))
+        return True
+    if op == 'write':
+        atomic_write(Path(step['path']), step['content'])
+        return True
+    if op == 'move':
+        if _moved(step):
+            return False
+        if os.path.lexists(step['dst']):
+            raise OSError(errno.EEXIST, "Rename destination already exists", step['dst'])
+        os.rename(step['src'], step['dst'])
+        return True
+    raise ValueError(f"Unknown journal step: {op}")
+
+def _undo(step: dict) -> bool:
+    """Reverse one step if it took effect. Returns True if anything changed."""
+    op = step['op']
+    if op == 'write':
+        if Path(step['path']).exists():
+            atomic_write(Path(step['path']), step['previous'])
+            return True
+        return False
+    if op == 'move':
+        if not _moved(step):
+            return False
+        os.rename(step['dst'], step['src'])
+        return True
+    return False
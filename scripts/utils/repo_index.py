@@ -0,0 +1,167 @@
+"""Single-pass index of the metadata/ and patches/ trees."""
+import os
+import posixpath
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .frontmatter import load_frontmatter_many
+from .profiling import stage
+
+PATCH_EXTENSIONS = ('.bps', '.ips', '.ups', '.xdelta', '.gba', '.nds', '.gb', '.gbc')
+
+def patch_key(file_field: str) -> str:
+    """Normalize a metadata 'file' field to a path relative to patches/.
+
+    Args:
+        file_field: Value of the 'file' field (e.g., "../patches/emerald/X.bps")
+
+    Returns:
+        POSIX path relative to the patches directory (e.g., "emerald/X.bps")
+    """
+    file_path = file_field.replace('\\', '/')
+    if file_path.startswith('../patches/'):
+        file_path = file_path[len('../patches/'):]
+    return posixpath.normpath(file_path)
+
+def _walk(root: Path) -> Iterator[tuple[str, os.DirEntry]]:
+    """Yield (relative_dir, entry) for every file below root.
+
+    Uses os.scandir so file type checks come from the directory listing
+    instead of a stat call per file.
+    """
+    stack = [("", str(root))]
+    while stack:
+        rel_dir, dir_path = stack.pop()
+        try:
+            entries = os.scandir(dir_path)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir():
+                    rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    stack.append((rel, entry.path))
+                elif entry.is_file():
+                    yield rel_dir, entry
+
+class RepoIndex:
+    """In-memory index of metadata and patch files.
+
+    Both trees are walked once on construction. Metadata files are paired
+    with patches by their 'file' field or, failing that, by stem within the
+    same base ROM subdirectory. All lookups are dictionary hits.
+    """
+
+    def __init__(self, metadata_dir: Path, patches_dir: Path):
+        self.metadata_dir = Path(metadata_dir)
+        self.patches_dir = Path(patches_dir)
+
+        self._metadata: dict[str, Path] = {}
+        self._metadata_dirs: dict[str, list[Path]] = {}
+        self._patches: dict[str, Path] = {}
+        self._patches_by_stem: dict[tuple[str, str], list[Path]] = {}
+        self._metadata_by_file: Optional[dict[str, Path]] = None
+
+        with stage('scan'):
+            for rel_dir, entry in _walk(self.metadata_dir):
+                if not entry.name.endswith('.md'):
+                    continue
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                path = self.metadata_dir / rel
+                self._metadata[rel] = path
+                self._metadata_dirs.setdefault(rel_dir, []).append(path)
+
+            for rel_dir, entry in _walk(self.patches_dir):
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                path = self.patches_dir / rel
+                self._patches[rel] = path
+                stem, ext = os.path.splitext(entry.name)
+                if ext in PATCH_EXTENSIONS:
+                    self._patches_by_stem.setdefault((rel_dir, stem), []).append(path)
+
+            for paths in self._metadata_dirs.values():
+                paths.sort()
+            for paths in self._patches_by_stem.values():
+                # Prefer extensions in PATCH_EXTENSIONS order
+                paths.sort(key=lambda p: PATCH_EXTENSIONS.index(p.suffix))
+
+    def metadata_files(self, baserom_filter: Optional[str] = None) -> list[Path]:
+        """Get sorted metadata files, optionally limited to one base ROM subdirectory."""
+        if baserom_filter:
+            return list(self._metadata_dirs.get(baserom_filter, []))
+        return sorted(self._metadata.values())
+
+    def patch_files(self, extensions: Optional[tuple[str, ...]] = None) -> list[Path]:
+        """Get sorted patch files, optionally limited to the given suffixes."""
+        paths = self._patches.values()
+        if extensions is not None:
+            paths = [p for p in paths if p.suffix in extensions]
+        return sorted(paths)
+
+    def has_metadata_dir(self, baserom: str) -> bool:
+        """Check whether metadata/{baserom}/ contains any metadata files."""
+        return baserom in self._metadata_dirs
+
+    def get_metadata(self, rel_path: str) -> Optional[Path]:
+        """Look up a metadata file by its metadata-relative path."""
+        return self._metadata.get(rel_path)
+
+    def get_patch(self, file_field: str) -> Optional[Path]:
+        """Look up a patch by its 'file' field or patches-relative path."""
+        return self._patches.get(patch_key(file_field))
+
+    def find_patch(self, md_path: Path, metadata: Optional[dict] = None) -> Optional[Path]:
+        """Find the patch file belonging to a metadata file.
+
+        Args:
+            md_path: Path to metadata file
+            metadata: Parsed metadata, used for its 'file' field if given
+
+        Returns:
+            Path to patch file or None if not found
+        """
+        if metadata:
+            file_field = metadata.get('file')
+            if isinstance(file_field, str):
+                patch_path = self.get_patch(file_field)
+                if patch_path is not None:
+                    return patch_path
+
+        candidates = self._patches_by_stem.get((md_path.parent.name, md_path.stem))
+        if candidates:
+            return candidates[0]
+        return None
+
+    def find_metadata(self, patch_path: Path) -> Optional[Path]:
+        """Find the metadata file belonging to a patch file.
+
+        Matches metadata/{baserom}/{stem}.md first, then falls back to any
+        metadata file whose 'file' field points at the patch.
+        """
+        baserom = patch_path.parent.name
+        md_path = self._metadata.get(f"{baserom}/{patch_path.stem}.md")
+        if md_path is not None:
+            return md_path
+
+        try:
+            rel = patch_path.relative_to(self.patches_dir).as_posix()
+        except ValueError:
+            rel = f"{baserom}/{patch_path.name}"
+        return self._file_field_index().get(rel)
+
+    def forget_file_fields(self) -> None:
+        """Drop the parsed 'file' fields, e.g. after a metadata file was edited."""
+        self._metadata_by_file = None
+
+    def _file_field_index(self) -> dict[str, Path]:
+        """Map patches-relative 'file' fields to metadata paths, parsed on first use."""
+        if self._metadata_by_file is None:
+            self._metadata_by_file = {}
+            md_paths = self.metadata_files()
+            for md_path, metadata in zip(md_paths, load_frontmatter_many(md_paths)):
+                if not isinstance(metadata, dict):
+                    continue
+                file_field = metadata.get('file')
+                if isinstance(file_field, str):
+                    self._metadata_by_file.setdefault(patch_key(file_field), md_path)
+        return self._metadata_by_file
@@ -0,0 +1,131 @@
+"""Identify base ROM dumps by console header and content digests."""
+import hashlib
+import mmap
+import os
+import zlib
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from .config_loader import get_config
+
+CHUNK_SIZE = 1 << 20
+HEADER_SIZE = 0x200
+
+# GBA: fixed value 0x96 at 0xB2, title at 0xA0, game code at 0xAC
+GBA_FIXED_OFFSET = 0xB2
+GBA_FIXED_VALUE = 0x96
+# NDS: CRC16 of the Nintendo logo is always 0xCF56 at 0x15C
+NDS_LOGO_CRC_OFFSET = 0x15C
+NDS_LOGO_CRC = b'\x56\xCF'
+# GB/GBC: Nintendo logo starts at 0x104, title at 0x134, CGB flag at 0x143
+GB_LOGO_OFFSET = 0x104
+GB_LOGO_PREFIX = b'\xCE\xED\x66\x66'
+GB_CGB_FLAG_OFFSET = 0x143
+
+class RomHeader(NamedTuple):
+    """Console header facts."""
+    system: str
+    game_code: str
+    title: str
+
+class RomIdentity(NamedTuple):
+    """Result of identifying a ROM dump."""
+    size: int
+    header: Optional[RomHeader]
+    crc32: Optional[str]
+    md5: Optional[str]
+    sha1: Optional[str]
+    base_rom: Optional[str]
+    variant: Optional[str]
+
+def _ascii(data: bytes) -> str:
+    return data.split(b'\x00', 1)[0].decode('ascii', 'replace').strip()
+
+def parse_header(data: bytes) -> Optional[RomHeader]:
+    """Detect the console and game code from the first HEADER_SIZE bytes.
+
+    Returns:
+        RomHeader, or None if no supported header is recognized
+    """
+    if len(data) > GBA_FIXED_OFFSET and data[GBA_FIXED_OFFSET] == GBA_FIXED_VALUE:
+        return RomHeader('GBA', _ascii(data[0xAC:0xB0]), _ascii(data[0xA0:0xAC]))
+
+    if data[NDS_LOGO_CRC_OFFSET:NDS_LOGO_CRC_OFFSET + 2] == NDS_LOGO_CRC:
+        return RomHeader('NDS', _ascii(data[0x0C:0x10]), _ascii(data[0x00:0x0C]))
+
+    if data[GB_LOGO_OFFSET:GB_LOGO_OFFSET + 4] == GB_LOGO_PREFIX and len(data) > GB_CGB_FLAG_OFFSET:
+        if data[GB_CGB_FLAG_OFFSET] & 0x80:
+            # CGB titles are 11 bytes followed by a 4-character manufacturer code
+            title = _ascii(data[0x134:0x13F])
+            code = _ascii(data[0x13F:0x143])
+            return RomHeader('GBC', code if code.isalnum() else title, title)
+        title = _ascii(data[0x134:0x144])
+        return RomHeader('GB', title, title)
+
+    return None
+
+def hash_rom(rom_path: Path) -> tuple[int, str, str, str]:
+    """Compute size, CRC32, MD5 and SHA-1 in a single chunked pass.
+
+    The file is memory-mapped and fed to all three digests slice by slice.
+
+    Returns:
+        Tuple of (size, crc32, md5, sha1) with upper-case hex digests
+    """
+    crc = 0
+    md5 = hashlib.md5()
+    sha1 = hashlib.sha1()
+    with open(rom_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                view = memoryview(data)
+                for offset in range(0, size, CHUNK_SIZE):
+                    chunk = view[offset:offset + CHUNK_SIZE]
+                    crc = zlib.crc32(chunk, crc)
+                    md5.update(chunk)
+                    sha1.update(chunk)
+                    chunk.release()
+                view.release()
+    return size, f"{crc:08X}", md5.hexdigest().upper(), sha1.hexdigest().upper()
+
+def identify_rom(rom_path: Path, force_hash: bool = False) -> RomIdentity:
+    """Identify a ROM against the fingerprint index.
+
+    The console header is read first. When fingerprints exist and none
+    share the header's game code and file size, hashing is skipped since
+    no digest could match. Otherwise size, CRC32, MD5 and SHA-1 are
+    computed in one pass and looked up.
+
+    Args:
+        rom_path: Path to ROM file
+        force_hash: Always compute digests, even without candidates
+
+    Returns:
+        RomIdentity; base_rom and variant are None when unknown
+    """
+    config = get_config()
+    size = os.path.getsize(rom_path)
+    with open(rom_path, 'rb') as f:
+        header = parse_header(f.read(HEADER_SIZE))
+
+    if config.fingerprints and not force_hash:
+        game_code = header.game_code if header is not None else None
+        candidates = [
+            fingerprint for fingerprint in config.fingerprints.values()
+            if fingerprint.get('size') in (None, size)
+            and (game_code is None or fingerprint.get('gameCode') in (None, game_code))
+        ]
+        if not candidates:
+            return RomIdentity(size, header, None, None, None, None, None)
+
+    _, crc32, md5, sha1 = hash_rom(rom_path)
+
+    variant = None
+    for digest in (sha1, md5, crc32):
+        variant = config.find_variant_by_digest(digest)
+        if variant is not None:
+            break
+
+    base_rom = config.variant_by_crc[variant][0] if variant in config.variant_by_crc else None
+    return RomIdentity(size, header, crc32, md5, sha1, base_rom, variant)
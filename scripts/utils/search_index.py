@@ -0,0 +1,160 @@
+"""Prebuilt search index and sidebar facet counts for the library page.
+
+The index is an inverted index over each hack's title, author, tags,
+mechanics, base ROM and system. Terms are stored sorted, so the client
+finds prefix matches with a binary search, and a trigram table maps
+3-letter grams to terms for typo-tolerant matching. Query cost depends on
+the number of matching terms, not on the number of hacks.
+
+Tokenization must stay in sync with docs/assets/js/utils/search-index.js.
+"""
+import math
+import re
+import unicodedata
+from typing import Any
+
+from .manifest_builder import js_truthy
+
+SEARCH_INDEX_VERSION = 1
+
+# Bit i of a posting's field mask is set when the term occurs in FIELDS[i]
+FIELDS = ('title', 'author', 'tags', 'mechanics', 'baseRom', 'system')
+
+# Sidebar filters in search.js generateFilterOptions() order
+FACETS = (
+    'baseRom', 'system', 'status', 'difficulty', 'tags', 'fakemons',
+    'graphics', 'story', 'mechanics', 'rating'
+)
+_SCALAR_FACETS = ('system', 'status', 'difficulty', 'fakemons', 'graphics', 'story')
+
+_COMBINING_RE = re.compile('[\u0300-\u036f]')
+_SPLIT_RE = re.compile(r'[^a-z0-9]+')
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase ASCII alphanumeric tokens, accents removed."""
+    text = _COMBINING_RE.sub('', unicodedata.normalize('NFKD', text)).lower()
+    return [token for token in _SPLIT_RE.split(text) if token]
+
+def trigrams(term: str) -> set[str]:
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+def _field_text(value: Any) -> str:
+    if isinstance(value, list):
+        return ' '.join(str(v) for v in value if v is not None)
+    if value is None or isinstance(value, (dict, bool)):
+        return ''
+    return str(value)
+
+def _field_values(entry: dict) -> list[Any]:
+    meta = entry.get('meta') or {}
+    return [
+        entry.get('title'),
+        meta.get('author'),
+        meta.get('tags'),
+        meta.get('mechanics'),
+        meta.get('baseRom'),
+        meta.get('system'),
+    ]
+
+def _rating_bucket(rating: Any) -> str:
+    # Math.floor(rating) + ' Stars'
+    try:
+        value = float(rating)
+    except (TypeError, ValueError):
+        value = math.nan
+    if math.isnan(value):
+        return 'NaN Stars'
+    if math.isinf(value):
+        return f"{'' if value > 0 else '-'}Infinity Stars"
+    return f"{math.floor(value)} Stars"
+
+def facet_counts(patches: list[dict]) -> dict[str, list[list]]:
+    """Count sidebar filter values exactly like search.js generateFilterOptions().
+
+    Returns:
+        Mapping of filter type to [value, count] pairs in first-seen order
+    """
+    counts: dict[str, dict] = {facet: {} for facet in FACETS}
+
+    def add(facet: str, value: Any) -> None:
+        # JS Map keys: strings and numbers by value, objects by reference
+        if isinstance(value, str):
+            key = value
+        elif isinstance(value, (dict, list)):
+            key = ('ref', id(value))
+        else:
+            key = (type(value).__name__, value)
+        bucket = counts[facet]
+        if key in bucket:
+            bucket[key][1] += 1
+        else:
+            bucket[key] = [value, 1]
+
+    for entry in patches:
+        meta = entry.get('meta')
+        if not isinstance(meta, dict):
+            continue
+        if js_truthy(meta.get('baseRom')):
+            add('baseRom', meta['baseRom'])
+        for facet in _SCALAR_FACETS:
+            if js_truthy(meta.get(facet)):
+                add(facet, meta[facet])
+        if js_truthy(meta.get('rating')):
+            add('rating', _rating_bucket(meta['rating']))
+        if isinstance(meta.get('tags'), list):
+            for tag in meta['tags']:
+                add('tags', tag)
+        mechanics = meta.get('mechanics')
+        if js_truthy(mechanics):
+            if isinstance(mechanics, list):
+                for mechanic in mechanics:
+                    add('mechanics', mechanic)
+            elif isinstance(mechanics, str):
+                for mechanic in mechanics.split(','):
+                    add('mechanics', mechanic.strip())
+
+    return {facet: list(bucket.values()) for facet, bucket in counts.items()}
+
+def build_search_index(patches: list[dict]) -> dict:
+    """Build the inverted index for manifest entries.
+
+    Returns:
+        Dictionary with:
+            - ids: Entry ids; a document number is an index into this list
+            - fields: Field names for the posting masks
+            - terms: Sorted unique terms
+            - postings: Per term, a flat [doc, mask, doc, mask, ...] list
+            - trigrams: Trigram -> indexes into terms
+            - facets: Precomputed sidebar filter counts
+    """
+    term_docs: dict[str, dict[int, int]] = {}
+    for doc, entry in enumerate(patches):
+        for bit, value in enumerate(_field_values(entry)):
+            for token in tokenize(_field_text(value)):
+                docs = term_docs.setdefault(token, {})
+                docs[doc] = docs.get(doc, 0) | (1 << bit)
+
+    terms = sorted(term_docs)
+    postings = []
+    for term in terms:
+        flat = []
+        for doc, mask in sorted(term_docs[term].items()):
+            flat.extend((doc, mask))
+        postings.append(flat)
+
+    grams: dict[str, list[int]] = {}
+    for term_index, term in enumerate(terms):
+        for gram in sorted(trigrams(term)):
+            grams.setdefault(gram, []).append(term_index)
+
+    return {
+        'version': SEARCH_INDEX_VERSION,
+        'ids': [entry['id'] for entry in patches],
+        'fields': list(FIELDS),
+        'terms': terms,
+        'postings': postings,
+        'trigrams': dict(sorted(grams.items())),
+        # The library counts filters over title-sorted hacks; first-seen order
+        # breaks ties between equal counts in the sidebar
+        'facets': facet_counts(sorted(patches, key=lambda entry: str(entry.get('title', '')).casefold())),
+    }
@@ -0,0 +1,128 @@
+"""Client for scripts/standardizer_server.py, with an in-process fallback.
+
+Importing this module only loads json and socket. When no server is
+listening on the socket, requests are answered in this process instead
+(utils/standardizer_rpc.py, imported on first use), so callers get the same
+results either way and only the startup cost differs.
+
+Over the socket every request line gets exactly one response line; an
+empty line stands for "no response" (a batch of notifications).
+"""
+import json
+import socket
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+DEFAULT_SOCKET = Path('.cache') / 'standardizer.sock'
+
+# Lines written before reading their responses, so neither side blocks on
+# a full socket buffer
+PIPELINE_DEPTH = 64
+
+class StandardizerError(Exception):
+    """A JSON-RPC error response."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+class StandardizerClient:
+    """Sends JSON-RPC requests to the standardizer server, or handles them locally.
+
+    Args:
+        socket_path: Server socket, or None to always answer in-process
+        fallback: Answer in-process when the server is not reachable
+            (otherwise the connection error is raised)
+    """
+
+    def __init__(self, socket_path: Optional[Path] = DEFAULT_SOCKET, fallback: bool = True):
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+        self._next_id = 0
+        if socket_path is None:
+            return
+        try:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(str(socket_path))
+        except OSError:
+            sock.close()
+            if not fallback:
+                raise
+        else:
+            self._sock = sock
+            self._reader = sock.makefile('r', encoding='utf-8', newline='\n')
+
+    @property
+    def remote(self) -> bool:
+        """Whether requests go to a server."""
+        return self._sock is not None
+
+    def __enter__(self) -> 'StandardizerClient':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._reader.close()
+            self._sock.close()
+            self._sock = self._reader = None
+
+    def send_lines(self, lines: Iterable[str]) -> list[str]:
+        """Send request lines and return one response line per request ('' for none)."""
+        lines = list(lines)
+        if self._sock is None:
+            from .standardizer_rpc import handle_line
+            return [handle_line(line) or '' for line in lines]
+
+        responses = []
+        for start in range(0, len(lines), PIPELINE_DEPTH):
+            chunk = lines[start:start + PIPELINE_DEPTH]
+            self._sock.sendall(''.join(line.replace('\n', ' ') + '\n' for line in chunk).encode('utf-8'))
+            for _ in chunk:
+                response = self._reader.readline()
+                if not response:
+                    raise ConnectionError("Standardizer server closed the connection")
+                responses.append(response.rstrip('\n'))
+        return responses
+
+    def _request(self, method: str, params: Any) -> dict:
+        self._next_id += 1
+        return {'jsonrpc': '2.0', 'id': self._next_id, 'method': method, 'params': params}
+
+    def call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Call one method with positional or keyword params.
+
+        Raises:
+            StandardizerError: If the method failed
+        """
+        (line,) = self.send_lines([json.dumps(self._request(method, kwargs or list(args)))])
+        return _result(json.loads(line))
+
+    def call_many(self, calls: Iterable[tuple[str, Any]]) -> list[Any]:
+        """Call many methods in one batch round trip.
+
+        Args:
+            calls: (method, params) pairs; params is a list or a dict
+
+        Returns:
+            Per call, its result or the StandardizerError it failed with
+        """
+        requests = [self._request(method, params) for method, params in calls]
+        if not requests:
+            return []
+        (line,) = self.send_lines([json.dumps(requests)])
+        by_id = {response.get('id'): response for response in json.loads(line)}
+        results = []
+        for request in requests:
+            try:
+                results.append(_result(by_id[request['id']]))
+            except StandardizerError as e:
+                results.append(e)
+        return results
+
+def _result(response: dict) -> Any:
+    if 'error' in response:
+        raise StandardizerError(response['error'].get('code', 0), response['error'].get('message', ''))
+    return response.get('result')
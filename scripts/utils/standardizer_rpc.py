@@ -0,0 +1,133 @@
+"""JSON-RPC 2.0 methods for the standardizer service.
+
+Requests and responses are single-line JSON (a batch is a JSON array), so
+the same handle_line() serves stdin/stdout, a Unix socket and the
+in-process fallback of utils/standardizer_client.py.
+
+Methods (params by name or position):
+    standardize(metadata_path, patch_path=None, metadata=None)
+        standardize_from_metadata() result; patch_path defaults to the
+        metadata 'file' field
+    validate(metadata_path, patch_path=None, metadata=None)
+        {"valid", "errors", "current", "expected"}: schema errors plus
+        whether the patch filename is already standardized
+    parse_version(version) -> [core, variant]
+    normalize_title(title) -> str
+"""
+import inspect
+import json
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from .config_loader import ConfigIndex, get_config
+from .filename_standardizer import normalize_title, parse_version, standardize_from_metadata
+from .frontmatter import load_frontmatter
+from .metadata_schema import compile_schema
+from .repo_index import patch_key
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+# Config the compiled schema belongs to; get_config() returns a new
+# index when a config file changes, which recompiles it
+_schema: Optional[tuple[ConfigIndex, Callable]] = None
+
+def _validator() -> Callable:
+    global _schema
+    config = get_config()
+    if _schema is None or _schema[0] is not config:
+        _schema = (config, compile_schema(config))
+    return _schema[1]
+
+def warm_up() -> None:
+    """Load config/ and compile the schema ahead of the first request."""
+    _validator()
+
+def _load(metadata_path: str, patch_path: Optional[str], metadata: Optional[dict]) -> tuple[Path, Path, Any]:
+    md_path = Path(metadata_path)
+    if metadata is None:
+        metadata = load_frontmatter(md_path)
+    if patch_path is None:
+        file_field = metadata.get('file') if isinstance(metadata, dict) else None
+        if not isinstance(file_field, str):
+            raise ValueError(f"No patch_path given and no 'file' field in {md_path.name}")
+        # metadata/<baserom>/<name>.md -> <root>/patches/...
+        patch_path = md_path.parent.parent.parent / 'patches' / patch_key(file_field)
+    return md_path, Path(patch_path), metadata
+
+def standardize(metadata_path: str, patch_path: Optional[str] = None,
+                metadata: Optional[dict] = None) -> dict:
+    """Standardized filename of a metadata/patch pair (standardize_from_metadata's dict)."""
+    return standardize_from_metadata(*_load(metadata_path, patch_path, metadata))
+
+def validate(metadata_path: str, patch_path: Optional[str] = None,
+             metadata: Optional[dict] = None) -> dict:
+    """Schema errors of a metadata file and whether its patch filename is standardized."""
+    md_path, patch, metadata = _load(metadata_path, patch_path, metadata)
+    errors = _validator()(metadata)
+    result = standardize_from_metadata(md_path, patch, metadata)
+    return {
+        'valid': not errors and not result['needs_rename'],
+        'errors': errors,
+        'current': result['old_filename'],
+        'expected': result['new_filename'],
+    }
+
+METHODS: dict[str, Callable] = {
+    'standardize': standardize,
+    'validate': validate,
+    'parse_version': lambda version: list(parse_version(version)),
+    'normalize_title': normalize_title,
+}
+
+def _error(request_id: Any, code: int, message: str) -> dict:
+    return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+def handle_request(request: Any) -> Optional[dict]:
+    """Run one JSON-RPC request. Returns None for notifications (no id)."""
+    if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+        return _error(None, INVALID_REQUEST, "Invalid request")
+    request_id = request.get('id')
+    method = METHODS.get(request['method'])
+    if method is None:
+        response = _error(request_id, METHOD_NOT_FOUND, f"Unknown method: {request['method']}")
+    else:
+        params = request.get('params', [])
+        try:
+            if isinstance(params, dict):
+                bound = inspect.signature(method).bind(**params)
+            elif isinstance(params, list):
+                bound = inspect.signature(method).bind(*params)
+            else:
+                raise TypeError("params must be an array or an object")
+        except TypeError as e:
+            response = _error(request_id, INVALID_PARAMS, str(e))
+        else:
+            try:
+                result = method(*bound.args, **bound.kwargs)
+            except Exception as e:
+                response = _error(request_id, SERVER_ERROR, f"{type(e).__name__}: {e}")
+            else:
+                response = {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+    return response if 'id' in request else None
+
+def handle_line(line: str) -> Optional[str]:
+    """Answer one request or batch line.
+
+    Returns:
+        Response line, or None when every request was a notification
+    """
+    try:
+        message = json.loads(line)
+    except ValueError as e:
+        return json.dumps(_error(None, PARSE_ERROR, f"Parse error: {e}"))
+    if isinstance(message, list):
+        if not message:
+            return json.dumps(_error(None, INVALID_REQUEST, "Empty batch"))
+        responses = [response for response in map(handle_request, message) if response is not None]
+        return json.dumps(responses, ensure_ascii=False) if responses else None
+    response = handle_request(message)
+    return json.dumps(response, ensure_ascii=False) if response is not None else None
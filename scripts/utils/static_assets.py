@@ -0,0 +1,238 @@
+"""Minified, content-hashed and precompressed copies of generated outputs.
+
+GitHub Pages serves docs/ as plain files, so every generated output
+(manifest.json, badges.css, the config/*.json mirrors) is also published as:
+
+- <name>.<hash>.<ext>: minified copy whose name changes with its content,
+  so browsers and the service worker can cache it indefinitely
+- <name>.<hash>.<ext>.gz / .br: gzip and brotli siblings for servers and
+  CDNs that serve precompressed files
+- asset-map.json (in docs/): maps each source path to its hashed copy
+
+The unhashed sources are left as they are for existing links; copies of
+files under symlinked directories go to assets/generated/. Brotli output
+needs the optional `brotli` package; without it only gzip is written.
+"""
+import gzip
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .manifest_builder import write_if_changed
+from .manifest_shards import HASH_LENGTH
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ASSET_MAP_FILE = 'asset-map.json'
+ASSET_MAP_VERSION = 1
+
+# Generated outputs under docs/, as glob patterns
+DEFAULT_ASSETS = (
+    'manifest.json',
+    'assets/css/generated/badges.css',
+    'config/*.json',
+)
+
+COMPRESSED_SUFFIXES = ('.gz', '.br')
+
+_HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{%d}$' % HASH_LENGTH)
+_CSS_STRING = r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\''
+_CSS_COMMENT_RE = re.compile(r'(%s)|/\*.*?\*/' % _CSS_STRING, re.S)
+_CSS_STRING_RE = re.compile(r'(%s)' % _CSS_STRING)
+_CSS_SPACE_RE = re.compile(r'\s+')
+_CSS_PUNCT_RE = re.compile(r'\s*([{};,>])\s*')
+_CSS_COLON_RE = re.compile(r':\s+')
+
+def hashed_copy_source(path: Path) -> Optional[Path]:
+    """Source file a content-hashed copy (or its compressed sibling) was made from.
+
+    Returns:
+        Path of the unhashed file in the same directory, or None if path is
+        not a hashed copy
+    """
+    path = Path(path)
+    name = path.name
+    for suffix in COMPRESSED_SUFFIXES:
+        name = name.removesuffix(suffix)
+    hashed = Path(name)
+    if not _HASHED_NAME_RE.search(hashed.stem):
+        return None
+    return path.with_name(hashed.stem[:-HASH_LENGTH - 1] + hashed.suffix)
+
+def minify_json(text: str) -> str:
+    return json.dumps(json.loads(text), ensure_ascii=False, separators=(',', ':'))
+
+def minify_css(text: str) -> str:
+    """Remove comments and insignificant whitespace from CSS."""
+    # Drop comments first so whitespace around them collapses in one pass
+    text = _CSS_COMMENT_RE.sub(lambda match: match.group(1) or ' ', text)
+    parts = []
+    for index, part in enumerate(_CSS_STRING_RE.split(text)):
+        if index % 2:
+            parts.append(part)
+            continue
+        part = _CSS_SPACE_RE.sub(' ', part)
+        part = _CSS_PUNCT_RE.sub(r'\1', part)
+        parts.append(_CSS_COLON_RE.sub(':', part))
+    return ''.join(parts).replace(';}', '}').strip()
+
+MINIFIERS = {
+    '.json': minify_json,
+    '.css': minify_css,
+}
+
+def _write_bytes_if_changed(path: Path, data: bytes) -> bool:
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.write_bytes(data)
+    return True
+
+def compress_siblings(path: Path, data: bytes) -> int:
+    """Write path.gz (and path.br when brotli is installed) for data.
+
+    Gzip output has no timestamp, so unchanged inputs give unchanged files.
+
+    Returns:
+        Number of files written
+    """
+    written = _write_bytes_if_changed(
+        Path(f"{path}.gz"), gzip.compress(data, compresslevel=9, mtime=0)
+    )
+    if brotli is not None:
+        written += _write_bytes_if_changed(
+            Path(f"{path}.br"), brotli.compress(data, quality=11)
+        )
+    return written
+
+def _hashed_siblings(path: Path) -> Iterable[Path]:
+    """Existing hashed copies (and their compressed siblings) of path's name in its directory."""
+    for candidate in path.parent.glob(f"{path.stem}.*{path.suffix}*"):
+        name = candidate.name
+        for suffix in COMPRESSED_SUFFIXES:
+            name = name.removesuffix(suffix)
+        stem = name.removesuffix(path.suffix)
+        if name.endswith(path.suffix) and _HASHED_NAME_RE.search(stem) \
+                and stem[:-HASH_LENGTH - 1] == path.stem:
+            yield candidate
+
+def output_dir(path: Path, docs_root: Path) -> Path:
+    """Directory for a file's hashed copies.
+
+    Files reached through a symlink out of the site root (docs/config ->
+    ../config) get their copies under assets/generated/ instead, so the
+    source directory is never written to.
+    """
+    path = Path(path)
+    docs_root = Path(docs_root)
+    if path.resolve().is_relative_to(docs_root.resolve()):
+        return path.parent
+    return docs_root / 'assets' / 'generated' / path.parent.relative_to(docs_root)
+
+def publish_asset(path: Path, target_dir: Path = None) -> tuple[Path, int]:
+    """Write the minified, hashed and compressed copies of one file.
+
+    Stale hashed copies of the same file are removed.
+
+    Args:
+        path: Source file
+        target_dir: Directory for the copies (default: next to the source)
+
+    Returns:
+        Tuple of (hashed copy path, number of files written or removed)
+    """
+    path = Path(path)
+    target_dir = Path(target_dir) if target_dir is not None else path.parent
+    text = path.read_text(encoding='utf-8')
+    minify = MINIFIERS.get(path.suffix)
+    data = (minify(text) if minify else text).encode('utf-8')
+
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    hashed = target_dir / f"{path.stem}.{digest}{path.suffix}"
+    keep = {hashed.name} | {hashed.name + suffix for suffix in COMPRESSED_SUFFIXES}
+
+    target_dir.mkdir(parents=True, exist_ok=True)
+    changes = _write_bytes_if_changed(hashed, data)
+    changes += compress_siblings(hashed, data)
+    for stale in _hashed_siblings(hashed.with_name(path.name)):
+        if stale.name not in keep:
+            stale.unlink()
+            changes += 1
+    return hashed, changes
+
+def _active_suffixes() -> tuple[str, ...]:
+    return COMPRESSED_SUFFIXES if brotli is not None else ('.gz',)
+
+def precompress_dir(directory: Path, pattern: str = '*.json') -> int:
+    """Compress already content-hashed files in a directory (e.g., manifest shards).
+
+    Siblings of hashed files are written once; siblings whose file was
+    removed are deleted.
+
+    Returns:
+        Number of files written or removed
+    """
+    directory = Path(directory)
+    changes = 0
+    for path in directory.glob(pattern):
+        if not _HASHED_NAME_RE.search(path.stem):
+            continue
+        if all(Path(f"{path}{suffix}").exists() for suffix in _active_suffixes()):
+            continue
+        changes += compress_siblings(path, path.read_bytes())
+    for suffix in COMPRESSED_SUFFIXES:
+        for sibling in directory.glob(f"{pattern}{suffix}"):
+            if not sibling.with_suffix('').exists():
+                sibling.unlink()
+                changes += 1
+    return changes
+
+def update_asset_map(docs_root: Path, published: dict[str, str]) -> bool:
+    """Merge source -> hashed path entries (relative to docs/) into asset-map.json.
+
+    Returns:
+        True if the map file was written
+    """
+    map_path = Path(docs_root) / ASSET_MAP_FILE
+    try:
+        files = json.loads(map_path.read_text(encoding='utf-8')).get('files', {})
+    except (OSError, ValueError):
+        files = {}
+    files.update(published)
+    files = {source: files[source] for source in sorted(files)
+             if (Path(docs_root) / source).exists()}
+    data = {'version': ASSET_MAP_VERSION, 'files': files}
+    return write_if_changed(map_path, json.dumps(data, indent=2) + '\n')
+
+def publish_assets(docs_root: Path, paths: Iterable[Path]) -> tuple[dict[str, str], int]:
+    """Publish files under docs_root and record them in the asset map.
+
+    Returns:
+        Tuple of (source -> hashed path mapping, number of files changed)
+    """
+    docs_root = Path(docs_root)
+    published = {}
+    changes = 0
+    for path in paths:
+        hashed, count = publish_asset(path, output_dir(path, docs_root))
+        published[Path(path).relative_to(docs_root).as_posix()] = hashed.relative_to(docs_root).as_posix()
+        changes += count
+    changes += update_asset_map(docs_root, published)
+    return published, changes
+
+def find_assets(docs_root: Path, patterns: Iterable[str] = DEFAULT_ASSETS) -> list[Path]:
+    """Resolve asset patterns to existing source files, skipping hashed copies."""
+    docs_root = Path(docs_root)
+    found = []
+    for pattern in patterns:
+        for path in sorted(docs_root.glob(pattern)):
+            if path.is_file() and not _HASHED_NAME_RE.search(path.stem):
+                found.append(path)
+    return found
@@ -0,0 +1,210 @@
+"""File change notification for long-running scripts.
+
+InotifyWatcher uses Linux inotify through ctypes; PollingWatcher compares
+directory snapshots and works everywhere. Both report root-relative POSIX
+paths; directories that appear or vanish are reported with a trailing
+slash. debounced() groups bursts of events (an editor's save is often
+several) into one batch.
+"""
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Iterator, Optional, Protocol
+
+DEFAULT_DEBOUNCE = 0.05
+DEFAULT_POLL_INTERVAL = 0.5
+
+class Watcher(Protocol):
+    def read(self, timeout: Optional[float]) -> set[str]:
+        """Wait up to timeout seconds (None: forever) for changes."""
+        ...
+
+    def close(self) -> None:
+        ...
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, 'O_CLOEXEC', 0o2000000)
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+_EVENT = struct.Struct('iIII')
+
+def _libc() -> Optional[ctypes.CDLL]:
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+class InotifyWatcher:
+    """Recursive inotify watches on directories below a root."""
+
+    def __init__(self, root: Path, dirs: list[str]):
+        libc = _libc()
+        if libc is None:
+            raise OSError(errno.ENOSYS, 'inotify is not available')
+        self._libc = libc
+        self.root = Path(root)
+        self.dirs = dirs
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._watches: dict[int, str] = {}  # watch descriptor -> root-relative dir
+        for rel in dirs:
+            self._add_tree(rel)
+
+    def _add_tree(self, rel: str) -> None:
+        """Watch a directory and every directory below it."""
+        stack = [rel]
+        while stack:
+            rel_dir = stack.pop()
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(self.root / rel_dir), WATCH_MASK)
+            if wd < 0:
+                continue  # vanished, or not a directory
+            self._watches[wd] = rel_dir
+            try:
+                with os.scandir(self.root / rel_dir) as entries:
+                    stack.extend(f"{rel_dir}/{entry.name}" for entry in entries if entry.is_dir())
+            except OSError:
+                pass
+
+    def read(self, timeout: Optional[float]) -> set[str]:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed: set[str] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    # Events were dropped; report every watched tree
+                    changed.update(f"{rel}/" for rel in self.dirs)
+                    continue
+                if mask & IN_IGNORED:
+                    self._watches.pop(wd, None)
+                    continue
+                rel_dir = self._watches.get(wd)
+                if rel_dir is None or not name:
+                    continue
+                rel = f"{rel_dir}/{name}"
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        self._add_tree(rel)
+                    changed.add(f"{rel}/")
+                else:
+                    changed.add(rel)
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+class PollingWatcher:
+    """Compares (mtime, size) snapshots of every file below the watched dirs."""
+
+    def __init__(self, root: Path, dirs: list[str], interval: float = DEFAULT_POLL_INTERVAL):
+        self.root = Path(root)
+        self.dirs = dirs
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        files = {}
+        stack = list(self.dirs)
+        while stack:
+            rel_dir = stack.pop()
+            try:
+                entries = os.scandir(self.root / rel_dir)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    rel = f"{rel_dir}/{entry.name}"
+                    try:
+                        if entry.is_dir():
+                            stack.append(rel)
+                        elif entry.is_file():
+                            st = entry.stat()
+                            files[rel] = (st.st_mtime_ns, st.st_size)
+                    except OSError:
+                        continue
+        return files
+
+    def read(self, timeout: Optional[float]) -> set[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            if wait > 0:
+                time.sleep(wait)
+            snapshot = self._scan()
+            old, self._snapshot = self._snapshot, snapshot
+            changed = {rel for rel in old.keys() | snapshot.keys() if old.get(rel) != snapshot.get(rel)}
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self) -> None:
+        pass
+
+def open_watcher(root: Path, dirs: list[str], poll: bool = False,
+                 interval: float = DEFAULT_POLL_INTERVAL) -> Watcher:
+    """inotify where available, otherwise (or with poll=True) polling.
+
+    Args:
+        root: Directory the watched dirs and reported paths are relative to
+        dirs: Root-relative directories to watch recursively
+        poll: Always poll
+        interval: Seconds between polls
+    """
+    existing = [rel for rel in dirs if (Path(root) / rel).is_dir()]
+    if not poll:
+        try:
+            return InotifyWatcher(root, existing)
+        except OSError:
+            pass
+    return PollingWatcher(root, existing, interval)
+
+def debounced(watcher: Watcher, delay: float = DEFAULT_DEBOUNCE) -> Iterator[set[str]]:
+    """Yield batches of changes, each closed once delay passes without events."""
+    while True:
+        changed = watcher.read(None)
+        if not changed:
+            continue
+        while True:
+            more = watcher.read(delay)
+            if not more:
+                break
+            changed |= more
+        yield changed
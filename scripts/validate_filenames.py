@@ -5,104 +5,399 @@ Used by GitHub Actions to validate manifest and PR submissions.
 """
 
 import json
+import os
+import subprocess
 import sys
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import Dict, Iterator, List, NoReturn, Optional, Tuple
+from utils.catalog import Catalog, open_catalog
 from utils.filename_standardizer import standardize_from_metadata, parse_metadata_file
 from utils.config_loader import load_base_roms, load_systems
+from utils.repo_index import RepoIndex
+from utils.ndjson import NdjsonWriter
+from utils.parallel import default_jobs, imap_ordered
+from utils.patch_store import DEFAULT_CACHE as STORE_CACHE, PatchStore, build_patch_store
+from utils import profiling
 
-def validate_manifest(manifest_path: str) -> Tuple[bool, List[str]]:
-    """Validate all entries in manifest.json against standardized naming."""
-    errors = []
+_worker_index: Optional[RepoIndex] = None
+
+def _init_worker(index: RepoIndex) -> None:
+    """Install the shared repository index in a worker process."""
+    global _worker_index
+    _worker_index = index
+
+def _check_manifest_entry(entry: dict) -> Optional[str]:
+    """Validate one manifest entry, returning an error message or None."""
+    index = _worker_index
     
+    # Check if patch file exists
+    patch_path = index.get_patch(entry['file'])
+    if patch_path is None:
+        return f"Missing patch file: {entry['file']}"
+        
+    if not index.has_metadata_dir(entry['baseRom']):
+        return f"Missing metadata directory for {entry['baseRom']}"
+        
+    # Pair by stem, then by the metadata 'file' field
+    metadata_path = index.find_metadata(patch_path)
+    if metadata_path is None:
+        return f"No metadata file found for {entry['file']}"
+        
+    # Validate filename format
     try:
-        with open(manifest_path, 'r') as f:
-            manifest = json.load(f)
+        result = standardize_from_metadata(metadata_path, patch_path)
+        if result['needs_rename']:
+            return f"Non-standard filename: {result['old_filename']} → {result['new_filename']}"
+    except Exception as e:
+        return f"Validation error for {entry['id']}: {e}"
+    
+    return None
+
+def _check_metadata_file(md_file: Path) -> Tuple[Optional[Dict], Optional[Path]]:
+    """Validate one metadata/patch pair.
+    
+    Returns:
+        Tuple of (issue dict or None, standardized patch path or None)
+    """
+    try:
+        # Find corresponding patch file
+        metadata = parse_metadata_file(md_file)
+        patch_file = _worker_index.find_patch(md_file, metadata)
+        
+        if not patch_file:
+            return None, None  # No patch file, skip validation
+        
+        # Validate naming
+        result = standardize_from_metadata(md_file, patch_file, metadata)
+        target = patch_file.parent / result['new_filename']
+        if result['needs_rename']:
+            return {
+                'current': result['old_filename'],
+                'expected': result['new_filename'],
+                'metadata': Path(os.path.relpath(md_file)).as_posix()
+            }, target
+        return None, target
+            
+    except Exception as e:
+        return {
+            'current': str(md_file),
+            'expected': 'ERROR',
+            'metadata': f"Validation failed: {e}"
+        }, None
+
+def duplicate_issues(store: PatchStore, patch_files: Optional[List[Path]] = None) -> List[Dict]:
+    """Report patches whose bytes match another patch in the store.
+    
+    Args:
+        store: Content-addressed index of the patches directory
+        patch_files: Patches to check (default: every file in the store)
+        
+    Returns:
+        Issue dicts, one per duplicate file after the first of its group
+    """
+    if patch_files is None:
+        pairs = [(paths[0], paths[1:]) for _, _, paths in store.duplicate_groups()]
+    else:
+        pairs = []
+        for patch_file in patch_files:
+            others = store.duplicates_of(patch_file)
+            if others:
+                own = patch_file.relative_to(store.patches_dir).as_posix()
+                pairs.append((others[0], [own]))
+    
+    return [
+        {
+            'current': copy,
+            'expected': 'DUPLICATE',
+            'metadata': f"Identical to {original}"
+        }
+        for original, copies in pairs for copy in copies
+    ]
+
+def load_manifest(manifest_path: str) -> list:
+    """Read manifest.json."""
+    with open(manifest_path, 'r') as f:
+        with profiling.stage('manifest'):
+            return json.load(f)
+
+def manifest_index(manifest_path: str) -> RepoIndex:
+    """Repository index for the patches directory next to a manifest's site root."""
+    patches_dir = Path(os.path.normpath(Path(manifest_path).parent / "../patches"))
+    return RepoIndex(Path("metadata"), patches_dir)
+
+def iter_manifest_results(manifest: list, index: RepoIndex,
+                          jobs: Optional[int] = 1) -> Iterator[Tuple[dict, Optional[str]]]:
+    """Yield (entry, error or None) for each manifest entry as soon as it is checked."""
+    return zip(manifest, imap_ordered(_check_manifest_entry, manifest, jobs, _init_worker, (index,)))
+
+def validate_manifest(manifest_path: str, index: Optional[RepoIndex] = None,
+                      jobs: Optional[int] = 1) -> Tuple[bool, List[str]]:
+    """Validate all entries in manifest.json against standardized naming."""
+    try:
+        manifest = load_manifest(manifest_path)
     except Exception as e:
         return False, [f"Failed to read manifest: {e}"]
     
-    for entry in manifest:
-        # Check if patch file exists
-        patch_path = Path(manifest_path).parent / entry['file']
-        if not patch_path.exists():
-            errors.append(f"Missing patch file: {entry['file']}")
+    if index is None:
+        index = manifest_index(manifest_path)
+    
+    errors = [error for _, error in iter_manifest_results(manifest, index, jobs) if error is not None]
+    
+    return len(errors) == 0, errors
+
+def iter_pr_results(index: RepoIndex, store: PatchStore,
+                    jobs: Optional[int] = 1) -> Iterator[Tuple[Optional[Path], Optional[Dict]]]:
+    """Yield (metadata file, issue or None) per metadata file, then (None, issue) per duplicate."""
+    md_files = index.metadata_files()
+    for md_file, (issue, _) in zip(md_files, imap_ordered(_check_metadata_file, md_files, jobs,
+                                                          _init_worker, (index,))):
+        yield md_file, issue
+    for issue in duplicate_issues(store):
+        yield None, issue
+
+def iter_catalog_pr_results(catalog: Catalog) -> Iterator[Tuple[Optional[Path], Optional[Dict]]]:
+    """iter_pr_results answered from a refreshed catalog instead of parsing every file."""
+    for entry in catalog.entries():
+        md_file = entry.metadata_path
+        if entry.error is not None:
+            yield md_file, {
+                'current': str(md_file),
+                'expected': 'ERROR',
+                'metadata': f"Validation failed: {entry.error}"
+            }
+        elif entry.patch_path is None or not entry.needs_rename:
+            yield md_file, None
+        else:
+            yield md_file, {
+                'current': entry.old_filename,
+                'expected': entry.new_filename,
+                'metadata': Path(os.path.relpath(md_file)).as_posix()
+            }
+    for issue in duplicate_issues(catalog.patch_store()):
+        yield None, issue
+
+def validate_pr_files(patches_dir: str = "patches", metadata_dir: str = "metadata",
+                      index: Optional[RepoIndex] = None, jobs: Optional[int] = 1,
+                      store: Optional[PatchStore] = None,
+                      catalog: Optional[Catalog] = None) -> Tuple[bool, List[Dict]]:
+    """Validate files in a PR context, from the catalog if one is given."""
+    if catalog is not None:
+        results = iter_catalog_pr_results(catalog)
+    else:
+        if index is None:
+            index = RepoIndex(Path(metadata_dir), Path(patches_dir))
+        if store is None:
+            store, _ = build_patch_store(index.patches_dir, STORE_CACHE, jobs)
+        results = iter_pr_results(index, store, jobs)
+    
+    # Scan all metadata files
+    issues = [issue for _, issue in results if issue is not None]
+    
+    return len(issues) == 0, issues
+
+def git_changed_paths(rev: str) -> Dict[str, str]:
+    """Get paths changed since a git revision with one `git diff --name-status` call.
+    
+    Renames are reported as a delete plus an add. Paths are relative to the
+    current directory.
+    
+    Returns:
+        Mapping of path to status letter (A, M, D, T...)
+    """
+    output = subprocess.run(
+        ['git', 'diff', '--name-status', '--no-renames', '--relative', '-z', rev],
+        capture_output=True, text=True, check=True
+    ).stdout
+    fields = output.split('\0')
+    return {path: status[0] for status, path in zip(fields[0::2], fields[1::2]) if path}
+
+def changed_patch_store(patches_dir: Path, patch_files: List[Path],
+                        jobs: Optional[int] = 1) -> PatchStore:
+    """Patch store that can answer duplicates_of() for the given patches.
+    
+    Only uncached files sharing a size with one of patch_files are hashed,
+    so a fresh CI checkout hashes a handful of files, not the library.
+    """
+    sizes = set()
+    for patch_file in patch_files:
+        try:
+            sizes.add(patch_file.stat().st_size)
+        except OSError:
             continue
-            
-        # Find corresponding metadata file by searching for files in baseRom directory
-        baserom_dir = Path(f"metadata/{entry['baseRom']}")
-        if not baserom_dir.exists():
-            errors.append(f"Missing metadata directory for {entry['baseRom']}")
+    store, _ = build_patch_store(patches_dir, STORE_CACHE, jobs, sizes=sizes)
+    return store
+
+def iter_changed_results(rev: str, index: RepoIndex, store: Optional[PatchStore] = None,
+                         jobs: Optional[int] = 1) -> Iterator[Tuple[Optional[Path], Optional[Dict]]]:
+    """Yield (metadata file, issue or None) per pair touched since a git revision.
+    
+    Per-file results come first, as they are checked; collisions and
+    duplicates follow as (None, issue), and pairs drawn in by a collision
+    are yielded last. Without a store, one is built from the touched
+    patches (see changed_patch_store).
+    """
+    metadata_dir, patches_dir = index.metadata_dir, index.patches_dir
+    affected = set()
+    touched_patches = []
+    for path, status in git_changed_paths(rev).items():
+        if status == 'D':
             continue
-            
-        # Look for any .md file in the baseRom directory
-        md_files = list(baserom_dir.glob("*.md"))
-        if not md_files:
-            errors.append(f"No metadata files found in {baserom_dir}")
+        changed = Path(path)
+        if changed.suffix == '.md' and changed.is_relative_to(metadata_dir):
+            md_file = index.get_metadata(changed.relative_to(metadata_dir).as_posix())
+        elif changed.is_relative_to(patches_dir):
+            patch_file = index.get_patch(changed.relative_to(patches_dir).as_posix())
+            md_file = index.find_metadata(patch_file) if patch_file else None
+            if patch_file is not None:
+                touched_patches.append(patch_file)
+        else:
             continue
-            
-        # Use the first metadata file found (assuming one per baseRom for now)
-        metadata_path = md_files[0]
-            
-        # Validate filename format
-        try:
-            result = standardize_from_metadata(metadata_path, patch_path)
-            if result['needs_rename']:
-                errors.append(f"Non-standard filename: {result['old_filename']} → {result['new_filename']}")
-        except Exception as e:
-            errors.append(f"Validation error for {entry['id']}: {e}")
+        if md_file is not None:
+            affected.add(md_file)
     
-    return len(errors) == 0, errors
+    md_files = sorted(affected)
+    
+    # Collisions: two touched pairs with one target, or a target that is
+    # already another pair's patch file
+    claimed: Dict[Path, Path] = {}
+    collisions = []
+    others = []
+    results = imap_ordered(_check_metadata_file, md_files, jobs, _init_worker, (index,))
+    for md_file, (issue, target) in zip(md_files, results):
+        yield md_file, issue
+        if target is None:
+            continue
+        owner = claimed.setdefault(target, md_file)
+        existing = index.get_patch(target.relative_to(index.patches_dir).as_posix())
+        existing_md = index.find_metadata(existing) if existing else None
+        if owner != md_file:
+            collides_with = owner
+        elif existing_md is not None and existing_md != md_file:
+            collides_with = existing_md
+            if existing_md not in affected:
+                others.append(existing_md)
+        else:
+            continue
+        collisions.append({
+            'current': target.name,
+            'expected': 'COLLISION',
+            'metadata': f"{Path(os.path.relpath(md_file)).as_posix()} collides with "
+                        f"{Path(os.path.relpath(collides_with)).as_posix()}"
+        })
+    
+    for issue in collisions:
+        yield None, issue
+    
+    others = sorted(set(others))
+    for md_file, (issue, _) in zip(others, imap_ordered(_check_metadata_file, others, jobs,
+                                                        _init_worker, (index,))):
+        yield md_file, issue
+    
+    if not touched_patches:
+        return
+    touched_patches.sort()
+    if store is None:
+        store = changed_patch_store(patches_dir, touched_patches, jobs)
+    for issue in duplicate_issues(store, touched_patches):
+        yield None, issue
 
-def validate_pr_files(patches_dir: str = "patches", metadata_dir: str = "metadata") -> Tuple[bool, List[Dict]]:
-    """Validate files in a PR context."""
-    issues = []
+def validate_changed_files(rev: str, patches_dir: str = "patches", metadata_dir: str = "metadata",
+                           index: Optional[RepoIndex] = None, jobs: Optional[int] = 1,
+                           store: Optional[PatchStore] = None) -> Tuple[bool, List[Dict]]:
+    """Validate only the metadata/patch pairs touched since a git revision.
     
-    # Scan all metadata files
-    metadata_path = Path(metadata_dir)
-    for md_file in metadata_path.rglob("*.md"):
+    Pairs whose standardized filename would land on another pair's patch,
+    or on the same name as another touched pair, are validated as well and
+    reported as collisions. Touched patches that are byte-identical to
+    another patch are reported as duplicates.
+    """
+    if index is None:
+        index = RepoIndex(Path(metadata_dir), Path(patches_dir))
+    
+    issues = [issue for _, issue in iter_changed_results(rev, index, store, jobs) if issue is not None]
+    
+    return len(issues) == 0, issues
+
+def stream_results(args) -> int:
+    """Write one NDJSON record per checked file as soon as it is known, then a summary.
+    
+    Returns:
+        Exit code: 1 for manifest errors, 0 otherwise (naming issues don't fail PRs)
+    """
+    writer = NdjsonWriter()
+    if args.manifest:
         try:
-            # Find corresponding patch file
-            metadata = parse_metadata_file(md_file)
-            baserom = md_file.parent.name
-            
-            # Look for patch file in patches/{baserom}/
-            patch_dir = Path(patches_dir) / baserom
-            patch_files = list(patch_dir.glob(f"{md_file.stem}.*"))
-            
-            if not patch_files:
-                continue  # No patch file, skip validation
-                
-            patch_file = patch_files[0]
-            
-            # Validate naming
-            result = standardize_from_metadata(md_file, patch_file)
-            if result['needs_rename']:
-                issues.append({
-                    'current': result['old_filename'],
-                    'expected': result['new_filename'],
-                    'metadata': str(md_file.relative_to(Path.cwd()))
-                })
-                
+            manifest = load_manifest(args.manifest)
         except Exception as e:
-            issues.append({
-                'current': str(md_file),
-                'expected': 'ERROR',
-                'metadata': f"Validation failed: {e}"
-            })
+            writer.summary(valid=False, checked=0, errors=1, error=f"Failed to read manifest: {e}")
+            return 1
+        errors = 0
+        for entry, error in iter_manifest_results(manifest, manifest_index(args.manifest), args.jobs):
+            record = {'id': entry.get('id'), 'file': entry.get('file'), 'valid': error is None}
+            if error is not None:
+                record['error'] = error
+                errors += 1
+            writer.emit('result', **record)
+        writer.summary(valid=errors == 0, checked=len(manifest), errors=errors)
+        return 0 if errors == 0 else 1
     
-    return len(issues) == 0, issues
+    if args.changed_since:
+        index = RepoIndex(Path("metadata"), Path("patches"))
+        results = iter_changed_results(args.changed_since, index, jobs=args.jobs)
+    elif args.no_catalog:
+        index = RepoIndex(Path("metadata"), Path("patches"))
+        store, _ = build_patch_store(index.patches_dir, STORE_CACHE, args.jobs)
+        results = iter_pr_results(index, store, args.jobs)
+    else:
+        results = iter_catalog_pr_results(open_catalog(Path("."), jobs=args.jobs))
+    checked = issues = 0
+    for md_file, issue in results:
+        issues += issue is not None
+        if md_file is None:
+            writer.emit('issue', **issue)
+            continue
+        checked += 1
+        record = {'metadata': Path(os.path.relpath(md_file)).as_posix(), 'valid': issue is None}
+        if issue is not None:
+            record['issue'] = issue
+        writer.emit('result', **record)
+    writer.summary(valid=issues == 0, checked=checked, issues=issues)
+    return 0
+
+def exit_git_error(e: subprocess.CalledProcessError) -> NoReturn:
+    """Report a failed git command (e.g. an unknown --changed-since revision) and exit 2."""
+    message = (e.stderr or '').strip() or f"{' '.join(e.cmd)} exited with status {e.returncode}"
+    print(f"❌ Error: {message}", file=sys.stderr)
+    sys.exit(2)
 
 def main():
     import argparse
     parser = argparse.ArgumentParser(description='Validate patch filenames')
     parser.add_argument('--manifest', help='Validate manifest.json')
     parser.add_argument('--pr', action='store_true', help='Validate PR files')
+    parser.add_argument('--changed-since', metavar='REV',
+                        help='Validate only files changed since a git revision (PR mode)')
+    parser.add_argument('--no-catalog', action='store_true',
+                        help='With --pr, parse every metadata file instead of reading .cache/catalog.sqlite')
     parser.add_argument('--json', action='store_true', help='Output JSON format')
+    parser.add_argument('--ndjson', action='store_true',
+                        help='Stream one JSON record per file as it is checked, then a summary')
+    parser.add_argument('--jobs', type=int, default=default_jobs(), metavar='N',
+                        help='Worker processes (default: CPU count, 1 = serial)')
+    profiling.add_profile_arguments(parser, 'validate_filenames')
     
     args = parser.parse_args()
+    profiling.enable_from_args(args, 'validate_filenames')
+    
+    if args.ndjson and (args.manifest or args.pr or args.changed_since):
+        try:
+            code = stream_results(args)
+        except subprocess.CalledProcessError as e:
+            exit_git_error(e)
+        sys.exit(code)
     
     if args.manifest:
-        is_valid, errors = validate_manifest(args.manifest)
+        is_valid, errors = validate_manifest(args.manifest, jobs=args.jobs)
         if args.json:
             print(json.dumps({'valid': is_valid, 'errors': errors}))
         else:
@@ -114,8 +409,15 @@ def main():
                     print(f"  - {error}")
         sys.exit(0 if is_valid else 1)
         
-    elif args.pr:
-        is_valid, issues = validate_pr_files()
+    elif args.pr or args.changed_since:
+        if args.changed_since:
+            try:
+                is_valid, issues = validate_changed_files(args.changed_since, jobs=args.jobs)
+            except subprocess.CalledProcessError as e:
+                exit_git_error(e)
+        else:
+            catalog = None if args.no_catalog else open_catalog(Path("."), jobs=args.jobs)
+            is_valid, issues = validate_pr_files(jobs=args.jobs, catalog=catalog)
         if args.json:
             print(json.dumps({'valid': is_valid, 'issues': issues}))
         else:
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Validate metadata frontmatter against the field schema.
+
+Checks types, enums (including base ROMs and systems from config/), ISO
+release dates and URLs for every metadata/**/*.md file (see
+utils/metadata_schema.py), and reports all errors per file.
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Callable, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+from utils.config_loader import CONFIG_DIR, get_config
+from utils.frontmatter import load_frontmatter
+from utils.metadata_schema import compile_schema
+from utils.parallel import default_jobs, map_ordered
+from utils import profiling
+
+_worker_validate: Optional[Callable] = None
+
+def _init_worker(config_dir: Path) -> None:
+    """Compile the schema once per worker process."""
+    global _worker_validate
+    _worker_validate = compile_schema(get_config(config_dir))
+
+def _validate_file(md_path: Path) -> list[str]:
+    """All schema errors in one metadata file."""
+    try:
+        metadata = load_frontmatter(md_path)
+    except Exception as e:
+        return [f"cannot parse frontmatter: {e}"]
+    return _worker_validate(metadata)
+
+def validate_files(md_paths: list[Path], config_dir: Path = CONFIG_DIR,
+                   jobs: Optional[int] = 1) -> dict[Path, list[str]]:
+    """Validate metadata files.
+
+    Args:
+        md_paths: Metadata files
+        config_dir: Directory with systems.json and base-roms.json
+        jobs: Worker processes (None for one per CPU, 1 for serial)
+
+    Returns:
+        Errors per file, for files with at least one error
+    """
+    results = map_ordered(_validate_file, md_paths, jobs, _init_worker, (config_dir,))
+    return {md_path: errors for md_path, errors in zip(md_paths, results) if errors}
+
+def collect_files(paths: list[Path]) -> list[Path]:
+    """Expand directories to the .md files below them, sorted."""
+    files = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(path.rglob('*.md'))
+        else:
+            files.append(path)
+    return sorted(set(files))
+
+def main():
+    project_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(
+        description='Validate metadata frontmatter',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Every metadata file
+  python scripts/validate_metadata.py
+
+  # Specific files or base ROM directories
+  python scripts/validate_metadata.py metadata/emerald
+        """
+    )
+    parser.add_argument('paths', nargs='*', type=Path,
+                        help='Metadata files or directories (default: metadata/)')
+    parser.add_argument('--config', type=Path, default=CONFIG_DIR,
+                        help='Config directory (default: config/)')
+    parser.add_argument('--json', action='store_true', help='Output JSON format')
+    parser.add_argument('--jobs', type=int, default=default_jobs(), metavar='N',
+                        help='Worker processes (default: CPU count, 1 = serial)')
+    profiling.add_profile_arguments(parser, 'validate_metadata')
+
+    args = parser.parse_args()
+    profiling.enable_from_args(args, 'validate_metadata')
+
+    md_paths = collect_files(args.paths or [project_root / 'metadata'])
+    try:
+        invalid = validate_files(md_paths, args.config, jobs=args.jobs)
+    except (OSError, ValueError) as e:
+        print(f"❌ Cannot load config from {args.config}: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.json:
+        print(json.dumps({
+            'valid': not invalid,
+            'files': len(md_paths),
+            'errors': {Path(os.path.relpath(path)).as_posix(): errors for path, errors in invalid.items()},
+        }))
+    else:
+        for md_path, errors in invalid.items():
+            print(f"❌ {Path(os.path.relpath(md_path)).as_posix()}")
+            for error in errors:
+                print(f"  - {error}")
+        if invalid:
+            total = sum(len(errors) for errors in invalid.values())
+            print(f"\n{total} errors in {len(invalid)} of {len(md_paths)} files")
+        else:
+            print(f"✅ All {len(md_paths)} metadata files are valid")
+
+    sys.exit(1 if invalid else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Tests for scripts/utils/detail_pages.py (Markdown rendering, site URLs)."""
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'scripts'))
+from utils.detail_pages import page_url, render_inline, render_markdown, render_sitemap
+
+class RenderInlineTest(unittest.TestCase):
+    def test_emphasis_does_not_rewrite_urls(self):
+        self.assertEqual(render_inline('[x](https://e.com/_foo_/bar)'),
+                         '<a href="https://e.com/_foo_/bar">x</a>')
+        self.assertEqual(render_inline('![a_b_](img/__x__.png)'), '<img src="img/__x__.png" alt="a_b_">')
+        self.assertEqual(render_inline('<https://e.com/*a*>'),
+                         '<a href="https://e.com/*a*">https://e.com/*a*</a>')
+
+    def test_balanced_parentheses_in_destination(self):
+        self.assertEqual(render_inline('[wiki](https://w.org/Foo_(bar)) ok'),
+                         '<a href="https://w.org/Foo_(bar)">wiki</a> ok')
+
+    def test_emphasis_and_code_in_link_text(self):
+        self.assertEqual(render_inline('[**b** `c_d_`](u)'), '<a href="u"><strong>b</strong> <code>c_d_</code></a>')
+
+    def test_unsafe_links_and_raw_html(self):
+        self.assertEqual(render_inline('[x](javascript:alert(1))'), '<a href="#">x</a>')
+        self.assertEqual(render_inline('<b>hi</b>'), '&lt;b&gt;hi&lt;/b&gt;')
+
+class RenderMarkdownTest(unittest.TestCase):
+    def test_nested_tight_list(self):
+        self.assertEqual(render_markdown('- a\n  - b\n- c'),
+                         '<ul>\n<li>a\n<ul>\n<li>b</li>\n</ul></li>\n<li>c</li>\n</ul>')
+
+class SiteUrlTest(unittest.TestCase):
+    def test_absolute_urls(self):
+        site = 'https://example.github.io/repo/'
+        self.assertEqual(page_url(site, 'a-b.html'), 'https://example.github.io/repo/hacks/a-b.html')
+        self.assertEqual(page_url(site, ''), 'https://example.github.io/repo/hacks/')
+        self.assertIn('<loc>https://example.github.io/repo/hacks/a-b.html</loc>', render_sitemap(site, ['a-b']))
+
+    def test_relative_without_site_url(self):
+        self.assertEqual(page_url('', 'a-b.html'), 'a-b.html')
+        self.assertEqual(page_url('', ''), 'index.html')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""Tests for scripts/utils/patch_engine.py.
+
+Run with: python -m unittest discover tests/python (or pytest tests/python)
+"""
+import struct
+import sys
+import tempfile
+import unittest
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'scripts'))
+from utils.patch_engine import PatchError, apply_patch
+
+def _varint(value: int) -> bytes:
+    """beat/UPS/BPS variable-length integer."""
+    out = bytearray()
+    while True:
+        low = value & 0x7F
+        value >>= 7
+        if value == 0:
+            out.append(0x80 | low)
+            return bytes(out)
+        out.append(low)
+        value -= 1
+
+def _footer(body: bytes, source: bytes, target: bytes) -> bytes:
+    body += struct.pack('<II', zlib.crc32(source), zlib.crc32(target))
+    return body + struct.pack('<I', zlib.crc32(body))
+
+def make_ips(records: list[tuple[int, bytes]]) -> bytes:
+    body = b'PATCH'
+    for offset, data in records:
+        body += offset.to_bytes(3, 'big') + len(data).to_bytes(2, 'big') + data
+    return body + b'EOF'
+
+def make_ups(source: bytes, target: bytes) -> bytes:
+    """UPS patch as byuu's tools write it: XOR over the longer of the two files."""
+    size = max(len(source), len(target))
+
+    def xor(i: int) -> int:
+        return (source[i] if i < len(source) else 0) ^ (target[i] if i < len(target) else 0)
+
+    body = bytearray(b'UPS1' + _varint(len(source)) + _varint(len(target)))
+    position = last = 0
+    while position < size:
+        if xor(position) == 0:
+            position += 1
+            continue
+        body += _varint(position - last)
+        while position < size and xor(position) != 0:
+            body.append(xor(position))
+            position += 1
+        body.append(0)
+        position += 1
+        last = position
+    return _footer(bytes(body), source, target)
+
+def make_bps(source: bytes, target: bytes, target_crc: int = None) -> bytes:
+    """BPS patch with a single TargetRead action."""
+    body = b'BPS1' + _varint(len(source)) + _varint(len(target)) + _varint(0)
+    body += _varint(((len(target) - 1) << 2) | 1) + target
+    patch = _footer(body, source, target)
+    if target_crc is not None:
+        patch = patch[:-8] + struct.pack('<I', target_crc)
+        patch += struct.pack('<I', zlib.crc32(patch))
+    return patch
+
+class PatchEngineTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.rom = self.dir / 'base.gba'
+        self.source = bytes(range(256)) * 16
+        self.rom.write_bytes(self.source)
+
+    def write_patch(self, name: str, data: bytes) -> Path:
+        path = self.dir / name
+        path.write_bytes(data)
+        return path
+
+    def test_ips(self):
+        patch = self.write_patch('hack.ips', make_ips([(4, b'\xAA\xBB'), (len(self.source), b'\x01')]))
+        output = self.dir / 'out.gba'
+        result = apply_patch(self.rom, patch, output)
+        expected = self.source[:4] + b'\xAA\xBB' + self.source[6:] + b'\x01'
+        self.assertEqual(output.read_bytes(), expected)
+        self.assertEqual(result.target_crc32, zlib.crc32(expected))
+
+    def test_ups_grow(self):
+        target = self.source[:100] + b'changed' + self.source[107:] + b'tail'
+        patch = self.write_patch('hack.ups', make_ups(self.source, target))
+        output = self.dir / 'out.gba'
+        apply_patch(self.rom, patch, output)
+        self.assertEqual(output.read_bytes(), target)
+
+    def test_ups_shrink_ignores_bytes_past_target(self):
+        # Regression: XOR bytes beyond the target size used to be rejected
+        target = b'\xFF' * 10 + self.source[10:1000]
+        patch = self.write_patch('hack.ups', make_ups(self.source, target))
+        output = self.dir / 'out.gba'
+        result = apply_patch(self.rom, patch, output)
+        self.assertEqual(output.read_bytes(), target)
+        self.assertEqual(result.target_size, len(target))
+
+    def test_bps(self):
+        target = b'patched' + self.source[7:2000]
+        patch = self.write_patch('hack.bps', make_bps(self.source, target))
+        output = self.dir / 'out.gba'
+        apply_patch(self.rom, patch, output)
+        self.assertEqual(output.read_bytes(), target)
+
+    def test_output_is_rom_is_rejected(self):
+        patches = [
+            self.write_patch('hack.ips', make_ips([(0, b'\x00' * 8)])),
+            self.write_patch('hack.bps', make_bps(self.source, b'x' * 64)),
+        ]
+        for patch in patches:
+            for output in (self.rom, self.dir / '.' / 'base.gba'):
+                with self.subTest(patch=patch.name, output=str(output)):
+                    with self.assertRaises(PatchError):
+                        apply_patch(self.rom, patch, output)
+                    self.assertEqual(self.rom.read_bytes(), self.source)
+
+    def test_failed_verification_keeps_existing_output(self):
+        output = self.dir / 'out.gba'
+        output.write_bytes(b'previous build')
+        patch = self.write_patch('hack.bps', make_bps(self.source, b'x' * 64, target_crc=0))
+        with self.assertRaises(PatchError):
+            apply_patch(self.rom, patch, output)
+        self.assertEqual(output.read_bytes(), b'previous build')
+        self.assertEqual(sorted(p.name for p in self.dir.iterdir()), ['base.gba', 'hack.bps', 'out.gba'])
+
+if __name__ == '__main__':
+    unittest.main()
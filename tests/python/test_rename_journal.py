@@ -0,0 +1,40 @@
+"""Tests for scripts/utils/rename_journal.py (move ordering and cycles)."""
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'scripts'))
+from utils.rename_journal import RenameJournal, plan_steps
+
+class PlanStepsTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+
+    def test_swap_goes_through_tagged_temp_name(self):
+        renames = []
+        for name, other in (('a', 'b'), ('b', 'a')):
+            (self.dir / f'{name}.ips').write_bytes(name.encode())
+            (self.dir / f'{name}.md').write_text(name, encoding='utf-8')
+            renames.append((str(self.dir / f'{name}.ips'), str(self.dir / f'{other}.ips'),
+                            str(self.dir / f'{name}.md'), other))
+        steps = plan_steps(renames, batch_id='t')
+
+        moves = [step for step in steps if step['op'] == 'move']
+        parked = [step for step in moves if step.get('temp')]
+        self.assertEqual(len(moves), 6)
+        self.assertEqual(len(parked), 2)
+        for step in parked:
+            resumed = next(move for move in moves if move['src'] == step['dst'])
+            self.assertEqual(resumed['from'], step['src'])
+
+        RenameJournal(self.dir / 'journal.json').create(steps)
+        RenameJournal(self.dir / 'journal.json').run()
+        self.assertEqual((self.dir / 'a.ips').read_bytes(), b'b')
+        self.assertEqual((self.dir / 'b.ips').read_bytes(), b'a')
+        self.assertEqual((self.dir / 'a.md').read_text(encoding='utf-8'), 'a')
+
+if __name__ == '__main__':
+    unittest.main()